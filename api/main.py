@@ -6,7 +6,7 @@ Enhanced Edition
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from datetime import datetime
 from loguru import logger
 import os
@@ -26,6 +26,9 @@ from api.routes.advisory_routes import router as advisory_router
 
 from api.schemas.request_response import HealthResponse
 from utils.file_utils import init_project_directories
+from utils import metrics
+from utils.executors import executor_stats, shutdown_executors
+from services.registry import registry, get_service
 from database.db import init_db as init_new_db
 
 
@@ -70,6 +73,9 @@ app.include_router(advisory_router)
 async def startup_event():
     logger.info("🚀 Starting Gramin Sahayak API")
 
+    # Model + index load in the background; /ready reports progress
+    registry.startup("rag")
+
     try:
         init_new_db()
         logger.info("✓ Database initialized")
@@ -85,15 +91,14 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("👋 Server shutting down")
+    registry.shutdown()
+    shutdown_executors(wait=False)
 
 # ---------------- HEALTH ---------------- #
 
 @app.get("/", response_model=HealthResponse)
 async def root():
-    from services.rag_service import RAGService
-
-    rag_service = RAGService()
-    service_status = rag_service.get_service_status()
+    service_status = get_service("rag").get_service_status()
 
     return HealthResponse(
         status="healthy",
@@ -114,9 +119,37 @@ async def health():
     return {
         "status": "ok",
         "timestamp": datetime.utcnow(),
-        "version": "2.0.0"
+        "version": "2.0.0",
+        "worker_pools": executor_stats()
     }
 
+@app.get("/ready")
+async def ready():
+    """
+    Readiness probe: 200 once the embedding model and index are loaded,
+    503 with warm-up progress until then
+    """
+    status = get_service("rag").warmup_status()
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
+
+@app.get("/health/memory")
+async def memory_report():
+    """Process RSS and per-service memory (models, indexes, OCR reader)"""
+    return registry.memory_report()
+
+@app.get("/metrics")
+async def get_metrics(format: str = "prometheus"):
+    """
+    Process metrics (LLM rate-limit queue depth / wait time, LLM latency, ...)
+    Prometheus text format if prometheus-client is installed, else JSON
+    """
+    rendered = metrics.render_prometheus() if format == "prometheus" else None
+    if rendered is None:
+        return metrics.snapshot()
+
+    body, content_type = rendered
+    return Response(content=body, media_type=content_type)
+
 @app.get("/features")
 async def features():
     return {
@@ -1,31 +1,26 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
-from database.db_manager import get_db
+from database.db_manager import get_db, find_user_preference
 
-from database.models import UserPreference
+from utils.executors import run_io
 
 
-from services.advisory_service import AdvisoryService
-from services.gtts_service import GTTsService
-from services.translation_service import TranslationService
-from services.telegram_service import TelegramService
+from services.registry import lazy_service
 
 router = APIRouter(prefix="/advisory", tags=["Daily Advisory"])
 
-advisory_service = AdvisoryService()
-translation_service = TranslationService()
-gtts_service = GTTsService()
-telegram_service = TelegramService()
+advisory_service = lazy_service("advisory")
+translation_service = lazy_service("translation")
+gtts_service = lazy_service("gtts")
+telegram_service = lazy_service("telegram")
 
 
 @router.post("/send/{telegram_user_id}")
 async def send_advisory(telegram_user_id: str, db: Session = Depends(get_db)):
 
     # Get user preferences
-    user_pref = db.query(UserPreference).filter(
-        UserPreference.telegram_user_id == telegram_user_id
-    ).first()
+    user_pref = await run_io(find_user_preference, db, telegram_user_id)
 
     if not user_pref:
         raise HTTPException(status_code=404, detail="User not found. Set preferences first.")
@@ -42,13 +37,14 @@ async def send_advisory(telegram_user_id: str, db: Session = Depends(get_db)):
     )
 
     # Translate
-    translated_text = translation_service.translate(
+    translated_text = await translation_service.translate_async(
         advisory_text,
-        user_pref.preferred_language or "hi"
+        user_pref.preferred_language or "hi",
+        site="advisory_api"
     )
 
     # Convert to audio
-    audio_path = gtts_service.text_to_speech(translated_text)
+    audio_path = await gtts_service.text_to_speech_async(translated_text)
 
     # Send telegram audio
     await telegram_service.send_audio(
@@ -72,15 +68,13 @@ async def toggle_advisory(
     db: Session = Depends(get_db)
 ):
 
-    user_pref = db.query(UserPreference).filter(
-        UserPreference.telegram_user_id == telegram_user_id
-    ).first()
+    user_pref = await run_io(find_user_preference, db, telegram_user_id)
 
     if not user_pref:
         raise HTTPException(status_code=404, detail="User not found")
 
     user_pref.advisory_enabled = enabled
-    db.commit()
+    await run_io(db.commit)
 
     return {
         "success": True,
@@ -4,12 +4,12 @@ Fraud detection API routes
 
 from fastapi import APIRouter, HTTPException
 from api.schemas.request_response import FraudRequest, FraudResponse
-from services.fraud_service import FraudService
+from services.registry import lazy_service
 from database.db_manager import db
 from loguru import logger
 
 router = APIRouter(prefix="/fraud", tags=["Fraud Detection"])
-fraud_service = FraudService()
+fraud_service = lazy_service("fraud")
 
 
 @router.post("/check-scheme", response_model=FraudResponse)
@@ -19,7 +19,7 @@ async def check_scheme_fraud(request: FraudRequest):
     """
     try:
         scheme_data = request.dict()
-        result = fraud_service.detect_fraud(scheme_data)
+        result = await fraud_service.detect_fraud_async(scheme_data)
         
         # Save to database
         db_data = {
@@ -31,7 +31,7 @@ async def check_scheme_fraud(request: FraudRequest):
             'fraud_signals': result['fraud_signals'],
             'verified': result['verified']
         }
-        db.save_fraud_check(db_data)
+        await db.save_fraud_check_async(db_data)
         
         return FraudResponse(**result)
         
@@ -1,13 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
-from database.db_manager import get_db
+from database.db_manager import get_db, find_user_preference
 
 from database.models import UserPreference
+from utils.executors import run_io
+from services.registry import lazy_service
 
 
 router = APIRouter(prefix="/language", tags=["Language Settings"])
 
+translation_service = lazy_service("translation")
+
+
 class LanguageRequest(BaseModel):
     telegram_user_id: str
     language: str  # hi, en, pa, bn, etc.
@@ -23,9 +28,7 @@ async def set_language(request: LanguageRequest, db: Session = Depends(get_db)):
     """
     
     # Check if user exists
-    user_pref = db.query(UserPreference).filter(
-        UserPreference.telegram_user_id == request.telegram_user_id
-    ).first()
+    user_pref = await run_io(find_user_preference, db, request.telegram_user_id)
     
     if user_pref:
         # Update existing
@@ -38,8 +41,8 @@ async def set_language(request: LanguageRequest, db: Session = Depends(get_db)):
         )
         db.add(user_pref)
     
-    db.commit()
-    db.refresh(user_pref)
+    await run_io(db.commit)
+    await run_io(db.refresh, user_pref)
     
     return {
         "success": True,
@@ -51,9 +54,7 @@ async def set_language(request: LanguageRequest, db: Session = Depends(get_db)):
 async def set_location(request: LocationRequest, db: Session = Depends(get_db)):
     """Set user location for weather"""
     
-    user_pref = db.query(UserPreference).filter(
-        UserPreference.telegram_user_id == request.telegram_user_id
-    ).first()
+    user_pref = await run_io(find_user_preference, db, request.telegram_user_id)
     
     if user_pref:
         user_pref.location = request.location
@@ -64,7 +65,7 @@ async def set_location(request: LocationRequest, db: Session = Depends(get_db)):
         )
         db.add(user_pref)
     
-    db.commit()
+    await run_io(db.commit)
     
     return {
         "success": True,
@@ -75,9 +76,7 @@ async def set_location(request: LocationRequest, db: Session = Depends(get_db)):
 async def get_preferences(telegram_user_id: str, db: Session = Depends(get_db)):
     """Get user preferences"""
     
-    user_pref = db.query(UserPreference).filter(
-        UserPreference.telegram_user_id == telegram_user_id
-    ).first()
+    user_pref = await run_io(find_user_preference, db, telegram_user_id)
     
     if not user_pref:
         raise HTTPException(404, "User preferences not found")
@@ -87,4 +86,9 @@ async def get_preferences(telegram_user_id: str, db: Session = Depends(get_db)):
         "language": user_pref.preferred_language,
         "location": user_pref.location,
         "advisory_enabled": user_pref.advisory_enabled
-    }
\ No newline at end of file
+    }
+
+@router.get("/translation-cache")
+async def translation_cache_stats():
+    """Translation cache size and hit ratios per call site"""
+    return translation_service.cache_stats()
@@ -6,11 +6,12 @@ Matches actual model features
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 from typing import Optional
-from services.loan_service import LoanService
+from services.loan_service import GOVERNMENT_SCHEMES
+from services.registry import lazy_service
 from loguru import logger
 
 router = APIRouter(prefix="/loan", tags=["Loan"])
-loan_service = LoanService()
+loan_service = lazy_service("loan")
 
 
 # ==================== REQUEST/RESPONSE MODELS ==================== #
@@ -114,7 +115,7 @@ async def check_loan_eligibility(request: LoanRequest):
         logger.info(f"  Loan Term: {user_data['loan_term']} months")
         logger.info(f"  CIBIL Score: {user_data['cibil_score']}")
         
-        result = loan_service.predict_eligibility(user_data)
+        result = await loan_service.predict_eligibility_async(user_data)
         
         logger.info(f"Prediction result: Eligible={result['eligible']}, Confidence={result['confidence']}")
         
@@ -130,81 +131,9 @@ async def get_government_schemes():
     """
     Get list of verified government loan schemes
     """
-    schemes = [
-        {
-            "name": "प्रधानमंत्री मुद्रा योजना (PM MUDRA)",
-            "name_english": "Pradhan Mantri MUDRA Yojana",
-            "max_amount": 1000000,
-            "purpose": "Business/Micro Enterprises",
-            "interest_rate": "8-12%",
-            "features": [
-                "No collateral required for loans up to ₹10 lakh",
-                "Three categories: Shishu (up to ₹50,000), Kishore (₹50,000-₹5 lakh), Tarun (₹5-₹10 lakh)"
-            ],
-            "verified": True,
-            "website": "https://www.mudra.org.in"
-        },
-        {
-            "name": "किसान क्रेडिट कार्ड (KCC)",
-            "name_english": "Kisan Credit Card",
-            "max_amount": 300000,
-            "purpose": "Agriculture/Farming",
-            "interest_rate": "4-7% (subsidized)",
-            "features": [
-                "Interest subvention of 2%",
-                "Additional 3% incentive for timely repayment",
-                "Effective rate: 4% per annum"
-            ],
-            "verified": True,
-            "website": "https://pmkisan.gov.in"
-        },
-        {
-            "name": "Stand Up India",
-            "name_english": "Stand Up India",
-            "max_amount": 10000000,
-            "purpose": "SC/ST/Women entrepreneurs",
-            "interest_rate": "Base rate + margin (typically 9-12%)",
-            "features": [
-                "For setting up greenfield enterprises",
-                "Manufacturing, services, or trading sector",
-                "Repayment period: 7 years with moratorium"
-            ],
-            "verified": True,
-            "website": "https://www.standupmitra.in"
-        },
-        {
-            "name": "PM-KISAN योजना",
-            "name_english": "PM-KISAN Scheme",
-            "max_amount": 6000,
-            "purpose": "Direct income support to farmers",
-            "interest_rate": "N/A (Direct Benefit Transfer)",
-            "features": [
-                "₹6,000 per year in 3 installments",
-                "Direct to bank account",
-                "For all landholding farmers"
-            ],
-            "verified": True,
-            "website": "https://pmkisan.gov.in"
-        },
-        {
-            "name": "प्रधानमंत्री आवास योजना (PMAY)",
-            "name_english": "Pradhan Mantri Awas Yojana",
-            "max_amount": 1200000,
-            "purpose": "Home loan subsidy",
-            "interest_rate": "Interest subsidy up to 2.67 lakh",
-            "features": [
-                "For EWS, LIG, and MIG categories",
-                "Credit-linked subsidy on home loans",
-                "Repayment period: up to 20 years"
-            ],
-            "verified": True,
-            "website": "https://pmaymis.gov.in"
-        }
-    ]
-    
     return {
-        "schemes": schemes,
-        "count": len(schemes),
+        "schemes": GOVERNMENT_SCHEMES,
+        "count": len(GOVERNMENT_SCHEMES),
         "disclaimer": "ये सभी सरकारी योजनाएं हैं। कृपया आधिकारिक वेबसाइट पर जाकर सत्यापित करें।"
     }
 
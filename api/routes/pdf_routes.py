@@ -1,21 +1,17 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException
 from pathlib import Path
 
-from services.ocr_service import OCRService
-from services.translation_service import TranslationService
-from services.gtts_service import GTTsService
-from services.telegram_service import TelegramService
+from services.registry import lazy_service
 
-from utils.llm_client import get_llm
 from utils.file_utils import FileUtils
 
 router = APIRouter(prefix="/pdf", tags=["PDF Explainer"])
 
-ocr_service = OCRService()
-translation_service = TranslationService()
-gtts_service = GTTsService()
-telegram_service = TelegramService()
-llm = get_llm()
+ocr_service = lazy_service("ocr")
+translation_service = lazy_service("translation")
+gtts_service = lazy_service("gtts")
+telegram_service = lazy_service("telegram")
+llm = lazy_service("llm")
 
 
 @router.post("/explain")
@@ -38,26 +34,27 @@ async def explain_document(
         file_type = Path(file.filename).suffix[1:]
 
         # OCR
-        extracted_text = ocr_service.extract_text(file_path, file_type)
+        extracted_text = await ocr_service.extract_text_async(file_path, file_type)
 
         if not extracted_text:
             raise HTTPException(status_code=400, detail="No text found")
 
         # Simplify via Groq
-        simplified_text = simplify_with_llm(extracted_text)
-
-        # Translate
-        translated_text = translation_service.translate(simplified_text, target_lang)
+        simplified_text = await simplify_with_llm(extracted_text)
 
         # Action steps via Groq
-        action_steps = generate_action_steps(extracted_text)
-        action_steps_translated = translation_service.translate(action_steps, target_lang)
+        action_steps = await generate_action_steps(extracted_text)
+
+        # Translate both together: segmented, batched, in parallel
+        translated_text, action_steps_translated = await translation_service.translate_many_async(
+            [simplified_text, action_steps], target_lang, site="pdf_explain"
+        )
 
         # Full voice text
         full_text = f"{translated_text}\n\nआगे के कदम:\n{action_steps_translated}"
 
         # Generate gTTS audio
-        audio_path = gtts_service.text_to_speech(full_text)
+        audio_path = await gtts_service.text_to_speech_async(full_text)
 
         # Telegram
         if telegram_user_id:
@@ -86,7 +83,7 @@ async def explain_document(
 # ================= GROQ LLM FUNCTIONS =================
 
 
-def simplify_with_llm(text: str) -> str:
+async def simplify_with_llm(text: str) -> str:
 
     prompt = f"""
 You are helping rural farmers.
@@ -96,16 +93,13 @@ Simplify this banking document in very simple Hindi:
 {text}
 """
 
-    try:
-        response = llm.invoke(prompt)
-        return response.content.strip()
-
-    except Exception as e:
-        print(e)
+    answer = await llm.agenerate_with_retry(prompt)
+    if llm.is_fallback(answer):
         return text[:400]
+    return answer
 
 
-def generate_action_steps(text: str) -> str:
+async def generate_action_steps(text: str) -> str:
 
     prompt = f"""
 Create a simple Hindi checklist:
@@ -117,10 +111,7 @@ Create a simple Hindi checklist:
 {text}
 """
 
-    try:
-        response = llm.invoke(prompt)
-        return response.content.strip()
-
-    except Exception as e:
-        print(e)
+    answer = await llm.agenerate_with_retry(prompt)
+    if llm.is_fallback(answer):
         return "कृपया बैंक से संपर्क करें।"
+    return answer
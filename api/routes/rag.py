@@ -3,13 +3,15 @@ RAG chatbot API routes
 """
 
 from fastapi import APIRouter, HTTPException
-from api.schemas.request_response import RAGRequest, RAGResponse
-from services.rag_service import RAGService
+from api.schemas.request_response import (
+    RAGRequest, RAGResponse, RAGBatchRequest, RAGBatchResponse
+)
+from services.registry import lazy_service
 from database.db_manager import db
 from loguru import logger
 
 router = APIRouter(prefix="/rag", tags=["RAG Chatbot"])
-rag_service = RAGService()
+rag_service = lazy_service("rag")
 
 
 @router.post("/ask", response_model=RAGResponse)
@@ -18,7 +20,7 @@ async def ask_question(request: RAGRequest):
     Ask a question about banking/schemes using RAG
     """
     try:
-        result = rag_service.answer_question(
+        result = await rag_service.answer_question_async(
             request.question,
             language=request.language,
             include_sources=request.include_sources
@@ -33,7 +35,7 @@ async def ask_question(request: RAGRequest):
             'confidence': result['confidence'],
             'language': request.language
         }
-        db.save_rag_query(db_data)
+        await db.save_rag_query_async(db_data)
         
         return RAGResponse(**result)
         
@@ -42,13 +44,43 @@ async def ask_question(request: RAGRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/ask/batch", response_model=RAGBatchResponse)
+async def ask_questions(request: RAGBatchRequest):
+    """
+    Answer several questions at once (one embedding call + one index search)
+    """
+    try:
+        results = await rag_service.answer_questions_async(
+            request.questions,
+            language=request.language,
+            include_sources=request.include_sources
+        )
+        
+        for question, result in zip(request.questions, results):
+            await db.save_rag_query_async({
+                'user_telegram_id': 'api_user',
+                'question': question,
+                'answer': result['answer'],
+                'sources': result['sources'],
+                'confidence': result['confidence'],
+                'language': request.language
+            })
+        
+        return RAGBatchResponse(results=[RAGResponse(**r) for r in results])
+        
+    except Exception as e:
+        logger.error(f"❌ RAG batch API error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/explain-scheme")
-async def explain_scheme(scheme_name: str):
+async def explain_scheme(scheme_name: str, language: str = "hindi"):
     """
     Get detailed explanation of a government scheme
+    (precomputed for known schemes, generated live otherwise)
     """
     try:
-        explanation = rag_service.explain_scheme(scheme_name)
+        explanation = await rag_service.explain_scheme_async(scheme_name, language=language)
         return {"scheme_name": scheme_name, "explanation": explanation}
         
     except Exception as e:
@@ -57,12 +89,13 @@ async def explain_scheme(scheme_name: str):
 
 
 @router.post("/explain-term")
-async def explain_banking_term(term: str):
+async def explain_banking_term(term: str, language: str = "hindi"):
     """
     Explain a banking/financial term in simple language
+    (precomputed for known terms, generated live otherwise)
     """
     try:
-        explanation = rag_service.explain_term(term)
+        explanation = await rag_service.explain_term_async(term, language=language)
         return {"term": term, "explanation": explanation}
         
     except Exception as e:
@@ -49,15 +49,25 @@ class FraudResponse(BaseModel):
 # RAG Schemas
 class RAGRequest(BaseModel):
     question: str = Field(..., min_length=1)
-    language: str = Field("hindi", description="Response language")
+    language: str = Field("hindi", description="Response language ('auto' = detect from the question)")
     include_sources: bool = Field(True)
 
 
 class RAGResponse(BaseModel):
     answer: str
     sources: List[str]
-    confidence: float
+    confidence: Optional[float] = Field(None, description="Mean retrieval similarity (null for keyword-only matches)")
+
+
+
+class RAGBatchRequest(BaseModel):
+    questions: List[str] = Field(..., min_length=1, max_length=64)
+    language: str = Field("hindi", description="Response language ('auto' = detect from the questions)")
+    include_sources: bool = Field(True)
+
 
+class RAGBatchResponse(BaseModel):
+    results: List[RAGResponse]
 
 # General
 class HealthResponse(BaseModel):
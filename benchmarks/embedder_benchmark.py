@@ -0,0 +1,130 @@
+"""
+Embedder Benchmark - single-query latency, batch throughput and cosine
+agreement with PyTorch for each embedding backend (CPU)
+
+Usage:
+    python benchmarks/embedder_benchmark.py                          # torch vs onnx vs onnx-int8
+    python benchmarks/embedder_benchmark.py --backends torch onnx-int8 --threads 4
+"""
+
+import os
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+# Measure the model, not the caches
+os.environ["QUERY_EMBED_CACHE_SIZE"] = "0"
+os.environ["CHUNK_EMBED_CACHE_PATH"] = ""
+
+import numpy as np
+from loguru import logger
+
+from rag.chunk_store import ChunkStore
+from rag.embedder import Embedder, BACKENDS
+from rag.onnx_backend import AGREEMENT_SAMPLES, cosine_agreement
+
+
+def load_texts(index_path: str, n: int) -> list:
+    """Chunk texts from the built index (falls back to the agreement samples)"""
+    chunks_file = os.path.join(index_path, ChunkStore.FILENAME)
+    if not os.path.exists(chunks_file):
+        logger.warning(f"⚠️ {chunks_file} not found - using built-in sample sentences")
+        return (AGREEMENT_SAMPLES * (n // len(AGREEMENT_SAMPLES) + 1))[:n]
+
+    store = ChunkStore.open(chunks_file)
+    step = max(1, len(store) // n)
+    texts = [store[i]["text"] for i in range(0, len(store), step)][:n]
+    store.close()
+    return texts
+
+
+def measure(embedder: Embedder, queries: list, texts: list, batch_size: int) -> dict:
+    # Warm-up (first call pays for lazy init / graph optimization)
+    embedder.model.encode(queries[:2], batch_size=batch_size, convert_to_numpy=True)
+
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        embedder.model.encode(query, convert_to_numpy=True)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    embeddings = embedder.model.encode(texts, batch_size=batch_size, convert_to_numpy=True)
+    batch_seconds = time.perf_counter() - start
+
+    return {
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p99_ms": float(np.percentile(latencies, 99)),
+        "texts_per_s": len(texts) / batch_seconds,
+        "embeddings": np.asarray(embeddings, dtype="float32")
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=None, help="Default: EMBEDDING_MODEL")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=BACKENDS)
+    parser.add_argument("--index-path", default="data/processed/faiss_index")
+    parser.add_argument("--texts", type=int, default=256, help="Chunks for the throughput run")
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--threads", type=int, default=None, help="torch / ONNX Runtime intra-op threads")
+    args = parser.parse_args()
+
+    if args.threads:
+        import torch
+        torch.set_num_threads(args.threads)
+        os.environ["OMP_NUM_THREADS"] = str(args.threads)
+
+    texts = load_texts(args.index_path, args.texts)
+    queries = (AGREEMENT_SAMPLES * (args.queries // len(AGREEMENT_SAMPLES) + 1))[:args.queries]
+
+    logger.info(f"📊 {len(texts)} texts | {len(queries)} single queries | batch={args.batch_size}")
+
+    rows = []
+    reference = None
+    for backend in args.backends:
+        start = time.perf_counter()
+        embedder = Embedder(args.model, backend=backend)
+        load_seconds = time.perf_counter() - start
+
+        if embedder.backend != backend:
+            logger.warning(f"⚠️ Skipping {backend}: fell back to {embedder.backend}")
+            continue
+
+        result = measure(embedder, queries, texts, args.batch_size)
+
+        if backend == "torch":
+            reference = result["embeddings"]
+            agreement = None
+        elif reference is not None:
+            agreement = cosine_agreement(reference, result["embeddings"])
+        else:
+            # No torch run in this invocation - report the stored export-time agreement
+            agreement = embedder.backend_agreement
+
+        rows.append((backend, load_seconds, result, agreement))
+        del embedder
+
+    print()
+    print(
+        f"{'backend':<12} {'load s':>7} {'p50 ms':>8} {'p99 ms':>8} "
+        f"{'texts/s':>9} {'cos mean':>9} {'cos min':>8}"
+    )
+    print("-" * 68)
+    for backend, load_seconds, m, agreement in rows:
+        cos_mean = f"{agreement['mean_cosine']:.5f}" if agreement else "-"
+        cos_min = f"{agreement['min_cosine']:.5f}" if agreement else "-"
+        print(
+            f"{backend:<12} {load_seconds:>7.1f} {m['p50_ms']:>8.2f} {m['p99_ms']:>8.2f} "
+            f"{m['texts_per_s']:>9.1f} {cos_mean:>9} {cos_min:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Index Benchmark - recall@k, search latency and memory per vector of ANN indexes
+and vector codecs vs. the exact float32 flat baseline
+
+Usage:
+    python benchmarks/index_benchmark.py                      # vectors from the built index
+    python benchmarks/index_benchmark.py --synthetic 200000   # clustered random vectors
+    python benchmarks/index_benchmark.py --types flat ivf --codecs none sq8 pq
+"""
+
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+import faiss
+import numpy as np
+from loguru import logger
+
+from rag.vector_store import VectorStore, INDEX_TYPES, CODECS
+
+
+def load_corpus_vectors(index_path: str) -> np.ndarray:
+    """Reconstruct the stored vectors of an existing (flat) index"""
+    store = VectorStore(index_path, mmap=False)
+    if not store.load():
+        raise SystemExit(f"❌ No index found at {index_path} - build it first or use --synthetic")
+    index = store.index
+    if isinstance(index, faiss.IndexIDMap):
+        index = faiss.downcast_index(index.index)
+    return index.reconstruct_n(0, index.ntotal)
+
+
+def synthetic_vectors(n: int, dim: int, seed: int = 42) -> np.ndarray:
+    """Clustered vectors - closer to real embeddings than uniform noise"""
+    rng = np.random.default_rng(seed)
+    n_clusters = max(10, n // 500)
+    centers = rng.standard_normal((n_clusters, dim)).astype("float32")
+    labels = rng.integers(0, n_clusters, n)
+    return centers[labels] + 0.35 * rng.standard_normal((n, dim)).astype("float32")
+
+
+def make_queries(base: np.ndarray, n: int, seed: int = 7) -> np.ndarray:
+    """Perturbed corpus vectors stand in for paraphrased questions"""
+    rng = np.random.default_rng(seed)
+    picks = base[rng.integers(0, base.shape[0], n)]
+    scale = float(np.std(base)) * 0.5
+    return (picks + scale * rng.standard_normal(picks.shape)).astype("float32")
+
+
+def build_store(base: np.ndarray, index_type: str, **kwargs) -> tuple:
+    store = VectorStore(tempfile.mkdtemp(prefix="gs_bench_"), mmap=False, index_type=index_type, **kwargs)
+    chunks = [{"text": "", "source": "bench", "chunk_id": i} for i in range(base.shape[0])]
+
+    start = time.perf_counter()
+    store.create_index(base, chunks)
+    build_seconds = time.perf_counter() - start
+
+    return store, build_seconds
+
+
+def measure(store: VectorStore, queries: np.ndarray, truth: np.ndarray, k: int) -> dict:
+    latencies = []
+    hits = 0
+
+    # One query per call, like a live request
+    for i, query in enumerate(queries):
+        start = time.perf_counter()
+        _, labels = store.index.search(query.reshape(1, -1), k)
+        latencies.append((time.perf_counter() - start) * 1000)
+        hits += len(set(labels[0].tolist()) & set(truth[i].tolist()))
+
+    return {
+        "recall": hits / (len(queries) * k),
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p99_ms": float(np.percentile(latencies, 99)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--index-path", default="data/processed/faiss_index")
+    parser.add_argument("--synthetic", type=int, default=0, help="Use N synthetic vectors instead of the built index")
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--types", nargs="+", default=list(INDEX_TYPES), choices=INDEX_TYPES)
+    parser.add_argument("--codecs", nargs="+", default=list(CODECS), choices=CODECS)
+    parser.add_argument("--nlist", type=int, default=None, help="IVF centroids (default: ~sqrt(N))")
+    parser.add_argument("--pq-m", type=int, default=192, help="PQ sub-quantizers (must divide dim)")
+    parser.add_argument("--hnsw-m", type=int, default=32)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--ef-search", type=int, nargs="+", default=[16, 32, 64, 128])
+    args = parser.parse_args()
+
+    if args.synthetic:
+        base = synthetic_vectors(args.synthetic, args.dim)
+    else:
+        base = load_corpus_vectors(args.index_path)
+
+    queries = make_queries(base, args.queries)
+    nlist = args.nlist or max(1, int(np.sqrt(base.shape[0])))
+
+    logger.info(f"📊 Corpus: {base.shape[0]} x {base.shape[1]} | queries: {len(queries)} | k={args.k}")
+
+    # Exact float32 search is the ground truth for every configuration
+    baseline, _ = build_store(base, "flat", codec="none")
+    _, truth = baseline.index.search(queries, args.k)
+
+    rows = []
+    for index_type in args.types:
+        for codec in args.codecs:
+            if codec == "pq" and index_type == "hnsw":
+                continue
+
+            store, build_seconds = build_store(
+                base, index_type, codec=codec, nlist=nlist, pq_m=args.pq_m, hnsw_m=args.hnsw_m
+            )
+            # Serialized size includes HNSW links / codebooks, which memory_bytes() leaves out
+            bytes_per_vector = faiss.serialize_index(store.index).nbytes / base.shape[0]
+            code_bytes = store.memory_bytes() / base.shape[0]
+
+            if index_type == "ivf":
+                sweep = [(f"nprobe={n}", {"nprobe": n}) for n in args.nprobe]
+            elif index_type == "hnsw":
+                sweep = [(f"efSearch={ef}", {"ef_search": ef}) for ef in args.ef_search]
+            else:
+                sweep = [("-", {})]
+
+            for label, params in sweep:
+                store.set_search_params(**params)
+                rows.append((
+                    store.factory_string, label, build_seconds, code_bytes, bytes_per_vector,
+                    measure(store, queries, truth, args.k)
+                ))
+
+    print()
+    print(
+        f"{'index':<24} {'params':<14} {'build s':>8} {'code B':>7} {'bytes/vec':>10} "
+        f"{f'recall@{args.k}':>10} {'p50 ms':>8} {'p99 ms':>8}"
+    )
+    print("-" * 96)
+    for name, params, build_seconds, code_bytes, bytes_per_vector, m in rows:
+        print(
+            f"{name:<24} {params:<14} {build_seconds:>8.2f} {code_bytes:>7.0f} {bytes_per_vector:>10.0f} "
+            f"{m['recall']:>10.3f} {m['p50_ms']:>8.3f} {m['p99_ms']:>8.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Language Detection Benchmark - script-count detector vs langdetect on real
+user queries (rag_queries.question + user messages in conversations)
+
+Reports per-call latency, how often langdetect changes its answer between
+two runs over the same texts (it is randomized unless seeded), agreement
+between the two detectors, and the label distribution of each.
+
+Usage:
+    python benchmarks/language_detect_benchmark.py                 # queries from DATABASE_URL
+    python benchmarks/language_detect_benchmark.py --file queries.txt --limit 5000
+"""
+
+import sys
+import time
+import argparse
+from collections import Counter
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+from loguru import logger
+
+from utils.language_utils import detect_script_language
+
+# Used when the database has (almost) no logged queries yet
+SAMPLE_QUERIES = [
+    "मुद्रा योजना क्या है?",
+    "किसान क्रेडिट कार्ड के लिए कौन से दस्तावेज चाहिए?",
+    "What is the interest rate for a Kisan Credit Card?",
+    "How do I apply for PM MUDRA loan?",
+    "loan kaise milega",
+    "mudra loan ke liye kya chahiye",
+    "meri EMI kitni hogi",
+    "KCC के लिए apply कैसे करें",
+    "ਕਿਸਾਨ ਕ੍ਰੈਡਿਟ ਕਾਰਡ ਕੀ ਹੈ?",
+    "ਕਰਜ਼ਾ ਕਿਵੇਂ ਮਿਲੇਗਾ",
+    "வங்கி கடன் எப்படி பெறுவது?",
+    "വായ്പ എങ്ങനെ ലഭിക്കും?",
+    "PMEGP",
+    "stand up india",
+    "emi",
+]
+
+
+def load_queries(limit: int) -> list:
+    """Logged questions and user messages, newest first"""
+    from database.db import SessionLocal
+    from database.models import Conversation, RAGQuery
+
+    session = SessionLocal()
+    try:
+        questions = [
+            q for (q,) in session.query(RAGQuery.question)
+            .order_by(RAGQuery.id.desc()).limit(limit) if q
+        ]
+        messages = [
+            m for (m,) in session.query(Conversation.message_text)
+            .filter(Conversation.message_type == "user")
+            .order_by(Conversation.id.desc()).limit(limit) if m
+        ]
+    finally:
+        session.close()
+    return (questions + messages)[:limit]
+
+
+def time_detector(detect, texts: list, repeat: int) -> tuple:
+    """(labels of the first run, per-call latencies in µs over all runs)"""
+    labels = []
+    latencies = []
+    for run in range(repeat):
+        for text in texts:
+            start = time.perf_counter()
+            try:
+                label = detect(text)
+            except Exception:
+                label = "error"
+            latencies.append((time.perf_counter() - start) * 1e6)
+            if run == 0:
+                labels.append(label)
+    return labels, np.asarray(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--file", default=None, help="One query per line instead of the database")
+    parser.add_argument("--limit", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3, help="Timed passes over the texts")
+    parser.add_argument("--min-queries", type=int, default=20, help="Fall back to built-in samples below this")
+    args = parser.parse_args()
+
+    if args.file:
+        with open(args.file, encoding="utf-8") as f:
+            texts = [line.strip() for line in f if line.strip()][:args.limit]
+    else:
+        texts = load_queries(args.limit)
+
+    if len(texts) < args.min_queries:
+        logger.warning(f"⚠️ Only {len(texts)} logged queries - adding the built-in samples")
+        texts = texts + SAMPLE_QUERIES
+
+    logger.info(f"📊 {len(texts)} texts x {args.repeat} passes")
+
+    script_labels, script_us = time_detector(detect_script_language, texts, args.repeat)
+    rows = [("script", script_us)]
+
+    try:
+        from langdetect import detect
+    except ImportError:
+        detect = None
+        logger.warning("⚠️ langdetect not installed - timing the script detector only")
+
+    if detect is not None:
+        lang_labels, lang_us = time_detector(detect, texts, args.repeat)
+        rows.append(("langdetect", lang_us))
+        second_run, _ = time_detector(detect, texts, 1)
+        unstable = sum(a != b for a, b in zip(lang_labels, second_run))
+
+    print()
+    print(f"{'detector':<12} {'mean µs':>9} {'p50 µs':>9} {'p99 µs':>9}")
+    print("-" * 42)
+    for name, us in rows:
+        print(f"{name:<12} {us.mean():>9.1f} {np.percentile(us, 50):>9.1f} {np.percentile(us, 99):>9.1f}")
+
+    if detect is not None:
+        print()
+        print(f"speedup (mean): {lang_us.mean() / script_us.mean():.0f}x")
+        print(f"langdetect answers that changed between runs: {unstable}/{len(texts)}")
+
+        # Hinglish has no langdetect label - compare the rest
+        comparable = [(s, l) for s, l in zip(script_labels, lang_labels) if s != "hi-Latn"]
+        agree = sum(s == l for s, l in comparable)
+        print(f"agreement (excluding hi-Latn): {agree}/{len(comparable)}")
+
+        hinglish = [l for s, l in zip(script_labels, lang_labels) if s == "hi-Latn"]
+        if hinglish:
+            print(f"langdetect labels for texts detected as hi-Latn: {dict(Counter(hinglish).most_common(8))}")
+
+        print(f"langdetect labels: {dict(Counter(lang_labels).most_common(10))}")
+
+    print(f"script labels:     {dict(Counter(script_labels).most_common(10))}")
+
+
+if __name__ == "__main__":
+    main()
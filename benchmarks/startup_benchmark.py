@@ -0,0 +1,173 @@
+"""
+Startup Benchmark - how long `import api.main` / `import bots.telegram_bot`
+take, which packages that time goes to (python -X importtime), and what
+building each registry service costs. Fails when an entry point is over
+budget or imports a heavy library (torch, faiss, EasyOCR, ...) at import time
+
+Each measurement runs in a fresh interpreter so nothing is already imported.
+
+Usage:
+    python benchmarks/startup_benchmark.py                         # both entry points, 1 s budget
+    python benchmarks/startup_benchmark.py --targets api.main --repeat 5 --budget 0.5
+    python benchmarks/startup_benchmark.py --init rag loan fraud ocr   # + per-service init cost
+"""
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+from collections import defaultdict
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from loguru import logger
+
+
+# Must stay out of sys.modules until a request (or warm-up) actually needs them
+HEAVY_MODULES = [
+    "torch", "transformers", "sentence_transformers", "faiss", "easyocr",
+    "onnxruntime", "pdfplumber", "pandas", "sklearn", "cv2"
+]
+
+IMPORT_PROBE = """
+import sys, json, time, importlib
+start = time.perf_counter()
+importlib.import_module(sys.argv[1])
+seconds = time.perf_counter() - start
+heavy = [name for name in json.loads(sys.argv[2]) if name in sys.modules]
+print(json.dumps({"seconds": seconds, "heavy": heavy}))
+"""
+
+INIT_PROBE = """
+import sys, json, time
+from services.registry import registry
+heavy_names = json.loads(sys.argv[2])
+results = {}
+for name in sys.argv[1].split(","):
+    before = set(sys.modules)
+    start = time.perf_counter()
+    try:
+        registry.get(name)
+        error = None
+    except Exception as e:
+        error = str(e)
+    seconds = time.perf_counter() - start
+    new = set(sys.modules) - before
+    results[name] = {
+        "seconds": seconds,
+        "heavy": [m for m in heavy_names if m in new],
+        "error": error
+    }
+print(json.dumps(results))
+"""
+
+
+def _run(script: str, *args: str, importtime: bool = False) -> subprocess.CompletedProcess:
+    env = dict(os.environ, PYTHONPATH=str(project_root))
+    cmd = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", script, *args]
+    return subprocess.run(cmd, cwd=project_root, env=env, capture_output=True, text=True)
+
+
+def _last_json_line(stdout: str) -> dict:
+    # Modules may print / log on import - the probe's result is the last line
+    for line in reversed(stdout.strip().splitlines()):
+        if line.startswith("{"):
+            return json.loads(line)
+    raise ValueError("probe printed no result")
+
+
+def parse_importtime(stderr: str) -> dict:
+    """Self time (seconds) per top-level package from -X importtime output"""
+    per_package = defaultdict(float)
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        # "import time:  self_us | cumulative_us |   package.module"
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        name = parts[2].strip()
+        per_package[name.split(".")[0]] += int(parts[0]) / 1e6
+    return dict(per_package)
+
+
+def measure_import(target: str, repeat: int) -> dict:
+    """Best-of-N import time for an entry point plus its per-package breakdown"""
+    best = None
+    for _ in range(repeat):
+        proc = _run(IMPORT_PROBE, target, json.dumps(HEAVY_MODULES), importtime=True)
+        if proc.returncode != 0:
+            tail = proc.stderr.strip().splitlines()[-1:] or ["unknown error"]
+            return {"target": target, "error": tail[0]}
+
+        result = _last_json_line(proc.stdout)
+        if best is None or result["seconds"] < best["seconds"]:
+            best = dict(result, target=target, packages=parse_importtime(proc.stderr))
+    return best
+
+
+def measure_init(names: list) -> dict:
+    """Construction time of each registry service, in one fresh process"""
+    proc = _run(INIT_PROBE, ",".join(names), json.dumps(HEAVY_MODULES))
+    if proc.returncode != 0:
+        tail = proc.stderr.strip().splitlines()[-1:] or ["unknown error"]
+        return {name: {"error": tail[0]} for name in names}
+    return _last_json_line(proc.stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--targets", nargs="+", default=["api.main", "bots.telegram_bot"])
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh-interpreter runs per target (best is kept)")
+    parser.add_argument("--budget", type=float, default=1.0, help="Max import seconds per target")
+    parser.add_argument("--top", type=int, default=12, help="Packages shown in the breakdown")
+    parser.add_argument("--init", nargs="*", default=[], metavar="SERVICE", help="Registry services to construct")
+    args = parser.parse_args()
+
+    failures = []
+
+    for target in args.targets:
+        result = measure_import(target, max(1, args.repeat))
+        if "error" in result:
+            logger.error(f"❌ import {target} failed: {result['error']}")
+            failures.append(f"{target}: import failed")
+            continue
+
+        print()
+        print(f"import {target}: {result['seconds']:.3f}s (budget {args.budget:.2f}s)")
+        print(f"  {'package':<28} {'self s':>8}")
+        print("  " + "-" * 37)
+        ranked = sorted(result["packages"].items(), key=lambda kv: kv[1], reverse=True)
+        for package, seconds in ranked[:args.top]:
+            print(f"  {package:<28} {seconds:>8.3f}")
+
+        if result["seconds"] > args.budget:
+            failures.append(f"{target}: {result['seconds']:.3f}s > {args.budget:.2f}s")
+        if result["heavy"]:
+            failures.append(f"{target}: imports {', '.join(result['heavy'])} at import time")
+
+    if args.init:
+        print()
+        print(f"{'service':<14} {'init s':>8}  heavy modules loaded")
+        print("-" * 60)
+        for name, info in measure_init(args.init).items():
+            if info.get("error"):
+                print(f"{name:<14} {'-':>8}  error: {info['error']}")
+                continue
+            heavy = ", ".join(info["heavy"]) or "-"
+            print(f"{name:<14} {info['seconds']:>8.3f}  {heavy}")
+
+    print()
+    if failures:
+        for failure in failures:
+            logger.error(f"❌ {failure}")
+        sys.exit(1)
+    logger.success("✅ Startup within budget, no heavy imports at import time")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Worker Memory Benchmark - total memory of a gunicorn deployment of
+api.main:app for 1, 4 and 8 workers, with and without preloading
+
+RSS counts shared pages once per process, so the preload gain shows up in
+PSS (proportional set size: each shared page split between its users).
+Both are summed over the master and all workers once every worker is ready.
+Build the index first (python build_index.py).
+
+Usage:
+    python benchmarks/worker_memory_benchmark.py
+    python benchmarks/worker_memory_benchmark.py --workers 1 4 --modes preload
+"""
+
+import os
+import sys
+import time
+import signal
+import argparse
+import subprocess
+import urllib.request
+import urllib.error
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+import psutil
+from loguru import logger
+
+
+def process_memory_mb(proc: psutil.Process) -> tuple:
+    """(RSS, PSS) in MB - PSS needs /proc/<pid>/smaps (Linux)"""
+    try:
+        info = proc.memory_full_info()
+        return info.rss / 1024 ** 2, getattr(info, "pss", 0) / 1024 ** 2
+    except (psutil.AccessDenied, psutil.NoSuchProcess):
+        return 0.0, 0.0
+
+
+def tree_memory_mb(master: psutil.Process) -> dict:
+    processes = [master] + master.children(recursive=True)
+    rss = pss = 0.0
+    for proc in processes:
+        proc_rss, proc_pss = process_memory_mb(proc)
+        rss += proc_rss
+        pss += proc_pss
+    return {"processes": len(processes), "rss_mb": rss, "pss_mb": pss}
+
+
+def wait_until_ready(port: int, workers: int, timeout: float) -> bool:
+    """
+    /ready is answered by whichever worker accepts - require a streak of 200s
+    long enough that every worker has very likely answered
+    """
+    deadline = time.monotonic() + timeout
+    streak = 0
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/ready", timeout=5) as response:
+                streak = streak + 1 if response.status == 200 else 0
+        except (urllib.error.URLError, ConnectionError, OSError):
+            streak = 0
+        if streak >= 4 * workers:
+            return True
+        time.sleep(0.25)
+    return False
+
+
+def run(workers: int, preload: bool, port: int, timeout: float, settle: float) -> dict:
+    env = dict(
+        os.environ,
+        WEB_CONCURRENCY=str(workers),
+        PRELOAD_APP="true" if preload else "false",
+        BIND=f"127.0.0.1:{port}"
+    )
+    cmd = [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "api.main:app"]
+    server = subprocess.Popen(cmd, cwd=project_root, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    start = time.perf_counter()
+    try:
+        if not wait_until_ready(port, workers, timeout):
+            return {"error": f"not ready after {timeout:.0f}s"}
+        ready_seconds = time.perf_counter() - start
+
+        # Let lazily-touched pages and allocator arenas settle
+        time.sleep(settle)
+        return dict(tree_memory_mb(psutil.Process(server.pid)), ready_seconds=ready_seconds)
+    finally:
+        server.send_signal(signal.SIGTERM)
+        try:
+            server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", nargs="+", type=int, default=[1, 4, 8])
+    parser.add_argument("--modes", nargs="+", default=["preload", "per-worker"], choices=["preload", "per-worker"])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=600, help="Seconds to wait for all workers to be ready")
+    parser.add_argument("--settle", type=float, default=5, help="Seconds to wait before measuring")
+    args = parser.parse_args()
+
+    rows = []
+    for mode in args.modes:
+        for workers in args.workers:
+            logger.info(f"🚀 {workers} worker(s), {mode}")
+            rows.append((mode, workers, run(workers, mode == "preload", args.port, args.timeout, args.settle)))
+
+    print()
+    print(f"{'mode':<11} {'workers':>7} {'procs':>6} {'ready s':>8} {'RSS MB':>9} {'PSS MB':>9} {'PSS/worker':>11}")
+    print("-" * 67)
+    for mode, workers, r in rows:
+        if "error" in r:
+            print(f"{mode:<11} {workers:>7}  error: {r['error']}")
+            continue
+        print(
+            f"{mode:<11} {workers:>7} {r['processes']:>6} {r['ready_seconds']:>8.1f} "
+            f"{r['rss_mb']:>9.0f} {r['pss_mb']:>9.0f} {r['pss_mb'] / workers:>11.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -4,9 +4,12 @@ Asks the RIGHT questions for the actual model
 """
 
 import os
+import re
 import sys
+import time
 import asyncio
 from pathlib import Path
+from typing import AsyncIterator
 
 # ✅ ADD PROJECT ROOT TO PATH
 project_root = Path(__file__).resolve().parent.parent
@@ -21,22 +24,18 @@ from telegram.ext import (
     ContextTypes,
     ConversationHandler
 )
-from telegram.error import NetworkError, TimedOut, BadRequest
+from telegram.error import NetworkError, TimedOut, BadRequest, RetryAfter
 from loguru import logger
 from dotenv import load_dotenv
 
 load_dotenv()
 
 # ✅ Import services AFTER path setup
-from services.rag_service import RAGService
-from services.loan_service import LoanService
-from services.fraud_service import FraudService
-from services.advisory_service import AdvisoryService
-from services.translation_service import TranslationService
-from services.gtts_service import GTTsService
-from services.ocr_service import OCRService
+from services.registry import lazy_service
 from database.db import SessionLocal, init_db
 from database.models import UserPreference
+from database.db_manager import find_user_preference
+from utils.executors import run_io
 
 # ✅ Initialize database first
 try:
@@ -45,18 +44,14 @@ try:
 except Exception as e:
     logger.error(f"❌ Database initialization failed: {e}")
 
-# ✅ Initialize services
-try:
-    rag_service = RAGService()
-    loan_service = LoanService()
-    fraud_service = FraudService()
-    advisory_service = AdvisoryService()
-    translation_service = TranslationService()
-    gtts_service = GTTsService()
-    ocr_service = OCRService()
-    logger.success("✅ All services initialized")
-except Exception as e:
-    logger.error(f"⚠️ Some services failed to initialize: {e}")
+# ✅ Service handles - each is built on first use, so the bot starts polling immediately
+rag_service = lazy_service("rag")
+loan_service = lazy_service("loan")
+fraud_service = lazy_service("fraud")
+advisory_service = lazy_service("advisory")
+translation_service = lazy_service("translation")
+gtts_service = lazy_service("gtts")
+ocr_service = lazy_service("ocr")
 
 # Conversation states
 LANGUAGE_SELECT, LOCATION_INPUT = range(2)
@@ -122,9 +117,7 @@ def get_user_language(telegram_id: str) -> str:
     """Get user's preferred language from database"""
     db = SessionLocal()
     try:
-        pref = db.query(UserPreference).filter(
-            UserPreference.telegram_user_id == telegram_id
-        ).first()
+        pref = find_user_preference(db, telegram_id)
         
         if pref and pref.preferred_language:
             return pref.preferred_language
@@ -136,13 +129,83 @@ def get_user_language(telegram_id: str) -> str:
         db.close()
 
 
+# ==================== STREAMED REPLIES ==================== #
+
+TELEGRAM_MESSAGE_LIMIT = 4096
+SENTENCE_END = re.compile(r"[.!?।\n]")
+
+
+async def reply_streaming(message, pieces: AsyncIterator[str]) -> str:
+    """
+    Reply with a streamed answer: the first complete sentence is sent as soon
+    as it arrives, then that message is edited with the growing text at most
+    once per TELEGRAM_EDIT_INTERVAL seconds (Telegram flood limits edits to
+    about one per second per chat). Text beyond 4096 chars continues in a new
+    message. Returns the full text.
+    """
+    edit_interval = float(os.getenv("TELEGRAM_EDIT_INTERVAL", 1.0))
+
+    text = ""
+    offset = 0          # start of the part shown in the current message
+    sent = None         # current Telegram message
+    shown = ""          # what the current message displays
+    next_edit = 0.0
+
+    async def edit(content: str) -> bool:
+        nonlocal shown, next_edit
+        try:
+            await sent.edit_text(content)
+        except RetryAfter as e:
+            next_edit = time.monotonic() + float(e.retry_after)
+            return False
+        except BadRequest as e:
+            if "not modified" not in str(e).lower():
+                raise
+        shown = content
+        next_edit = time.monotonic() + edit_interval
+        return True
+
+    async def final_edit(content: str):
+        # A finished message must show its full text, even if that means waiting out flood control
+        if content != shown and not await edit(content):
+            await asyncio.sleep(max(0.0, next_edit - time.monotonic()))
+            await edit(content)
+
+    async for piece in pieces:
+        text += piece
+
+        # Current message full: finalize it and continue in a new one
+        while sent is not None and len(text) - offset > TELEGRAM_MESSAGE_LIMIT:
+            await final_edit(text[offset:offset + TELEGRAM_MESSAGE_LIMIT])
+            offset += TELEGRAM_MESSAGE_LIMIT
+            sent = None
+
+        current = text[offset:]
+        if sent is None:
+            if current.strip() and SENTENCE_END.search(current):
+                sent = await message.reply_text(current[:TELEGRAM_MESSAGE_LIMIT])
+                shown = current[:TELEGRAM_MESSAGE_LIMIT]
+                next_edit = time.monotonic() + edit_interval
+        elif current != shown and time.monotonic() >= next_edit:
+            await edit(current)
+
+    current = text[offset:]
+    if sent is None:
+        if current.strip():
+            await message.reply_text(current)
+    else:
+        await final_edit(current)
+
+    return text
+
+
 # ==================== COMMAND HANDLERS ==================== #
 
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /start command"""
     
     telegram_id = str(update.effective_user.id)
-    user_lang = get_user_language(telegram_id)
+    user_lang = await run_io(get_user_language, telegram_id)
     
     messages = {
         'en': f"""👋 Hello {update.effective_user.first_name}!
@@ -227,9 +290,7 @@ async def language_selected(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     db = SessionLocal()
     try:
-        pref = db.query(UserPreference).filter(
-            UserPreference.telegram_user_id == telegram_id
-        ).first()
+        pref = await run_io(find_user_preference, db, telegram_id)
         
         if pref:
             pref.preferred_language = lang_code
@@ -240,7 +301,7 @@ async def language_selected(update: Update, context: ContextTypes.DEFAULT_TYPE):
             )
             db.add(pref)
         
-        db.commit()
+        await run_io(db.commit)
         context.user_data['selected_language'] = lang_code
         
         messages = {
@@ -272,14 +333,12 @@ async def location_received(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     db = SessionLocal()
     try:
-        pref = db.query(UserPreference).filter(
-            UserPreference.telegram_user_id == telegram_id
-        ).first()
+        pref = await run_io(find_user_preference, db, telegram_id)
         
         if pref:
             pref.location = location
             pref.advisory_enabled = True
-            db.commit()
+            await run_io(db.commit)
         
         messages = {
             'en': f"""✅ Setup Complete!
@@ -327,13 +386,11 @@ async def advisory_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /advisory command"""
     
     telegram_id = str(update.effective_user.id)
-    user_lang = get_user_language(telegram_id)
+    user_lang = await run_io(get_user_language, telegram_id)
     
     db = SessionLocal()
     try:
-        pref = db.query(UserPreference).filter(
-            UserPreference.telegram_user_id == telegram_id
-        ).first()
+        pref = await run_io(find_user_preference, db, telegram_id)
         
         if not pref:
             messages = {
@@ -358,14 +415,14 @@ async def advisory_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         
         if user_lang not in ['hi', 'en']:
             try:
-                advisory_text = translation_service.translate(advisory_text, user_lang)
+                advisory_text = await translation_service.translate_async(advisory_text, user_lang, site="bot_advisory")
             except Exception as e:
                 logger.error(f"Translation error: {e}")
         
         await update.message.reply_text(advisory_text)
         
         try:
-            audio_path = gtts_service.text_to_speech(advisory_text, lang=user_lang)
+            audio_path = await gtts_service.text_to_speech_async(advisory_text, lang=user_lang)
             
             with open(audio_path, 'rb') as audio:
                 await update.message.reply_audio(
@@ -398,7 +455,7 @@ async def explain_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /explain command"""
     
     telegram_id = str(update.effective_user.id)
-    user_lang = get_user_language(telegram_id)
+    user_lang = await run_io(get_user_language, telegram_id)
     
     messages = {
         'en': """📄 Document Explanation Service
@@ -438,7 +495,14 @@ async def schemes_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /schemes command"""
     
     telegram_id = str(update.effective_user.id)
-    user_lang = get_user_language(telegram_id)
+    user_lang = await run_io(get_user_language, telegram_id)
+    
+    # /schemes <name> → precomputed explanation (live RAG only for unknown names)
+    if context.args:
+        scheme_name = " ".join(context.args)
+        explanation = await rag_service.explain_scheme_async(scheme_name, language=user_lang)
+        await update.message.reply_text(explanation)
+        return
     
     messages = {
         'en': """🏛️ Government Schemes
@@ -449,7 +513,7 @@ async def schemes_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 4️⃣ PM-KISAN Yojana
 5️⃣ Pradhan Mantri Awas Yojana
 
-Ask about any scheme!""",
+Ask about any scheme, e.g. /schemes Kisan Credit Card""",
 
         'hi': """🏛️ सरकारी योजनाएं
 
@@ -459,7 +523,7 @@ Ask about any scheme!""",
 4️⃣ PM-KISAN योजना
 5️⃣ प्रधानमंत्री आवास योजना
 
-किसी योजना के बारे में पूछें!""",
+किसी योजना के बारे में पूछें, जैसे /schemes किसान क्रेडिट कार्ड""",
 
         'pa': """🏛️ ਸਰਕਾਰੀ ਯੋਜਨਾਵਾਂ
 
@@ -467,7 +531,7 @@ Ask about any scheme!""",
 2️⃣ ਕਿਸਾਨ ਕ੍ਰੈਡਿਟ ਕਾਰਡ
 3️⃣ ਸਟੈਂਡ ਅੱਪ ਇੰਡੀਆ
 
-ਕਿਸੇ ਵੀ ਯੋਜਨਾ ਬਾਰੇ ਪੁੱਛੋ!"""
+ਕਿਸੇ ਵੀ ਯੋਜਨਾ ਬਾਰੇ ਪੁੱਛੋ, ਜਿਵੇਂ /schemes Kisan Credit Card"""
     }
     
     await update.message.reply_text(messages.get(user_lang, messages['hi']))
@@ -479,7 +543,7 @@ async def loan_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /loan command - START with education"""
     
     telegram_id = str(update.effective_user.id)
-    user_lang = get_user_language(telegram_id)
+    user_lang = await run_io(get_user_language, telegram_id)
     
     context.user_data['loan_data'] = {}
     
@@ -518,7 +582,7 @@ Type: Graduate or Not Graduate
 
 async def loan_education(update: Update, context: ContextTypes.DEFAULT_TYPE):
     telegram_id = str(update.effective_user.id)
-    user_lang = get_user_language(telegram_id)
+    user_lang = await run_io(get_user_language, telegram_id)
     
     context.user_data['loan_data']['education'] = update.message.text
     
@@ -534,7 +598,7 @@ async def loan_education(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def loan_employment(update: Update, context: ContextTypes.DEFAULT_TYPE):
     telegram_id = str(update.effective_user.id)
-    user_lang = get_user_language(telegram_id)
+    user_lang = await run_io(get_user_language, telegram_id)
     
     context.user_data['loan_data']['self_employed'] = update.message.text
     
@@ -550,7 +614,7 @@ async def loan_employment(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def loan_dependents(update: Update, context: ContextTypes.DEFAULT_TYPE):
     telegram_id = str(update.effective_user.id)
-    user_lang = get_user_language(telegram_id)
+    user_lang = await run_io(get_user_language, telegram_id)
     
     try:
         dependents = int(update.message.text)
@@ -571,7 +635,7 @@ async def loan_dependents(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def loan_income(update: Update, context: ContextTypes.DEFAULT_TYPE):
     telegram_id = str(update.effective_user.id)
-    user_lang = get_user_language(telegram_id)
+    user_lang = await run_io(get_user_language, telegram_id)
     
     try:
         income = float(update.message.text.replace(',', ''))
@@ -592,7 +656,7 @@ async def loan_income(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def loan_amount(update: Update, context: ContextTypes.DEFAULT_TYPE):
     telegram_id = str(update.effective_user.id)
-    user_lang = get_user_language(telegram_id)
+    user_lang = await run_io(get_user_language, telegram_id)
     
     try:
         amount = float(update.message.text.replace(',', ''))
@@ -615,7 +679,7 @@ async def loan_amount(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def loan_term(update: Update, context: ContextTypes.DEFAULT_TYPE):
     telegram_id = str(update.effective_user.id)
-    user_lang = get_user_language(telegram_id)
+    user_lang = await run_io(get_user_language, telegram_id)
     
     try:
         term = int(update.message.text)
@@ -641,7 +705,7 @@ async def loan_term(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def loan_credit(update: Update, context: ContextTypes.DEFAULT_TYPE):
     telegram_id = str(update.effective_user.id)
-    user_lang = get_user_language(telegram_id)
+    user_lang = await run_io(get_user_language, telegram_id)
     
     try:
         credit = int(update.message.text)
@@ -664,7 +728,7 @@ async def loan_credit(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def loan_residential(update: Update, context: ContextTypes.DEFAULT_TYPE):
     telegram_id = str(update.effective_user.id)
-    user_lang = get_user_language(telegram_id)
+    user_lang = await run_io(get_user_language, telegram_id)
     
     try:
         res_assets = float(update.message.text.replace(',', ''))
@@ -685,7 +749,7 @@ async def loan_residential(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def loan_commercial(update: Update, context: ContextTypes.DEFAULT_TYPE):
     telegram_id = str(update.effective_user.id)
-    user_lang = get_user_language(telegram_id)
+    user_lang = await run_io(get_user_language, telegram_id)
     
     try:
         com_assets = float(update.message.text.replace(',', ''))
@@ -706,7 +770,7 @@ async def loan_commercial(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def loan_luxury(update: Update, context: ContextTypes.DEFAULT_TYPE):
     telegram_id = str(update.effective_user.id)
-    user_lang = get_user_language(telegram_id)
+    user_lang = await run_io(get_user_language, telegram_id)
     
     try:
         lux_assets = float(update.message.text.replace(',', ''))
@@ -728,7 +792,7 @@ async def loan_luxury(update: Update, context: ContextTypes.DEFAULT_TYPE):
 async def loan_bank(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Final step - get bank assets and make prediction"""
     telegram_id = str(update.effective_user.id)
-    user_lang = get_user_language(telegram_id)
+    user_lang = await run_io(get_user_language, telegram_id)
     
     try:
         bank_assets = float(update.message.text.replace(',', ''))
@@ -747,13 +811,13 @@ async def loan_bank(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     try:
         loan_data = context.user_data['loan_data']
-        result = loan_service.predict_eligibility(loan_data)
+        result = await loan_service.predict_eligibility_async(loan_data)
         
         message = result['message_hindi'] if user_lang == 'hi' else result['message_english']
         
         if user_lang not in ['hi', 'en']:
             try:
-                message = translation_service.translate(message, user_lang)
+                message = await translation_service.translate_async(message, user_lang, site="bot_loan")
             except:
                 pass
         
@@ -779,7 +843,7 @@ async def loan_bank(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def fraud_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     telegram_id = str(update.effective_user.id)
-    user_lang = get_user_language(telegram_id)
+    user_lang = await run_io(get_user_language, telegram_id)
     
     context.user_data['fraud_data'] = {}
     
@@ -817,7 +881,7 @@ Type the name of the loan/scheme
 
 async def fraud_scheme_name(update: Update, context: ContextTypes.DEFAULT_TYPE):
     telegram_id = str(update.effective_user.id)
-    user_lang = get_user_language(telegram_id)
+    user_lang = await run_io(get_user_language, telegram_id)
     
     context.user_data['fraud_data']['scheme_name'] = update.message.text
     
@@ -833,7 +897,7 @@ async def fraud_scheme_name(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def fraud_description(update: Update, context: ContextTypes.DEFAULT_TYPE):
     telegram_id = str(update.effective_user.id)
-    user_lang = get_user_language(telegram_id)
+    user_lang = await run_io(get_user_language, telegram_id)
     
     context.user_data['fraud_data']['description'] = update.message.text
     
@@ -849,7 +913,7 @@ async def fraud_description(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def fraud_source(update: Update, context: ContextTypes.DEFAULT_TYPE):
     telegram_id = str(update.effective_user.id)
-    user_lang = get_user_language(telegram_id)
+    user_lang = await run_io(get_user_language, telegram_id)
     
     context.user_data['fraud_data']['source'] = update.message.text
     context.user_data['fraud_data']['contact'] = ""
@@ -864,13 +928,13 @@ async def fraud_source(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     try:
         fraud_data = context.user_data['fraud_data']
-        result = fraud_service.detect_fraud(fraud_data)
+        result = await fraud_service.detect_fraud_async(fraud_data)
         
         message = result['warning_message_hindi'] if user_lang == 'hi' else result['warning_message_english']
         
         if user_lang not in ['hi', 'en']:
             try:
-                message = translation_service.translate(message, user_lang)
+                message = await translation_service.translate_async(message, user_lang, site="bot_fraud")
             except:
                 pass
         
@@ -894,7 +958,7 @@ async def fraud_source(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def cancel(update: Update, context: ContextTypes.DEFAULT_TYPE):
     telegram_id = str(update.effective_user.id)
-    user_lang = get_user_language(telegram_id)
+    user_lang = await run_io(get_user_language, telegram_id)
     
     context.user_data.clear()
     
@@ -912,7 +976,7 @@ async def cancel(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def handle_document(update: Update, context: ContextTypes.DEFAULT_TYPE):
     telegram_id = str(update.effective_user.id)
-    user_lang = get_user_language(telegram_id)
+    user_lang = await run_io(get_user_language, telegram_id)
     file_path = None
     
     try:
@@ -928,7 +992,7 @@ async def handle_document(update: Update, context: ContextTypes.DEFAULT_TYPE):
         file_path = f"temp_{telegram_id}.{file_ext}"
         await file.download_to_drive(file_path)
         
-        extracted_text = ocr_service.extract_text(file_path, file_ext)
+        extracted_text = await ocr_service.extract_text_async(file_path, file_ext)
         
         if not extracted_text:
             error_messages = {
@@ -941,7 +1005,7 @@ async def handle_document(update: Update, context: ContextTypes.DEFAULT_TYPE):
         
         lang_for_rag = 'hindi' if user_lang == 'hi' else 'english'
         
-        simplified = rag_service.answer_question(
+        simplified = await rag_service.answer_question_async(
             f"Explain this document in simple language: {extracted_text[:1000]}",
             language=lang_for_rag
         )
@@ -950,14 +1014,14 @@ async def handle_document(update: Update, context: ContextTypes.DEFAULT_TYPE):
         
         if user_lang not in ['hi', 'en']:
             try:
-                answer_text = translation_service.translate(answer_text, user_lang)
+                answer_text = await translation_service.translate_async(answer_text, user_lang, site="bot_document")
             except Exception as e:
                 logger.error(f"Translation error: {e}")
         
         await update.message.reply_text(answer_text)
         
         try:
-            audio_path = gtts_service.text_to_speech(answer_text, lang=user_lang)
+            audio_path = await gtts_service.text_to_speech_async(answer_text, lang=user_lang)
             
             with open(audio_path, 'rb') as audio:
                 await update.message.reply_audio(audio=audio, caption="🎧 आवाज़ में सुनें")
@@ -988,17 +1052,32 @@ async def handle_document(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def handle_text_query(update: Update, context: ContextTypes.DEFAULT_TYPE):
     telegram_id = str(update.effective_user.id)
-    user_lang = get_user_language(telegram_id)
+    user_lang = await run_io(get_user_language, telegram_id)
     query = update.message.text
     
     try:
+        # A bare scheme/term name ("KCC", "ब्याज दर") has a precomputed answer
+        explanation = rag_service.lookup_explanation(query, user_lang)
+        if explanation:
+            await update.message.reply_text(explanation)
+            return
+        
         lang_for_rag = 'hindi' if user_lang == 'hi' else 'english'
-        result = rag_service.answer_question(query, language=lang_for_rag)
+        
+        # Hindi/English answers need no translation: stream them as they are generated
+        if user_lang in ['hi', 'en']:
+            await reply_streaming(
+                update.message,
+                rag_service.stream_answer_async(query, language=lang_for_rag)
+            )
+            return
+        
+        result = await rag_service.answer_question_async(query, language=lang_for_rag)
         answer = result['answer']
         
         if user_lang not in ['hi', 'en']:
             try:
-                answer = translation_service.translate(answer, user_lang)
+                answer = await translation_service.translate_async(answer, user_lang, site="bot_rag")
             except Exception as e:
                 logger.error(f"Translation error: {e}")
         
@@ -1109,6 +1188,10 @@ def main():
     logger.success("🤖 Telegram Bot Starting...")
     logger.success("=" * 60)
     
+    # Load the RAG model + index while polling starts; questions asked
+    # before it finishes get a "warming up" reply instead of waiting
+    rag_service.start_warmup()
+    
     try:
         logger.info("Connecting to Telegram servers...")
         application.run_polling(
@@ -1,24 +1,31 @@
 """
 Pre-build RAG index
-Run this once to create the index files
+Run this once to create the index files, then precompute the scheme/term
+explanations (skip with --skip-explanations, regenerate all with --force-explanations)
 """
 
 import sys
+import argparse
 from pathlib import Path
 
 # Add project root to path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-from services.rag_service import RAGService
+from services.registry import get_service
 from loguru import logger
 
 def main():
+    parser = argparse.ArgumentParser(description="Build the RAG index and precompute explanations")
+    parser.add_argument("--skip-explanations", action="store_true")
+    parser.add_argument("--force-explanations", action="store_true")
+    args = parser.parse_args()
+
     logger.info("🔄 Building RAG index...")
     
     try:
         # Initialize RAG service (will build index if needed)
-        rag = RAGService()
+        rag = get_service("rag")
         
         # Force initialization
         rag._ensure_initialized()
@@ -26,6 +33,9 @@ def main():
         logger.success("✅ RAG index built successfully!")
         logger.info(f"📁 Index saved in: data/processed/faiss_index/")
         
+        if not args.skip_explanations:
+            rag.precompute_explanations(force=args.force_explanations)
+        
     except Exception as e:
         logger.error(f"❌ Failed to build index: {e}")
         raise
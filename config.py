@@ -43,12 +43,43 @@ class Settings(BaseSettings):
     groq_model: str = "llama-3.1-8b-instant"  # Groq model
     llm_temperature: float = 0.3
     llm_max_tokens: int = 1000
+    llm_requests_per_minute: int = 20  # token bucket shared by all LLM calls in a process
+    llm_burst: int = 5  # calls allowed back to back; the rest of the minute's quota is spread evenly
+    llm_requests_per_day: int = 14400  # Groq free-tier daily quota
+    llm_daily_burst: int = 600  # part of the daily quota usable at once; the rest is spread over the day
+    llm_rate_limit_max_wait: float = 120  # seconds a call may queue before giving up
+    llm_max_retries: int = 2  # backoff retries on 429 / 5xx / timeouts
+    llm_max_connections: int = 10  # pooled HTTP connections to Groq
+    telegram_edit_interval: float = 1.0  # min seconds between streamed message edits (Telegram flood limit)
 
     # ==================== RAG CONFIGURATION ==================== #
     embedding_model: str = "sentence-transformers/paraphrase-multilingual-mpnet-base-v2"
+    embedding_backend: str = "torch"  # "torch", "onnx" or "onnx-int8" (needs onnxruntime)
     chunk_size: int = 500
     chunk_overlap: int = 50
     top_k_results: int = 5
+    vector_store_mmap: bool = True  # mmap FAISS index + columnar chunk store on load
+    faiss_index_type: str = "flat"  # "flat", "ivf" or "hnsw"
+    faiss_codec: str = "none"  # "none" (float32), "sq8", "fp16" or "pq"
+    faiss_pq_m: int = 192  # PQ sub-quantizers (bytes per vector at 8 bits)
+    faiss_nlist: int = 256  # IVF centroids
+    faiss_nprobe: int = 16  # IVF lists scanned per query
+    faiss_hnsw_m: int = 32  # HNSW graph degree
+    faiss_ef_search: int = 64  # HNSW candidate list size per query
+    query_embed_cache_size: int = 1024  # LRU entries of query embeddings (0 disables)
+    query_embed_cache_path: str = ""  # SQLite file to persist them across restarts
+    chunk_embed_cache_path: str = "data/cache/chunk_embeddings.sqlite"  # "" disables
+    lexical_index: bool = True  # SQLite FTS5 keyword index next to the FAISS index
+    lexical_fast_path: bool = True  # answer rare keyword queries without embedding
+    retrieval_mode: str = "vector"  # "vector" or "hybrid" (RRF of vector + BM25)
+    lexical_max_terms: int = 4  # longest query (content words) tried on the fast path
+    lexical_max_df_ratio: float = 0.05  # fast path only if the phrase is in <= 5% of chunks
+    answer_cache_size: int = 2048  # cached LLM answers (0 disables the answer cache)
+    answer_cache_ttl: int = 86400  # seconds before a cached answer expires
+    answer_cache_threshold: float = 0.95  # min question cosine similarity for a hit
+    answer_cache_path: str = "data/cache/answers.sqlite"  # "" keeps it in memory only
+    explanations_path: str = "data/processed/explanations.json"  # precomputed scheme/term explanations
+    precompute_requests_per_minute: int = 10  # LLM pacing of the explanation precompute (0 = shared limiter only)
     
     # ==================== TTS & TRANSLATION ==================== #
     tts_service: str = "gtts"
@@ -60,6 +91,11 @@ class Settings(BaseSettings):
     # ==================== SCHEDULER ==================== #
     advisory_time: str = "08:00"
 
+    # ==================== WORKER POOLS ==================== #
+    io_pool_size: int = 16  # threads for blocking I/O (translation, gTTS, SQLAlchemy)
+    model_pool_size: int = 2  # threads for embeddings / FAISS / sklearn predict
+    ocr_process_pool_size: int = 1  # EasyOCR worker processes (each loads its own reader)
+
     # ==================== FILE UPLOAD ==================== #
     max_file_size_mb: int = 10
     upload_dir: str = "./uploads"
@@ -5,11 +5,14 @@ Enhanced version with helper methods for saving data
 
 import os
 from datetime import datetime
+from typing import Optional
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
 from loguru import logger
 from dotenv import load_dotenv
 
+from utils.executors import run_io
+
 load_dotenv()
 
 from database.models import (
@@ -115,6 +118,17 @@ class DatabaseManager:
         finally:
             session.close()
 
+    # Async variants for request handlers: the session work runs on the I/O pool
+
+    async def save_loan_query_async(self, data: dict):
+        await run_io(self.save_loan_query, data)
+
+    async def save_fraud_check_async(self, data: dict):
+        await run_io(self.save_fraud_check, data)
+
+    async def save_rag_query_async(self, data: dict):
+        await run_io(self.save_rag_query, data)
+
 
 # Global singleton instance
 db_manager = DatabaseManager()
@@ -137,4 +151,14 @@ def get_db():
     try:
         yield session
     finally:
-        session.close()
\ No newline at end of file
+        session.close()
+
+
+def find_user_preference(session: Session, telegram_user_id: str) -> Optional[UserPreference]:
+    """
+    A Telegram user's preferences row (None if never set)
+    Blocking - async handlers call it through utils.executors.run_io
+    """
+    return session.query(UserPreference).filter(
+        UserPreference.telegram_user_id == telegram_user_id
+    ).first()
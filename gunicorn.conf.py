@@ -0,0 +1,39 @@
+"""
+Gunicorn config for api.main:app
+
+    gunicorn -c gunicorn.conf.py api.main:app
+
+With PRELOAD_APP=true (default) the master imports the app and loads the
+embedding model, FAISS index and sklearn models (PRELOAD_SERVICES) before
+forking, so workers share one copy instead of loading one each. Build the
+index first (python build_index.py) so the master only loads it.
+
+Env:
+    WEB_CONCURRENCY            workers (default 2)
+    PRELOAD_APP                true / false
+    PRELOAD_SERVICES           default "rag,loan,fraud"
+    TORCH_THREADS_PER_WORKER   default: CPU cores / workers
+"""
+
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", 2))
+worker_class = "uvicorn.workers.UvicornWorker"
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 120))
+
+preload_app = os.getenv("PRELOAD_APP", "true").lower() in ("1", "true", "yes")
+
+
+def when_ready(server):
+    # Runs in the master after the app is imported, before any worker forks
+    if not preload_app:
+        return
+    from services.preload import preload_services
+    preload_services()
+
+
+def post_fork(server, worker):
+    from services.preload import configure_worker
+    threads = configure_worker(server.cfg.workers)
+    server.log.info(f"Worker {worker.pid}: {threads} torch thread(s)")
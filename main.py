@@ -104,8 +104,8 @@ def test_services():
     
     # Test Loan Service
     print("1️⃣ Testing Loan Service...")
-    from services.loan_service import LoanService
-    loan_service = LoanService()
+    from services.registry import get_service
+    loan_service = get_service("loan")
     
     test_user = {
         'income': 30000,
@@ -124,8 +124,7 @@ def test_services():
     
     # Test Fraud Service
     print("2️⃣ Testing Fraud Service...")
-    from services.fraud_service import FraudService
-    fraud_service = FraudService()
+    fraud_service = get_service("fraud")
     
     test_scheme = {
         'scheme_name': 'Instant Loan WhatsApp',
@@ -141,8 +140,7 @@ def test_services():
     
     # Test RAG Service
     print("3️⃣ Testing RAG Service...")
-    from services.rag_service import RAGService
-    rag_service = RAGService()
+    rag_service = get_service("rag")
     
     status = rag_service.get_service_status()
     print(f"   📊 RAG Status: {status['rag_status']}")
@@ -6,15 +6,24 @@ Handles PDF processing, embedding, and retrieval
 from .pdf_loader import PDFLoader
 from .chunker import TextChunker
 from .embedder import Embedder
+from .query_batcher import QueryBatcher
+from .chunk_store import ChunkStore
 from .vector_store import VectorStore
-from .retriever import Retriever
+from .manifest import IndexManifest
+from .lexical_index import LexicalIndex
+from .retriever import Retriever, RetrievalResult
 from .rag_pipeline import RAGPipeline
 
 __all__ = [
     'PDFLoader',
     'TextChunker',
     'Embedder',
+    'QueryBatcher',
+    'ChunkStore',
     'VectorStore',
+    'IndexManifest',
+    'LexicalIndex',
     'Retriever',
+    'RetrievalResult',
     'RAGPipeline'
 ]
\ No newline at end of file
@@ -0,0 +1,312 @@
+"""
+Chunk Store - Columnar, memory-mapped chunk text + metadata
+Only the chunks returned by a search are decoded, so RAM stays flat as the corpus grows
+"""
+
+import bisect
+import json
+import mmap
+import os
+import struct
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+from loguru import logger
+
+
+MAGIC = b"GSCHUNK1"
+ALIGNMENT = 8
+
+# Integer metadata columns stored alongside the text column
+INT_COLUMNS = ("chunk_id", "start_char", "end_char")
+
+
+class ChunkStore:
+    """
+    Sequence of chunk dicts backed by a single columnar file.
+
+    File layout:
+        MAGIC | uint32 header length | JSON header | aligned column blobs
+
+    The text column is one UTF-8 blob plus an int64 offsets table, sources are
+    dictionary-encoded and the remaining metadata are fixed-width int columns.
+    Opened stores are read through mmap; chunks added later are kept in memory
+    until the next save().
+
+    Every row carries a stable int64 "id" (the FAISS label of its vector).
+    IDs only grow, so rows stay sorted by id and get() is a binary search.
+    Stores written before ids existed use the row position as id.
+    """
+
+    FILENAME = "chunks.col"
+
+    def __init__(self, chunks: Optional[List[Dict]] = None):
+        # Legacy chunks (pickled before ids existed) get their position as id
+        self._pending: List[Dict] = [
+            c if "id" in c else {**c, "id": i} for i, c in enumerate(chunks or [])
+        ]
+        self._pending_ids: List[int] = [int(c["id"]) for c in self._pending]
+
+        # Mapped columns (set by open())
+        self._file = None
+        self._mm = None
+        self._count = 0
+        self._offsets = None
+        self._text_start = 0
+        self._source_codes = None
+        self._ids = None
+        self._sources: List[str] = []
+        self._int_columns: Dict[str, np.ndarray] = {}
+
+    # ------------------------------------------------------------------
+    # 🔹 OPEN (MMAP)
+    # ------------------------------------------------------------------
+    @classmethod
+    def open(cls, filepath: str) -> "ChunkStore":
+        store = cls()
+        store._attach(filepath)
+        return store
+
+    def _attach(self, filepath: str):
+        self._file = open(filepath, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mm[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"Not a chunk store file: {filepath}")
+
+        (header_len,) = struct.unpack_from("<I", self._mm, len(MAGIC))
+        header_start = len(MAGIC) + 4
+        header = json.loads(self._mm[header_start:header_start + header_len].decode("utf-8"))
+
+        self._count = header["count"]
+        self._sources = header["sources"]
+
+        columns = header["columns"]
+        self._offsets = self._column(columns["offsets"])
+        self._source_codes = self._column(columns["source"])
+        self._int_columns = {
+            name: self._column(columns[name])
+            for name in INT_COLUMNS
+            if name in columns
+        }
+        self._text_start = columns["text"]["offset"]
+
+        if "id" in columns:
+            self._ids = self._column(columns["id"])
+        else:
+            self._ids = np.arange(self._count, dtype="<i8")
+
+    def _column(self, spec: Dict) -> np.ndarray:
+        return np.frombuffer(
+            self._mm,
+            dtype=np.dtype(spec["dtype"]),
+            count=spec["length"],
+            offset=spec["offset"]
+        )
+
+    def close(self):
+        """Release the mapping (needed before the file can be replaced on Windows)"""
+        if self._mm is not None:
+            self._offsets = None
+            self._source_codes = None
+            self._ids = None
+            self._int_columns = {}
+            self._mm.close()
+            self._file.close()
+            self._mm = None
+            self._file = None
+            self._count = 0
+
+    # ------------------------------------------------------------------
+    # 🔹 SEQUENCE INTERFACE
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return self._count + len(self._pending)
+
+    def __getitem__(self, idx: int) -> Dict:
+        if idx < 0:
+            idx += len(self)
+        if idx < 0 or idx >= len(self):
+            raise IndexError("chunk index out of range")
+
+        if idx >= self._count:
+            return self._pending[idx - self._count]
+
+        return self._read_row(idx)
+
+    def __iter__(self) -> Iterator[Dict]:
+        for idx in range(len(self)):
+            yield self[idx]
+
+    def _read_row(self, idx: int) -> Dict:
+        start = self._text_start + int(self._offsets[idx])
+        end = self._text_start + int(self._offsets[idx + 1])
+
+        row = {
+            "id": int(self._ids[idx]),
+            "text": self._mm[start:end].decode("utf-8"),
+            "source": self._sources[int(self._source_codes[idx])],
+        }
+        for name, column in self._int_columns.items():
+            row[name] = int(column[idx])
+
+        return row
+
+    def _row_text_bytes(self, idx: int) -> bytes:
+        if idx >= self._count:
+            return self._pending[idx - self._count].get("text", "").encode("utf-8")
+
+        start = self._text_start + int(self._offsets[idx])
+        end = self._text_start + int(self._offsets[idx + 1])
+        return self._mm[start:end]
+
+    def extend(self, chunks: List[Dict]):
+        """
+        Append chunks; each must carry an "id" larger than any stored one
+        """
+        start = len(self)
+        for offset, chunk in enumerate(chunks):
+            chunk_id = int(chunk.get("id", start + offset))
+            if len(self) and chunk_id <= self._last_id():
+                raise ValueError(f"Chunk ids must increase (got {chunk_id} after {self._last_id()})")
+            self._pending.append(chunk if "id" in chunk else {**chunk, "id": chunk_id})
+            self._pending_ids.append(chunk_id)
+
+    def _last_id(self) -> int:
+        if self._pending_ids:
+            return self._pending_ids[-1]
+        return int(self._ids[-1])
+
+    # ------------------------------------------------------------------
+    # 🔹 ID LOOKUP / REMOVAL
+    # ------------------------------------------------------------------
+    def get(self, chunk_id: int) -> Optional[Dict]:
+        """
+        Chunk with the given id, or None if it does not exist
+        """
+        if self._count:
+            row = int(np.searchsorted(self._ids, chunk_id))
+            if row < self._count and int(self._ids[row]) == chunk_id:
+                return self._read_row(row)
+
+        pos = bisect.bisect_left(self._pending_ids, chunk_id)
+        if pos < len(self._pending_ids) and self._pending_ids[pos] == chunk_id:
+            return self._pending[pos]
+
+        return None
+
+    def remove_range(self, start_id: int, end_id: int) -> int:
+        """
+        Drop chunks with start_id <= id < end_id; returns how many were removed
+        """
+        if self._count:
+            lo, hi = np.searchsorted(self._ids, [start_id, end_id])
+            if hi > lo:
+                # Mapped rows are read-only: materialize, then filter below
+                rows = [self._read_row(i) for i in range(self._count)]
+                self._pending = rows + self._pending
+                self._pending_ids = [r["id"] for r in rows] + self._pending_ids
+                self.close()
+
+        lo = bisect.bisect_left(self._pending_ids, start_id)
+        hi = bisect.bisect_left(self._pending_ids, end_id)
+        del self._pending[lo:hi]
+        del self._pending_ids[lo:hi]
+
+        return hi - lo
+
+    # ------------------------------------------------------------------
+    # 🔹 SAVE
+    # ------------------------------------------------------------------
+    def save(self, filepath: str):
+        """
+        Write all chunks (mapped + pending) to a new columnar file
+        """
+        n = len(self)
+
+        texts = [self._row_text_bytes(i) for i in range(n)]
+        offsets = np.zeros(n + 1, dtype="<i8")
+        if n:
+            offsets[1:] = np.cumsum([len(t) for t in texts])
+
+        source_index: Dict[str, int] = {}
+        source_codes = np.zeros(n, dtype="<i4")
+        ids = np.zeros(n, dtype="<i8")
+        int_columns = {name: np.full(n, -1, dtype="<i8") for name in INT_COLUMNS}
+
+        for i in range(n):
+            if i < self._count:
+                ids[i] = self._ids[i]
+                source = self._sources[int(self._source_codes[i])]
+                for name in INT_COLUMNS:
+                    if name in self._int_columns:
+                        int_columns[name][i] = self._int_columns[name][i]
+            else:
+                chunk = self._pending[i - self._count]
+                ids[i] = self._pending_ids[i - self._count]
+                source = chunk.get("source", "unknown")
+                for name in INT_COLUMNS:
+                    if chunk.get(name) is not None:
+                        int_columns[name][i] = int(chunk[name])
+
+            source_codes[i] = source_index.setdefault(source, len(source_index))
+
+        arrays = {"offsets": offsets, "id": ids, "source": source_codes, **int_columns}
+        text_nbytes = int(offsets[-1])
+
+        # Lay out the columns after the header (header size depends on the offsets,
+        # so iterate until the layout is stable)
+        header_len = 0
+        while True:
+            position = _align(len(MAGIC) + 4 + header_len)
+            columns = {}
+            for name, array in arrays.items():
+                columns[name] = {
+                    "dtype": array.dtype.str,
+                    "length": int(array.shape[0]),
+                    "offset": position
+                }
+                position = _align(position + array.nbytes)
+            columns["text"] = {"offset": position, "nbytes": text_nbytes}
+
+            header = json.dumps({
+                "count": n,
+                "sources": list(source_index),
+                "columns": columns
+            }, ensure_ascii=False).encode("utf-8")
+
+            if len(header) == header_len:
+                break
+            header_len = len(header)
+
+        tmp_path = f"{filepath}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC)
+            f.write(struct.pack("<I", len(header)))
+            f.write(header)
+            for name, array in arrays.items():
+                _pad_to(f, columns[name]["offset"])
+                f.write(array.tobytes())
+            _pad_to(f, columns["text"]["offset"])
+            for text in texts:
+                f.write(text)
+
+        del texts
+
+        # Swap the in-memory state over to the new file
+        self.close()
+        os.replace(tmp_path, filepath)
+        self._pending = []
+        self._pending_ids = []
+        self._attach(filepath)
+
+        logger.info(f"💾 Saved {n} chunks ({text_nbytes / 1024:.1f} KB text) to {filepath}")
+
+
+def _align(position: int) -> int:
+    return (position + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def _pad_to(f, position: int):
+    f.write(b"\0" * (position - f.tell()))
@@ -3,15 +3,26 @@ Embedder - Converts text chunks to vector embeddings
 Uses multilingual sentence-transformers (FREE, offline)
 """
 
-from typing import List
+from typing import Dict, List
+import asyncio
+import hashlib
 import numpy as np
-from sentence_transformers import SentenceTransformer
 from loguru import logger
 import os
 
+from utils.cache import LRUCache, DiskCache
+from utils.executors import run_io, run_model
+from utils.language_utils import normalize_query_text
+
+from .query_batcher import QueryBatcher
+
+
+# EMBEDDING_BACKEND: PyTorch SentenceTransformer, or the same model in ONNX Runtime (fp32 / int8)
+BACKENDS = ("torch", "onnx", "onnx-int8")
+
 
 class Embedder:
-    def __init__(self, model_name: str = None):
+    def __init__(self, model_name: str = None, backend: str = None):
         """
         Initialize multilingual embedding model
         Supports Hindi, English, and 50+ languages
@@ -28,10 +39,117 @@ class Embedder:
         cache_dir = "models/embeddings/sentence_transformer"
         os.makedirs(cache_dir, exist_ok=True)
         
-        self.model = SentenceTransformer(model_name, cache_folder=cache_dir)
+        backend = (backend or os.getenv('EMBEDDING_BACKEND', 'torch')).lower()
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown embedding backend: {backend} (use one of {BACKENDS})")
+        
+        self.model_name = model_name
+        self.backend = backend
+        self.backend_agreement = None
+        
+        if backend != "torch":
+            try:
+                from .onnx_backend import OnnxEncoder
+                
+                export_dir = os.path.join("models/embeddings/onnx", model_name.replace("/", "_"))
+                self.model = OnnxEncoder(
+                    model_name,
+                    export_dir,
+                    quantize=(backend == "onnx-int8"),
+                    cache_folder=cache_dir
+                )
+                self.backend_agreement = self.model.agreement
+            except Exception as e:
+                logger.warning(f"⚠️ ONNX backend unavailable ({e}), falling back to PyTorch")
+                self.backend = "torch"
+        
+        if self.backend == "torch":
+            # torch + transformers take seconds to import - only pay for it here
+            from sentence_transformers import SentenceTransformer
+            self.model = SentenceTransformer(model_name, cache_folder=cache_dir)
+        
+        # int8/ONNX vectors differ slightly from PyTorch ones - keep their cache entries apart
+        self.cache_namespace = model_name if self.backend == "torch" else f"{model_name}#{self.backend}"
         self.dimension = self.model.get_sentence_embedding_dimension()
         
-        logger.info(f"✅ Model loaded - Dimension: {self.dimension}")
+        logger.info(f"✅ Model loaded ({self.backend}) - Dimension: {self.dimension}")
+        
+        self.query_cache = self._create_query_cache()
+        self.chunk_cache = self._create_chunk_cache()
+        self.chunk_cache_hits = 0
+        self.chunk_cache_misses = 0
+        self.query_batcher = self._create_query_batcher()
+    
+    def _create_query_batcher(self):
+        """
+        Micro-batches concurrent aembed_query() encodes into one model call
+        QUERY_BATCH_MAX_SIZE (default 16) / QUERY_BATCH_MAX_WAIT_MS (default 5);
+        a size of 1 or a wait of 0 disables batching. Fed straight from the
+        event loop, so a batch can hold every request in flight rather than
+        one per model pool thread.
+        """
+        max_batch = int(os.getenv('QUERY_BATCH_MAX_SIZE', 16))
+        max_wait_ms = float(os.getenv('QUERY_BATCH_MAX_WAIT_MS', 5))
+        if max_batch <= 1 or max_wait_ms <= 0:
+            return None
+        
+        return QueryBatcher(
+            lambda texts: self.model.encode(
+                texts,
+                batch_size=max_batch,
+                show_progress_bar=False,
+                convert_to_numpy=True
+            ),
+            max_batch=max_batch,
+            max_wait_ms=max_wait_ms
+        )
+    
+    def _create_query_cache(self) -> LRUCache:
+        """
+        LRU of query embeddings keyed on normalized text
+        QUERY_EMBED_CACHE_SIZE=0 disables it; QUERY_EMBED_CACHE_PATH adds a SQLite tier
+        """
+        cache_size = int(os.getenv('QUERY_EMBED_CACHE_SIZE', 1024))
+        cache_path = os.getenv('QUERY_EMBED_CACHE_PATH', '')
+        
+        disk = None
+        if cache_size > 0 and cache_path:
+            try:
+                disk = DiskCache(cache_path, table="query_embeddings")
+            except Exception as e:
+                logger.warning(f"⚠️ Query embedding disk cache unavailable: {e}")
+        
+        return LRUCache(
+            maxsize=cache_size,
+            disk=disk,
+            encode=lambda v: v.astype("float32").tobytes(),
+            decode=self._decode_embedding
+        )
+    
+    def _create_chunk_cache(self):
+        """
+        Persistent (model, sha256(text)) -> embedding store for index builds
+        CHUNK_EMBED_CACHE_PATH="" disables it
+        """
+        cache_path = os.getenv('CHUNK_EMBED_CACHE_PATH', 'data/cache/chunk_embeddings.sqlite')
+        if not cache_path:
+            return None
+        
+        try:
+            return DiskCache(cache_path, table="chunk_embeddings")
+        except Exception as e:
+            logger.warning(f"⚠️ Chunk embedding cache unavailable: {e}")
+            return None
+    
+    @staticmethod
+    def _decode_embedding(raw: bytes) -> np.ndarray:
+        embedding = np.frombuffer(raw, dtype="float32").copy()
+        embedding.flags.writeable = False
+        return embedding
+    
+    def _query_cache_key(self, query: str) -> str:
+        # Model name is part of the key so a persisted cache never serves stale vectors
+        return f"{self.cache_namespace}|{normalize_query_text(query)}"
     
     def embed_text(self, text: str) -> np.ndarray:
         """
@@ -44,9 +162,60 @@ class Embedder:
         """
         Generate embeddings for multiple chunks efficiently
         
+        Identical texts are encoded once, and texts embedded by an earlier
+        build (same model) come from the persistent chunk cache.
+        
         Returns:
             numpy array of shape (n_chunks, embedding_dim)
         """
+        if self.chunk_cache is None:
+            return self._encode_chunks(chunks, batch_size)
+        
+        keys = [
+            f"{self.cache_namespace}|{hashlib.sha256(text.encode('utf-8')).hexdigest()}"
+            for text in chunks
+        ]
+        cached = self.chunk_cache.get_many(list(set(keys)))
+        
+        embeddings = np.empty((len(chunks), self.dimension), dtype="float32")
+        
+        # key -> (text, rows waiting for it)
+        missing: Dict[str, tuple] = {}
+        for i, (key, text) in enumerate(zip(keys, chunks)):
+            if key in cached:
+                embeddings[i] = np.frombuffer(cached[key], dtype="float32")
+            elif key in missing:
+                missing[key][1].append(i)
+            else:
+                missing[key] = (text, [i])
+        
+        n_hits = len(chunks) - sum(len(rows) for _, rows in missing.values())
+        self.chunk_cache_hits += n_hits
+        self.chunk_cache_misses += len(chunks) - n_hits
+        logger.info(
+            f"🗃️ Chunk embedding cache: {n_hits}/{len(chunks)} hits, "
+            f"{len(missing)} unique texts to encode"
+        )
+        
+        if missing:
+            encoded = self._encode_chunks(
+                [text for text, _ in missing.values()],
+                batch_size
+            ).astype("float32")
+            
+            for (_, rows), embedding in zip(missing.values(), encoded):
+                embeddings[rows] = embedding
+            
+            try:
+                self.chunk_cache.put_many(
+                    (key, embedding.tobytes()) for key, embedding in zip(missing, encoded)
+                )
+            except Exception as e:
+                logger.warning(f"⚠️ Chunk embedding cache write failed: {e}")
+        
+        return embeddings
+    
+    def _encode_chunks(self, chunks: List[str], batch_size: int) -> np.ndarray:
         logger.info(f"🔄 Embedding {len(chunks)} chunks...")
         
         embeddings = self.model.encode(
@@ -61,9 +230,126 @@ class Embedder:
     
     def embed_query(self, query: str) -> np.ndarray:
         """
-        Embed user query (same as embed_text, but explicit for clarity)
+        Embed user query, served from the query cache when the same
+        (normalized) question was asked before
+        
+        Cached arrays are shared and read-only.
+        """
+        if self.query_cache.maxsize <= 0:
+            return self.embed_text(query)
+        
+        key = self._query_cache_key(query)
+        embedding = self.query_cache.get(key)
+        if embedding is None:
+            # Encoded directly: a model pool thread waiting on the batcher would
+            # only add its wait, with at most MODEL_POOL_SIZE queries to share
+            embedding = self.embed_text(query).astype("float32")
+            embedding.flags.writeable = False
+            self.query_cache.put(key, embedding)
+        
+        return embedding
+    
+    async def aembed_query(self, query: str) -> np.ndarray:
+        """
+        embed_query() for the event loop: a cache miss is submitted to the
+        micro-batcher and awaited, so concurrent requests share a model call
+        """
+        if self.query_cache.maxsize <= 0:
+            return await self._aencode_query(query)
+        
+        key = self._query_cache_key(query)
+        embedding = await self._query_cache_io(self.query_cache.get, key)
+        if embedding is None:
+            embedding = (await self._aencode_query(query)).astype("float32")
+            embedding.flags.writeable = False
+            await self._query_cache_io(self.query_cache.put, key, embedding)
+        
+        return embedding
+    
+    async def _aencode_query(self, query: str) -> np.ndarray:
+        if self.query_batcher is None:
+            return await run_model(self.embed_text, query)
+        return await asyncio.wrap_future(self.query_batcher.submit(query))
+    
+    async def _query_cache_io(self, fn, *args):
+        # The in-memory LRU is cheap; only a SQLite tier needs the io pool
+        if self.query_cache.disk is None:
+            return fn(*args)
+        return await run_io(fn, *args)
+    
+    def embed_queries(self, queries: List[str], batch_size: int = 32) -> np.ndarray:
+        """
+        Embed many user queries; cache misses go through a single model.encode call
+        
+        Returns:
+            numpy array of shape (n_queries, embedding_dim)
         """
-        return self.embed_text(query)
+        if self.query_cache.maxsize <= 0:
+            return self.model.encode(
+                queries,
+                batch_size=batch_size,
+                show_progress_bar=False,
+                convert_to_numpy=True
+            )
+        
+        embeddings = np.empty((len(queries), self.dimension), dtype="float32")
+        
+        # key -> (query text to encode, rows waiting for it)
+        missing: Dict[str, tuple] = {}
+        for i, query in enumerate(queries):
+            key = self._query_cache_key(query)
+            if key in missing:
+                missing[key][1].append(i)
+                continue
+            
+            cached = self.query_cache.get(key)
+            if cached is not None:
+                embeddings[i] = cached
+            else:
+                missing[key] = (query, [i])
+        
+        if missing:
+            encoded = self.model.encode(
+                [query for query, _ in missing.values()],
+                batch_size=batch_size,
+                show_progress_bar=False,
+                convert_to_numpy=True
+            ).astype("float32")
+            
+            for (key, (_, rows)), embedding in zip(missing.items(), encoded):
+                embeddings[rows] = embedding
+                embedding = embedding.copy()
+                embedding.flags.writeable = False
+                self.query_cache.put(key, embedding)
+        
+        return embeddings
+    
+    def cache_stats(self) -> Dict[str, any]:
+        """Query embedding cache hit/miss counters"""
+        return self.query_cache.stats()
+    
+    def batcher_stats(self) -> Dict[str, any]:
+        """Query micro-batching counters (avg_batch_size > 1 means batching pays off)"""
+        if self.query_batcher is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.query_batcher.stats()}
+    
+    def backend_info(self) -> Dict[str, any]:
+        """Active backend and its cosine agreement with PyTorch (None for torch itself)"""
+        return {
+            "backend": self.backend,
+            "agreement": self.backend_agreement
+        }
+    
+    def chunk_cache_stats(self) -> Dict[str, any]:
+        """Chunk embedding cache counters (hits = chunks not sent to the model)"""
+        lookups = self.chunk_cache_hits + self.chunk_cache_misses
+        return {
+            "enabled": self.chunk_cache is not None,
+            "hits": self.chunk_cache_hits,
+            "misses": self.chunk_cache_misses,
+            "hit_ratio": round(self.chunk_cache_hits / lookups, 3) if lookups else 0.0
+        }
 
 
 # Test function
@@ -0,0 +1,204 @@
+"""
+Lexical Index - SQLite FTS5 keyword index over chunk texts
+Answers exact scheme-name queries ("PMEGP", "किसान क्रेडिट कार्ड") without the embedder
+"""
+
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Tuple
+
+from loguru import logger
+
+from utils.language_utils import normalize_query_text
+
+
+# Words that carry no keyword signal in Hindi / Hinglish / English questions
+STOPWORDS = {
+    'क्या', 'है', 'हैं', 'के', 'की', 'का', 'में', 'से', 'को', 'और', 'या', 'लिए',
+    'कैसे', 'कब', 'कौन', 'कितना', 'कितनी', 'मुझे', 'बताओ', 'बताइए', 'पर', 'एक',
+    'kya', 'hai', 'kaise', 'ke', 'ki', 'ka', 'me', 'mein', 'se', 'ko', 'aur', 'liye',
+    'what', 'is', 'are', 'the', 'a', 'an', 'of', 'for', 'how', 'to', 'about', 'in',
+    'on', 'and', 'or', 'do', 'i', 'tell', 'can', 'get'
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Script-agnostic tokens: danda/punctuation dropped, case folded, Devanagari
+    digits → ASCII; Devanagari words keep their matras (split on whitespace only)
+    """
+    return normalize_query_text(text).split()
+
+
+def content_terms(text: str) -> List[str]:
+    return [t for t in tokenize(text) if t not in STOPWORDS]
+
+
+class LexicalIndex:
+    """
+    FTS5 table keyed by chunk id (rowid = FAISS label), stored next to faiss.index.
+
+    Texts are pre-tokenized in Python and indexed with FTS5's `ascii`
+    tokenizer, which treats every non-ASCII code point as part of a token -
+    so Devanagari vowel signs never split a word (unicode61 would).
+    """
+
+    FILENAME = "lexical.sqlite"
+
+    def __init__(self, index_path: str = "data/processed/faiss_index"):
+        self.path = os.path.join(index_path, self.FILENAME)
+        os.makedirs(index_path, exist_ok=True)
+
+        # Keyword fast path: short queries whose phrase is rare in the corpus
+        self.max_terms = int(os.getenv("LEXICAL_MAX_TERMS", 4))
+        self.max_df_ratio = float(os.getenv("LEXICAL_MAX_DF_RATIO", 0.05))
+
+        self._lock = threading.Lock()
+        self._connection = None
+        self._pid = None
+        self._conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS chunks_fts USING fts5(tokens, tokenize='ascii')"
+        )
+        self._conn.commit()
+        self._count = self._conn.execute("SELECT COUNT(*) FROM chunks_fts").fetchone()[0]
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        # Reopened in forked workers (gunicorn --preload) - never share a connection across fork
+        if self._pid != os.getpid():
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._pid = os.getpid()
+        return self._connection
+
+    # ------------------------------------------------------------------
+    # 🔹 BUILD
+    # ------------------------------------------------------------------
+    def reset(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM chunks_fts")
+            self._count = 0
+
+    def add(self, chunks: Iterable[Dict]):
+        """
+        Index chunks (each with its "id")
+        """
+        rows = [(int(c["id"]), " ".join(tokenize(c["text"]))) for c in chunks]
+        with self._lock:
+            self._conn.executemany("INSERT INTO chunks_fts (rowid, tokens) VALUES (?, ?)", rows)
+            self._count += len(rows)
+
+    def remove_range(self, start_id: int, end_id: int):
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM chunks_fts WHERE rowid >= ? AND rowid < ?", (start_id, end_id)
+            )
+            self._count -= max(cursor.rowcount, 0)
+
+    def commit(self):
+        with self._lock:
+            self._conn.commit()
+
+    def close(self):
+        """Close the connection - uncommitted changes are rolled back"""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+                self._pid = None
+
+    def sync(self, chunks) -> bool:
+        """
+        Rebuild from the chunk store if it does not match (e.g. index built
+        before the lexical index existed). Returns True if it rebuilt.
+        """
+        if len(self) == len(chunks):
+            return False
+
+        logger.info(f"🔤 Rebuilding lexical index from {len(chunks)} chunks...")
+        self.reset()
+        batch = []
+        for chunk in chunks:
+            batch.append(chunk)
+            if len(batch) >= 1000:
+                self.add(batch)
+                batch = []
+        self.add(batch)
+        self.commit()
+        return True
+
+    def __len__(self) -> int:
+        return self._count
+
+    # ------------------------------------------------------------------
+    # 🔹 SEARCH
+    # ------------------------------------------------------------------
+    def search(self, query: str, k: int = 3) -> List[Tuple[int, float]]:
+        """
+        Best-matching chunks for any of the query's content terms (BM25)
+
+        Returns:
+            [(chunk_id, score)] with score in (0, 1), best first
+        """
+        terms = content_terms(query)
+        if not terms:
+            return []
+        return self._match(" OR ".join(_quote(t) for t in terms), k)
+
+    def keyword_search(self, query: str, k: int = 3) -> List[Tuple[int, float]]:
+        """
+        High-precision path: the whole (short) query must occur as a phrase
+        and be rare in the corpus. Returns [] when the query is not a keyword
+        query, so the caller falls back to vector search.
+        """
+        terms = content_terms(query)
+        if not terms or len(terms) > self.max_terms:
+            return []
+
+        phrase = _quote(" ".join(terms))
+        max_df = max(k, int(len(self) * self.max_df_ratio))
+
+        with self._lock:
+            df = self._conn.execute(
+                "SELECT COUNT(*) FROM (SELECT rowid FROM chunks_fts WHERE chunks_fts MATCH ? LIMIT ?)",
+                (phrase, max_df + 1)
+            ).fetchone()[0]
+
+        if df == 0 or df > max_df:
+            return []
+
+        return self._match(phrase, k)
+
+    def _match(self, expression: str, k: int) -> List[Tuple[int, float]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT rowid, bm25(chunks_fts) FROM chunks_fts WHERE chunks_fts MATCH ? "
+                "ORDER BY bm25(chunks_fts) LIMIT ?",
+                (expression, k)
+            ).fetchall()
+
+        # FTS5 bm25 is negative (lower = better); squash to (0, 1) for ranking only -
+        # it is not calibrated against the vector similarity
+        return [(int(rowid), -rank / (1 - rank)) for rowid, rank in rows]
+
+
+def _quote(text: str) -> str:
+    return '"' + text.replace('"', '""') + '"'
+
+
+def reciprocal_rank_fusion(result_lists: List[List[Dict]], top_k: int, k: int = 60) -> List[Dict]:
+    """
+    Merge ranked result lists (dicts with an "id") by reciprocal rank fusion
+
+    The first list's dict (and score) is kept for chunks found by several retrievers.
+    """
+    fused: Dict[int, float] = {}
+    best: Dict[int, Dict] = {}
+
+    for results in result_lists:
+        for rank, result in enumerate(results):
+            fused[result["id"]] = fused.get(result["id"], 0.0) + 1.0 / (k + rank + 1)
+            best.setdefault(result["id"], result)
+
+    ranked = sorted(fused, key=fused.get, reverse=True)[:top_k]
+    return [best[chunk_id] for chunk_id in ranked]
@@ -0,0 +1,154 @@
+"""
+Index Manifest - What went into the FAISS index, per source PDF
+Lets a rebuild re-embed only new/changed PDFs and drop the vectors of deleted ones
+"""
+
+import os
+import json
+import uuid
+import hashlib
+from datetime import datetime
+from typing import Dict, List, Optional
+from loguru import logger
+
+
+class IndexManifest:
+    """
+    manifest.json next to faiss.index:
+
+        {
+          "build_id": "...", "updated_at": "...",
+          "settings": {"embedding_model": ..., "chunk_size": ..., ...},
+          "files": {
+            "Budget.pdf": {"sha256": "...", "size": 123, "mtime": 1700000000.0,
+                           "id_start": 0, "id_end": 42, "chunks": 42}
+          }
+        }
+
+    Each file owns the contiguous chunk id range [id_start, id_end).
+    """
+
+    FILENAME = "manifest.json"
+
+    def __init__(self, index_path: str, settings: Optional[Dict] = None):
+        self.index_path = index_path
+        self.settings: Dict = settings or {}
+        self.files: Dict[str, Dict] = {}
+        self.build_id = None
+        self.updated_at = None
+        # diff() refreshed size/mtime of touched-but-identical files
+        self.stats_refreshed = False
+
+    @property
+    def filepath(self) -> str:
+        return os.path.join(self.index_path, self.FILENAME)
+
+    # ------------------------------------------------------------------
+    # 🔹 LOAD / SAVE
+    # ------------------------------------------------------------------
+    @classmethod
+    def load(cls, index_path: str) -> Optional["IndexManifest"]:
+        manifest = cls(index_path)
+        if not os.path.exists(manifest.filepath):
+            return None
+
+        try:
+            with open(manifest.filepath, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Ignoring unreadable manifest: {e}")
+            return None
+
+        manifest.settings = data.get("settings", {})
+        manifest.files = data.get("files", {})
+        manifest.build_id = data.get("build_id")
+        manifest.updated_at = data.get("updated_at")
+        return manifest
+
+    def save(self, new_build: bool = True):
+        """new_build=False keeps the build id (only file stats changed)"""
+        if new_build or self.build_id is None:
+            self.build_id = uuid.uuid4().hex[:12]
+        self.stats_refreshed = False
+        self.updated_at = datetime.now().isoformat(timespec="seconds")
+
+        tmp_path = f"{self.filepath}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "build_id": self.build_id,
+                "updated_at": self.updated_at,
+                "settings": self.settings,
+                "files": self.files
+            }, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.filepath)
+
+        logger.info(f"🧾 Manifest saved: {len(self.files)} files (build {self.build_id})")
+
+    # ------------------------------------------------------------------
+    # 🔹 FILE ENTRIES
+    # ------------------------------------------------------------------
+    def record(self, filename: str, filepath: str, id_start: int, id_end: int, sha256: str = None):
+        stat = os.stat(filepath)
+        self.files[filename] = {
+            "sha256": sha256 or file_sha256(filepath),
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "id_start": id_start,
+            "id_end": id_end,
+            "chunks": id_end - id_start
+        }
+
+    def remove(self, filename: str) -> Optional[Dict]:
+        return self.files.pop(filename, None)
+
+    def compatible_with(self, settings: Dict) -> bool:
+        """Same embedding model / chunking / index layout as the current config"""
+        return self.settings == settings
+
+    def diff(self, pdf_directory: str) -> Dict[str, List[str]]:
+        """
+        Compare the manifest against the PDFs on disk
+
+        Size + mtime unchanged → assumed unchanged; otherwise the content hash decides.
+
+        Returns:
+            {"added": [...], "changed": [...], "removed": [...], "unchanged": [...]}
+        """
+        on_disk = {}
+        if os.path.exists(pdf_directory):
+            on_disk = {
+                f: os.path.join(pdf_directory, f)
+                for f in sorted(os.listdir(pdf_directory))
+                if f.endswith('.pdf')
+            }
+
+        plan = {"added": [], "changed": [], "removed": [], "unchanged": []}
+
+        for filename, filepath in on_disk.items():
+            entry = self.files.get(filename)
+            if entry is None:
+                plan["added"].append(filename)
+                continue
+
+            stat = os.stat(filepath)
+            if stat.st_size == entry.get("size") and stat.st_mtime == entry.get("mtime"):
+                plan["unchanged"].append(filename)
+            elif file_sha256(filepath) == entry.get("sha256"):
+                # Touched but identical - refresh the stat fields only
+                entry["size"] = stat.st_size
+                entry["mtime"] = stat.st_mtime
+                self.stats_refreshed = True
+                plan["unchanged"].append(filename)
+            else:
+                plan["changed"].append(filename)
+
+        plan["removed"] = [f for f in self.files if f not in on_disk]
+        return plan
+
+
+def file_sha256(filepath: str, block_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
@@ -0,0 +1,281 @@
+"""
+ONNX Backend - ONNX Runtime (fp32 or dynamic int8) encoder for the Embedder
+Drop-in for SentenceTransformer.encode on CPU; exported once from the PyTorch model
+"""
+
+import inspect
+import json
+import os
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+from loguru import logger
+
+
+ONNX_FILENAME = "model.onnx"
+INT8_FILENAME = "model_int8.onnx"
+CONFIG_FILENAME = "onnx_config.json"
+REFERENCE_FILENAME = "reference_embeddings.npy"
+
+# Fixed sample used to measure agreement with the PyTorch backend
+AGREEMENT_SAMPLES = [
+    "प्रधानमंत्री मुद्रा योजना क्या है?",
+    "मुद्रा लोन के लिए कौन से दस्तावेज चाहिए?",
+    "किसान क्रेडिट कार्ड पर ब्याज दर कितनी है?",
+    "KCC kaise milega",
+    "What is the eligibility for Kisan Credit Card?",
+    "How do I apply for a loan under Stand-Up India?",
+    "ऋण की ब्याज दर क्या है?",
+    "Is there any subsidy for dairy farming?",
+    "बैंक खाता खोलने के लिए क्या चाहिए?",
+    "What documents are required for a Mudra loan?",
+    "फसल बीमा योजना में प्रीमियम कितना है?",
+    "Can a self help group get a loan without collateral?",
+]
+
+
+class OnnxEncoder:
+    """
+    Runs the exported transformer in ONNX Runtime and applies the same
+    pooling/normalization as the SentenceTransformer it was exported from.
+
+    export_dir holds model.onnx (+ model_int8.onnx), the tokenizer and
+    onnx_config.json (pooling, max length, dimension, agreement per variant).
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        export_dir: str,
+        quantize: bool = False,
+        cache_folder: Optional[str] = None,
+        threads: Optional[int] = None
+    ):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        self.export_dir = export_dir
+        self.variant = "int8" if quantize else "fp32"
+
+        if not os.path.exists(os.path.join(export_dir, ONNX_FILENAME)):
+            export_onnx(model_name, export_dir, cache_folder=cache_folder)
+
+        model_file = os.path.join(export_dir, ONNX_FILENAME)
+        if quantize:
+            model_file = os.path.join(export_dir, INT8_FILENAME)
+            if not os.path.exists(model_file):
+                quantize_onnx(export_dir)
+
+        self.config = _read_config(export_dir)
+        self.pooling = self.config["pooling"]
+        self.normalize = self.config["normalize"]
+        self.max_seq_length = self.config["max_seq_length"]
+        self.dimension = self.config["dimension"]
+
+        self.tokenizer = AutoTokenizer.from_pretrained(export_dir)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(model_file, options, providers=["CPUExecutionProvider"])
+        self.input_names = [i.name for i in self.session.get_inputs()]
+
+        if self.variant not in self.config.get("agreement", {}):
+            self.config.setdefault("agreement", {})[self.variant] = self._measure_agreement()
+            _write_config(export_dir, self.config)
+
+        self.agreement = self.config["agreement"][self.variant]
+        logger.info(
+            f"✅ ONNX {self.variant} encoder ready - cosine vs PyTorch: "
+            f"mean {self.agreement['mean_cosine']:.4f}, min {self.agreement['min_cosine']:.4f}"
+        )
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dimension
+
+    def encode(
+        self,
+        sentences: Union[str, List[str]],
+        batch_size: int = 32,
+        show_progress_bar: bool = False,
+        convert_to_numpy: bool = True,
+        **kwargs
+    ) -> np.ndarray:
+        """
+        Same contract as SentenceTransformer.encode (numpy output only)
+        """
+        single = isinstance(sentences, str)
+        if single:
+            sentences = [sentences]
+
+        embeddings = np.empty((len(sentences), self.dimension), dtype="float32")
+
+        # Length-sorted batches pad less (as SentenceTransformer does)
+        order = np.argsort([-len(s) for s in sentences], kind="stable")
+        for start in range(0, len(sentences), batch_size):
+            rows = order[start:start + batch_size]
+            embeddings[rows] = self._encode_batch([sentences[i] for i in rows])
+
+        return embeddings[0] if single else embeddings
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        features = self.tokenizer(
+            texts,
+            padding=True,
+            truncation=True,
+            max_length=self.max_seq_length,
+            return_tensors="np"
+        )
+        inputs = {name: features[name].astype("int64") for name in self.input_names}
+        hidden = self.session.run(None, inputs)[0]
+
+        mask = features["attention_mask"][..., None].astype("float32")
+        if self.pooling == "cls":
+            pooled = hidden[:, 0]
+        elif self.pooling == "max":
+            pooled = np.where(mask > 0, hidden, -1e9).max(axis=1)
+        else:
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+
+        if self.normalize:
+            pooled = pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+
+        return pooled
+
+    def _measure_agreement(self) -> Dict[str, float]:
+        reference = np.load(os.path.join(self.export_dir, REFERENCE_FILENAME))
+        return cosine_agreement(reference, self.encode(AGREEMENT_SAMPLES))
+
+
+# ----------------------------------------------------------------------
+# 🔹 EXPORT / QUANTIZE (needs torch; run once per model)
+# ----------------------------------------------------------------------
+def export_onnx(model_name: str, export_dir: str, cache_folder: Optional[str] = None):
+    """
+    Export the SentenceTransformer's transformer to ONNX and record its pooling
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer, models
+
+    logger.info(f"📦 Exporting {model_name} to ONNX: {export_dir}")
+    os.makedirs(export_dir, exist_ok=True)
+
+    st_model = SentenceTransformer(model_name, cache_folder=cache_folder, device="cpu")
+    transformer = st_model[0]
+    pooling = next((m for m in st_model if isinstance(m, models.Pooling)), None)
+
+    unsupported = [
+        type(m).__name__ for m in list(st_model)[1:]
+        if not isinstance(m, (models.Pooling, models.Normalize))
+    ]
+    if pooling is None or unsupported:
+        raise ValueError(f"ONNX backend supports Transformer+Pooling(+Normalize) models only, got {unsupported}")
+
+    pooling_mode = _pooling_mode(pooling)
+    if pooling_mode not in ("mean", "cls", "max"):
+        raise ValueError(f"Unsupported pooling mode for ONNX backend: {pooling_mode}")
+
+    tokenizer = transformer.tokenizer
+    tokenizer.save_pretrained(export_dir)
+
+    dummy = tokenizer(["नमस्ते", "hello world"], padding=True, return_tensors="pt")
+    input_names = [n for n in ("input_ids", "attention_mask", "token_type_ids") if n in dummy]
+
+    class _HiddenStates(torch.nn.Module):
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, *args):
+            return self.model(**dict(zip(input_names, args)))[0]
+
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    # Newer torch defaults to the dynamo exporter; keep the TorchScript one and its dynamic_axes
+    export_kwargs = {}
+    if "dynamo" in inspect.signature(torch.onnx.export).parameters:
+        export_kwargs["dynamo"] = False
+
+    with torch.no_grad():
+        torch.onnx.export(
+            _HiddenStates(transformer.auto_model.eval()),
+            tuple(dummy[n] for n in input_names),
+            os.path.join(export_dir, ONNX_FILENAME),
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=14,
+            **export_kwargs
+        )
+
+    # Reference vectors let any later variant report its agreement without torch
+    np.save(
+        os.path.join(export_dir, REFERENCE_FILENAME),
+        st_model.encode(AGREEMENT_SAMPLES, convert_to_numpy=True)
+    )
+
+    _write_config(export_dir, {
+        "model_name": model_name,
+        "pooling": pooling_mode,
+        "normalize": any(isinstance(m, models.Normalize) for m in st_model),
+        "max_seq_length": st_model.max_seq_length,
+        "dimension": st_model.get_sentence_embedding_dimension(),
+        "agreement": {}
+    })
+
+    logger.info(f"✅ ONNX export done ({pooling_mode} pooling)")
+
+
+def quantize_onnx(export_dir: str):
+    """
+    Dynamic int8 quantization of the exported weights (activations stay fp32)
+    """
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    logger.info("📦 Quantizing ONNX model to int8...")
+    quantize_dynamic(
+        os.path.join(export_dir, ONNX_FILENAME),
+        os.path.join(export_dir, INT8_FILENAME),
+        weight_type=QuantType.QInt8
+    )
+
+
+def cosine_agreement(reference: np.ndarray, candidate: np.ndarray) -> Dict[str, float]:
+    """
+    Row-wise cosine similarity between two embedding matrices
+    """
+    reference = reference / np.linalg.norm(reference, axis=1, keepdims=True)
+    candidate = candidate / np.linalg.norm(candidate, axis=1, keepdims=True)
+    cosines = (reference * candidate).sum(axis=1)
+    return {
+        "mean_cosine": round(float(cosines.mean()), 6),
+        "min_cosine": round(float(cosines.min()), 6),
+        "samples": int(cosines.shape[0])
+    }
+
+
+def _pooling_mode(pooling) -> str:
+    """Pooling mode across sentence-transformers versions ("mean", "cls", ...)"""
+    config = pooling.get_config_dict()
+    if isinstance(config.get("pooling_mode"), str):
+        return config["pooling_mode"]
+
+    enabled = [key for key, value in config.items() if key.startswith("pooling_mode_") and value]
+    names = {
+        "pooling_mode_mean_tokens": "mean",
+        "pooling_mode_cls_token": "cls",
+        "pooling_mode_max_tokens": "max"
+    }
+    return "+".join(names.get(key, key) for key in enabled)
+
+
+def _read_config(export_dir: str) -> Dict:
+    with open(os.path.join(export_dir, CONFIG_FILENAME), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_config(export_dir: str, config: Dict):
+    with open(os.path.join(export_dir, CONFIG_FILENAME), "w", encoding="utf-8") as f:
+        json.dump(config, f, indent=2)
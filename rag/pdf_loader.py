@@ -4,16 +4,23 @@ Handles Hindi and English text
 """
 
 import os
-from typing import List, Dict
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Iterator, List, Optional
 from pypdf import PdfReader
 from loguru import logger
 import re
 
 
 class PDFLoader:
-    def __init__(self, pdf_directory: str = "data/pdfs"):
+    def __init__(self, pdf_directory: str = "data/pdfs", workers: Optional[int] = None):
         self.pdf_directory = pdf_directory
         
+        # Extraction processes (1 = extract in this process)
+        if workers is None:
+            workers = int(os.getenv("PDF_LOADER_WORKERS", min(4, os.cpu_count() or 1)))
+        self.workers = max(1, workers)
+        
     def load_single_pdf(self, filepath: str) -> Dict[str, str]:
         """
         Load a single PDF and extract text
@@ -23,15 +30,16 @@ class PDFLoader:
         """
         try:
             reader = PdfReader(filepath)
-            text = ""
+            parts = []
             
             for page_num, page in enumerate(reader.pages, 1):
                 page_text = page.extract_text()
                 if page_text:
-                    text += f"\n--- Page {page_num} ---\n{page_text}"
+                    parts.append(f"\n--- Page {page_num} ---\n{page_text}")
             
-            # Clean text
-            text = self._clean_text(text)
+            # Clean text (one join instead of quadratic += on large PDFs)
+            text = self._clean_text("".join(parts))
+            del parts
             
             filename = os.path.basename(filepath)
             logger.info(f"✅ Loaded {filename}: {len(text)} characters")
@@ -47,26 +55,80 @@ class PDFLoader:
             logger.error(f"❌ Error loading {filepath}: {e}")
             return None
     
-    def load_all_pdfs(self) -> List[Dict[str, str]]:
+    def list_pdfs(self) -> List[str]:
         """
-        Load all PDFs from the directory
+        Paths of all PDFs in the directory
         """
-        documents = []
-        
         if not os.path.exists(self.pdf_directory):
             logger.warning(f"📁 PDF directory not found: {self.pdf_directory}")
-            return documents
+            return []
         
-        pdf_files = [f for f in os.listdir(self.pdf_directory) if f.endswith('.pdf')]
+        return [
+            os.path.join(self.pdf_directory, f)
+            for f in sorted(os.listdir(self.pdf_directory))
+            if f.endswith('.pdf')
+        ]
+    
+    def iter_pdfs(self, filepaths: Optional[List[str]] = None) -> Iterator[Dict[str, str]]:
+        """
+        Extract PDFs across a process pool and yield each document as soon as
+        it is ready (completion order, not directory order)
+        
+        At most `workers` PDFs are in flight, so peak memory is bounded by the
+        pool size rather than the corpus size.
+        """
+        if filepaths is None:
+            filepaths = self.list_pdfs()
         
-        logger.info(f"📚 Found {len(pdf_files)} PDFs to load")
+        logger.info(f"📚 Found {len(filepaths)} PDFs to load ({self.workers} workers)")
         
-        for pdf_file in pdf_files:
-            filepath = os.path.join(self.pdf_directory, pdf_file)
-            doc = self.load_single_pdf(filepath)
-            if doc:
-                documents.append(doc)
+        if self.workers == 1 or len(filepaths) <= 1:
+            for filepath in filepaths:
+                doc = self.load_single_pdf(filepath)
+                if doc:
+                    yield doc
+            return
         
+        pending_paths = iter(filepaths)
+        # spawn, not fork: the builder process may already hold torch / BLAS threads
+        with ProcessPoolExecutor(
+            max_workers=min(self.workers, len(filepaths)),
+            mp_context=multiprocessing.get_context("spawn")
+        ) as pool:
+            in_flight = set()
+            
+            def submit_next() -> bool:
+                filepath = next(pending_paths, None)
+                if filepath is None:
+                    return False
+                in_flight.add(pool.submit(self.load_single_pdf, filepath))
+                return True
+            
+            for _ in range(self.workers):
+                if not submit_next():
+                    break
+            
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    in_flight.discard(future)
+                    submit_next()
+                    
+                    try:
+                        doc = future.result()
+                    except Exception as e:
+                        logger.error(f"❌ PDF extraction worker failed: {e}")
+                        continue
+                    
+                    if doc:
+                        yield doc
+    
+    def load_all_pdfs(self) -> List[Dict[str, str]]:
+        """
+        Load all PDFs from the directory
+        ⚠️ Materializes every document - build_index streams iter_pdfs() instead
+        """
+        documents = list(self.iter_pdfs())
         logger.info(f"✅ Successfully loaded {len(documents)} documents")
         return documents
     
@@ -63,10 +63,25 @@ class PromptTemplate:
         return prompt
     
     @staticmethod
-    def get_scheme_explanation_prompt(scheme_name: str, context: str) -> str:
+    def get_scheme_explanation_prompt(scheme_name: str, context: str, language: str = "hindi") -> str:
         """
         Prompt for explaining government schemes
         """
+        if language.lower() != "hindi":
+            return f"""Using the information below, explain the "{scheme_name}" scheme in very simple {_language_name(language)}.
+
+**Information:**
+{context}
+
+**Cover these points:**
+1. What is this scheme? (1 sentence)
+2. Who is it for? (eligibility)
+3. How much loan/benefit can one get?
+4. What is the interest rate?
+5. How to apply?
+
+**Answer (in simple {_language_name(language)}, as if explaining to a villager):**"""
+
         prompt = f"""नीचे दी गई जानकारी के आधार पर "{scheme_name}" योजना को बहुत ही सरल हिंदी में समझाओ।
 
 **जानकारी:**
@@ -84,10 +99,24 @@ class PromptTemplate:
         return prompt
     
     @staticmethod
-    def get_term_explanation_prompt(term: str, context: str) -> str:
+    def get_term_explanation_prompt(term: str, context: str, language: str = "hindi") -> str:
         """
         Prompt for explaining banking terms
         """
+        if language.lower() != "hindi":
+            return f"""Explain the meaning of "{term}" in very simple {_language_name(language)}, as if explaining to a villager.
+
+**Context:**
+{context}
+
+**Rules:**
+1. Very easy words
+2. Everyday language
+3. With an example
+4. In 2-3 sentences
+
+**Answer:**"""
+
         prompt = f""""{term}" का मतलब बहुत ही सरल हिंदी में समझाओ, जैसे किसी गाँव के व्यक्ति को समझा रहे हो।
 
 **संदर्भ:**
@@ -136,6 +165,15 @@ class PromptTemplate:
         return formatted
 
 
+def _language_name(language: str) -> str:
+    """Answer language as named in English prompts"""
+    names = {
+        'english': 'English',
+        'punjabi': 'Punjabi (Gurmukhi script)'
+    }
+    return names.get(language.lower(), language.title())
+
+
 # Test prompts
 if __name__ == "__main__":
     template = PromptTemplate()
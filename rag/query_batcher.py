@@ -0,0 +1,157 @@
+"""
+Query Batcher - Dynamic micro-batching for query embeddings
+Concurrent aembed_query() calls are collected for up to a few milliseconds
+(or until the batch is full) and encoded in one model.encode call, instead
+of one batch-of-one transformer pass per request
+"""
+
+import os
+import time
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Callable, List, Optional, Sequence
+
+import numpy as np
+from loguru import logger
+
+from utils import metrics
+
+
+# Power-of-two buckets for the batch size histogram
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+QUEUE_WAIT_BUCKETS = (0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1)
+
+
+class QueryBatcher:
+    """
+    Queue in front of an encode function.
+
+    submit() enqueues one text and returns a Future. A single daemon thread
+    takes the first waiting text, keeps collecting until `max_batch` texts
+    are waiting or `max_wait_ms` has passed since that first text arrived,
+    then encodes the batch in one call and resolves every caller's future.
+    Identical texts in one batch are encoded once; futures cancelled while
+    queued (a caller that timed out or disconnected) are skipped.
+    """
+
+    def __init__(
+        self,
+        encode: Callable[[List[str]], np.ndarray],
+        max_batch: int = 16,
+        max_wait_ms: float = 5.0,
+        name: str = "query"
+    ):
+        self.encode = encode
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.name = name
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+        self.batches = 0
+        self.items = 0
+
+        self._batch_size = metrics.histogram(
+            "embed_batch_size", "Queries encoded per model call", ["batcher"],
+            buckets=BATCH_SIZE_BUCKETS
+        ).labels(batcher=name)
+        self._queue_wait = metrics.histogram(
+            "embed_queue_wait_seconds", "Time a query waited for its batch to start encoding", ["batcher"],
+            buckets=QUEUE_WAIT_BUCKETS
+        ).labels(batcher=name)
+        self._queue_depth = metrics.gauge(
+            "embed_queue_depth", "Queries waiting to be batched", ["batcher"]
+        ).labels(batcher=name)
+
+    def _worker_alive(self) -> bool:
+        return self._thread is not None and self._pid == os.getpid() and self._thread.is_alive()
+
+    def _ensure_worker(self):
+        # Started on first use, again in a forked child (threads do not survive
+        # fork), and again if the worker ever died
+        if self._worker_alive():
+            return
+        with self._lock:
+            if self._worker_alive():
+                return
+            if self._pid != os.getpid():
+                self._queue = queue.Queue()
+            self._thread = threading.Thread(target=self._run, name=f"{self.name}-batcher", daemon=True)
+            self._pid = os.getpid()
+            self._thread.start()
+
+    def submit(self, text: str) -> Future:
+        self._ensure_worker()
+        future: Future = Future()
+        self._queue.put((text, future, time.perf_counter()))
+        self._queue_depth.set(self._queue.qsize())
+        return future
+
+    def embed(self, text: str) -> np.ndarray:
+        """Blocking: the embedding of one text, encoded together with concurrent callers"""
+        return self.submit(text).result()
+
+    def _collect(self) -> list:
+        batch = [self._queue.get()]
+        deadline = batch[0][2] + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            try:
+                batch = self._collect()
+                self._queue_depth.set(self._queue.qsize())
+                self._encode_batch(batch)
+            except Exception as e:
+                # Never let one bad batch kill the only worker thread
+                logger.error(f"❌ Query batcher error: {e}")
+
+    def _encode_batch(self, batch: Sequence[tuple]):
+        # Claim every future; cancelled ones are dropped, the rest can no longer be cancelled
+        batch = [item for item in batch if item[1].set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        started = time.perf_counter()
+        for _, _, enqueued in batch:
+            self._queue_wait.observe(started - enqueued)
+
+        # text -> position in the encoded batch
+        unique = {}
+        for text, _, _ in batch:
+            unique.setdefault(text, len(unique))
+
+        try:
+            embeddings = self.encode(list(unique))
+        except Exception as e:
+            logger.error(f"❌ Batched query encoding failed ({len(batch)} queries): {e}")
+            for _, future, _ in batch:
+                future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.items += len(batch)
+        self._batch_size.observe(len(unique))
+
+        for text, future, _ in batch:
+            future.set_result(embeddings[unique[text]])
+
+    def stats(self) -> dict:
+        return {
+            "max_batch": self.max_batch,
+            "max_wait_ms": self.max_wait * 1000,
+            "batches": self.batches,
+            "queries": self.items,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "queued": self._queue.qsize()
+        }
@@ -3,14 +3,17 @@ RAG Pipeline - End-to-end RAG workflow
 Orchestrates PDF loading, chunking, embedding, indexing, and retrieval
 """
 
-from typing import Dict
+import os
+from typing import Dict, List, Optional
 from loguru import logger
 
 from .pdf_loader import PDFLoader
 from .chunker import TextChunker
 from .embedder import Embedder
 from .vector_store import VectorStore
-from .retriever import Retriever
+from .retriever import Retriever, RetrievalResult
+from .manifest import IndexManifest
+from .lexical_index import LexicalIndex
 from .prompt import PromptTemplate
 
 
@@ -29,44 +32,112 @@ class RAGPipeline:
         self.vector_store = VectorStore()
         self.retriever = None
         self.prompt_template = PromptTemplate()
+        self.manifest: Optional[IndexManifest] = None
+        self.lexical_index = self._create_lexical_index()
 
         self.is_indexed = False
+        # Reported by readiness checks while a (re)build is running
+        self.build_progress = {"documents_done": 0, "documents_total": 0}
 
-    def build_index(self, force_rebuild: bool = False):
+    def build_index(self, force_rebuild: bool = False, incremental: bool = True):
         """
         Build FAISS index in a MEMORY-SAFE streaming manner
+
+        force_rebuild re-syncs the index with data/pdfs. With incremental=True
+        (default) only new/changed PDFs are embedded and the vectors of
+        changed/deleted PDFs are removed, driven by the index manifest; a full
+        rebuild happens when there is no manifest, the embedding/chunking
+        settings changed, or the index type cannot remove vectors (HNSW).
         """
 
         # Try loading existing index
         if not force_rebuild and self.vector_store.load():
             logger.info("✅ Loaded existing index")
-            self.retriever = Retriever(self.vector_store, self.embedder)
+            self.manifest = IndexManifest.load(self.vector_store.index_path)
+            self.retriever = self._make_retriever()
             self.is_indexed = True
             return
 
-        logger.info("🔄 Building new index (memory-safe mode)...")
+        if incremental and self._update_index():
+            return
 
-        # Step 1: Load PDFs
-        logger.info("📚 Step 1/4: Loading PDFs...")
-        documents = self.pdf_loader.load_all_pdfs()
+        logger.info("🔄 Building new index (memory-safe mode)...")
+        # Built into fresh stores and swapped in only once saved: requests keep
+        # using the current index meanwhile, and a failed build leaves it intact
+        vector_store = VectorStore(self.vector_store.index_path)
+        lexical_index = self._create_lexical_index()
+        if lexical_index is not None:
+            lexical_index.reset()
+        manifest = IndexManifest(vector_store.index_path, self._manifest_settings())
 
-        if not documents:
-            logger.error("❌ No PDFs found! Please add PDFs to data/pdfs/")
-            return
+        try:
+            # Step 1: Extract PDFs in worker processes, streamed as each one finishes
+            logger.info("📚 Step 1/4: Loading PDFs...")
+            filepaths = self.pdf_loader.list_pdfs()
+            self.build_progress = {"documents_done": 0, "documents_total": len(filepaths)}
+
+            total_chunks = 0
+            total_documents = 0
+
+            # Step 2–4: Chunk + embed each document while the rest are still being parsed
+            for i, doc in enumerate(self.pdf_loader.iter_pdfs(filepaths), start=1):
+                logger.info(
+                    f"✂️ Processing document {i}/{len(filepaths)}: {doc.get('filename', 'unknown')}"
+                )
+                total_chunks += self._index_document(doc, manifest, vector_store, lexical_index)
+                total_documents += 1
+                self.build_progress["documents_done"] = total_documents
+                del doc
+
+            if not total_documents:
+                logger.error("❌ No PDFs found! Please add PDFs to data/pdfs/")
+                self._discard(vector_store, lexical_index)
+                return
+
+            if not total_chunks:
+                logger.error("❌ No text could be extracted from the PDFs - index not built")
+                self._discard(vector_store, lexical_index)
+                return
+
+            # Train ANN indexes on the buffered sample if the corpus was smaller than it
+            vector_store.flush()
+
+            # Save index once
+            vector_store.save()
+            if lexical_index is not None:
+                lexical_index.commit()
+        except Exception:
+            self._discard(vector_store, lexical_index)
+            raise
+
+        manifest.save()
+        self.manifest = manifest
+
+        # In-flight requests finish on the old stores, which are freed with them
+        self.vector_store = vector_store
+        self.lexical_index = lexical_index
 
-        total_chunks = 0
+        # Initialize retriever
+        self.retriever = self._make_retriever()
+        self.is_indexed = True
 
-        # Step 2–4: Process ONE document at a time
-        for i, doc in enumerate(documents, start=1):
-            logger.info(
-                f"✂️ Processing document {i}/{len(documents)}: {doc.get('filename', 'unknown')}"
-            )
+        logger.info("✅ Index built successfully!")
+        logger.info(f"📊 Total chunks indexed: {total_chunks}")
 
-            # Step 2: Chunk document
-            chunks = self.chunker.chunk_document(doc)
-            if not chunks:
-                continue
+    def _index_document(
+        self,
+        doc: Dict,
+        manifest: IndexManifest,
+        vector_store: VectorStore,
+        lexical_index: Optional[LexicalIndex]
+    ) -> int:
+        """
+        Chunk → embed → add one document and record its id range
+        """
+        # Step 2: Chunk document
+        chunks = self.chunker.chunk_document(doc)
 
+        if chunks:
             texts = [c["text"] for c in chunks]
 
             # Step 3: Generate embeddings in small batches
@@ -75,32 +146,197 @@ class RAGPipeline:
                 batch_size=32
             )
 
-            # Step 4: Incrementally add to vector store
-            self.vector_store.add(embeddings, chunks)
-
-            total_chunks += len(chunks)
+            # Step 4: Incrementally add to vector store (+ keyword index, same ids)
+            id_start, id_end = vector_store.add(embeddings, chunks)
+            if lexical_index is not None:
+                lexical_index.add(
+                    {**chunk, "id": chunk_id}
+                    for chunk_id, chunk in zip(range(id_start, id_end), chunks)
+                )
 
             # Explicit cleanup (important on Windows)
-            del chunks, texts, embeddings
+            del texts, embeddings
+        else:
+            # Recorded anyway so an empty/scanned PDF is not retried every rebuild
+            id_start = id_end = vector_store.next_id
+
+        manifest.record(doc["filename"], doc["source"], id_start, id_end)
+        return len(chunks)
+
+    @staticmethod
+    def _discard(vector_store: VectorStore, lexical_index: Optional[LexicalIndex]):
+        """Drop an unfinished build (the uncommitted lexical changes roll back)"""
+        vector_store.reset()
+        if lexical_index is not None:
+            lexical_index.close()
+
+    def _create_lexical_index(self) -> Optional[LexicalIndex]:
+        """
+        FTS5 keyword index next to the FAISS files (LEXICAL_INDEX=false disables it)
+        """
+        if os.getenv("LEXICAL_INDEX", "true").lower() not in ("1", "true", "yes"):
+            return None
 
-        # Save index once
+        try:
+            return LexicalIndex(self.vector_store.index_path)
+        except Exception as e:
+            logger.warning(f"⚠️ Lexical index unavailable (SQLite without FTS5?): {e}")
+            return None
+
+    def _make_retriever(self) -> Retriever:
+        # Indexes built before the lexical index existed get it backfilled once
+        if self.lexical_index is not None:
+            self.lexical_index.sync(self.vector_store.chunks)
+        return Retriever(self.vector_store, self.embedder, self.lexical_index)
+
+    @property
+    def index_version(self) -> Optional[str]:
+        """
+        Changes on every (re)build - lets caches of derived answers invalidate
+        ("legacy" for indexes built before manifests existed)
+        """
+        if not self.is_indexed:
+            return None
+        return self.manifest.build_id if self.manifest else "legacy"
+
+    def _manifest_settings(self) -> Dict[str, any]:
+        """Anything that invalidates existing vectors when it changes"""
+        return {
+            "embedding_model": self.embedder.model_name,
+            "embedding_backend": self.embedder.backend,
+            "chunk_size": self.chunker.chunk_size,
+            "chunk_overlap": self.chunker.chunk_overlap,
+            **self.vector_store.configured_layout
+        }
+
+    def _update_index(self) -> bool:
+        """
+        Incremental rebuild from the manifest
+
+        Returns False when a full rebuild is needed instead
+        """
+        manifest = IndexManifest.load(self.vector_store.index_path)
+        if manifest is None:
+            logger.info("🧾 No index manifest - full rebuild")
+            return False
+
+        if not manifest.compatible_with(self._manifest_settings()):
+            logger.info("🧾 Embedding/chunking/index settings changed - full rebuild")
+            return False
+
+        plan = manifest.diff(self.pdf_directory)
+        stale = plan["changed"] + plan["removed"]
+        fresh = plan["added"] + plan["changed"]
+
+        logger.info(
+            f"🧾 Index sync: {len(plan['added'])} added, {len(plan['changed'])} changed, "
+            f"{len(plan['removed'])} removed, {len(plan['unchanged'])} unchanged"
+        )
+
+        if not stale and not fresh:
+            if not self.vector_store.load():
+                return False
+            if manifest.stats_refreshed:
+                # Keep the build id: the vectors did not change
+                manifest.save(new_build=False)
+            self.manifest = manifest
+            self.retriever = self._make_retriever()
+            self.is_indexed = True
+            logger.info("✅ Index already up to date")
+            return True
+
+        # A mapped index is read-only
+        if not self.vector_store.load(mmap=False):
+            return False
+
+        if stale and not self.vector_store.supports_removal:
+            logger.info(f"🧾 {self.vector_store.factory_string} cannot remove vectors - full rebuild")
+            return False
+
+        for filename in stale:
+            entry = manifest.remove(filename)
+            self.vector_store.remove_range(entry["id_start"], entry["id_end"])
+            if self.lexical_index is not None:
+                self.lexical_index.remove_range(entry["id_start"], entry["id_end"])
+
+        total_chunks = 0
+        fresh_paths = [os.path.join(self.pdf_directory, filename) for filename in fresh]
+        self.build_progress = {"documents_done": 0, "documents_total": len(fresh_paths)}
+        for doc in self.pdf_loader.iter_pdfs(fresh_paths):
+            total_chunks += self._index_document(doc, manifest, self.vector_store, self.lexical_index)
+            self.build_progress["documents_done"] += 1
+
+        self.vector_store.flush()
         self.vector_store.save()
+        if self.lexical_index is not None:
+            self.lexical_index.commit()
+        manifest.save()
+        self.manifest = manifest
 
-        # Initialize retriever
-        self.retriever = Retriever(self.vector_store, self.embedder)
+        self.retriever = self._make_retriever()
         self.is_indexed = True
 
-        logger.info("✅ Index built successfully!")
-        logger.info(f"📊 Total chunks indexed: {total_chunks}")
+        logger.info(f"✅ Index updated: +{total_chunks} chunks from {len(fresh)} PDFs, {len(stale)} PDFs dropped")
+        return True
+
+    def retrieve(self, question: str, top_k: int = 3) -> RetrievalResult:
+        """
+        Embed + search once; the result feeds query() and explain_*()
+        """
+        if not self.is_indexed:
+            logger.warning("⚠️ Index not built. Building now...")
+            self.build_index()
+
+        if not self.is_indexed:
+            return RetrievalResult(question)
+
+        return self.retriever.retrieve_result(question, top_k=top_k)
 
     def query(
         self,
         question: str,
         language: str = "hindi",
-        top_k: int = 3
+        top_k: int = 3,
+        retrieval: Optional[RetrievalResult] = None
     ) -> Dict[str, any]:
         """
         Query the RAG system
+
+        Pass `retrieval` to reuse chunks that were already retrieved for this question
+        """
+        if retrieval is None:
+            retrieval = self.retrieve(question, top_k=top_k)
+
+        return self._build_query_result(question, retrieval, language)
+
+    async def aquery(
+        self,
+        question: str,
+        language: str = "hindi",
+        top_k: int = 3
+    ) -> Dict[str, any]:
+        """
+        query() for the event loop - concurrent questions share query
+        embedding batches (see Embedder.aembed_query). Never builds the index:
+        without one the result has no context.
+        """
+        if not self.is_indexed:
+            logger.warning("⚠️ Index not built - answering without context")
+            return self._build_query_result(question, RetrievalResult(question), language)
+
+        retrieval = await self.retriever.aretrieve_result(question, top_k=top_k)
+        return self._build_query_result(question, retrieval, language)
+
+    def query_many(
+        self,
+        questions: List[str],
+        language: str = "hindi",
+        top_k: int = 3
+    ) -> List[Dict[str, any]]:
+        """
+        Query the RAG system for many questions with one batched retrieval
+
+        Returns one result dict per question, shaped like query()
         """
 
         if not self.is_indexed:
@@ -108,72 +344,78 @@ class RAGPipeline:
             self.build_index()
 
         if not self.is_indexed:
-            return {
-                "context": "",
-                "sources": [],
-                "prompt": self.prompt_template.get_no_context_prompt(question),
-                "retrieved_chunks": []
-            }
+            retrievals = [RetrievalResult(question) for question in questions]
+        else:
+            retrievals = self.retriever.retrieve_many_results(questions, top_k=top_k)
 
-        # Retrieve relevant chunks
-        results = self.retriever.retrieve(question, top_k=top_k)
+        return [
+            self._build_query_result(question, retrieval, language)
+            for question, retrieval in zip(questions, retrievals)
+        ]
 
-        if not results:
+    def _build_query_result(
+        self,
+        question: str,
+        retrieval: RetrievalResult,
+        language: str
+    ) -> Dict[str, any]:
+        if not retrieval:
             return {
                 "context": "",
                 "sources": [],
                 "prompt": self.prompt_template.get_no_context_prompt(question),
-                "retrieved_chunks": []
+                "retrieved_chunks": [],
+                "retrieval": retrieval
             }
 
-        # Format context
-        context = self.retriever.retrieve_with_context(question, top_k=top_k)
-
-        # Extract sources
-        sources = list(set(r["source"] for r in results))
-
-        # Generate final prompt
-        prompt = self.prompt_template.get_rag_prompt(
-            question,
-            context,
-            language
-        )
-
         return {
-            "context": context,
-            "sources": sources,
-            "prompt": prompt,
-            "retrieved_chunks": results
+            "context": retrieval.context,
+            "sources": retrieval.sources,
+            "prompt": self.prompt_template.get_rag_prompt(
+                question,
+                retrieval.context,
+                language
+            ),
+            "retrieved_chunks": retrieval.chunks,
+            "retrieval": retrieval
         }
 
-    def explain_scheme(self, scheme_name: str, top_k: int = 5) -> str:
+    def explain_scheme(
+        self,
+        scheme_name: str,
+        top_k: int = 5,
+        retrieval: Optional[RetrievalResult] = None,
+        language: str = "hindi"
+    ) -> str:
         """
         Explain a government scheme
         """
-        if not self.is_indexed:
-            self.build_index()
-
-        results = self.retriever.retrieve(scheme_name, top_k=top_k)
-        context = "\n\n".join(r["text"] for r in results)
+        if retrieval is None:
+            retrieval = self.retrieve(scheme_name, top_k=top_k)
 
         return self.prompt_template.get_scheme_explanation_prompt(
             scheme_name,
-            context
+            retrieval.text,
+            language
         )
 
-    def explain_term(self, term: str, top_k: int = 3) -> str:
+    def explain_term(
+        self,
+        term: str,
+        top_k: int = 3,
+        retrieval: Optional[RetrievalResult] = None,
+        language: str = "hindi"
+    ) -> str:
         """
         Explain a banking/financial term
         """
-        if not self.is_indexed:
-            self.build_index()
-
-        results = self.retriever.retrieve(term, top_k=top_k)
-        context = "\n\n".join(r["text"] for r in results)
+        if retrieval is None:
+            retrieval = self.retrieve(term, top_k=top_k)
 
         return self.prompt_template.get_term_explanation_prompt(
             term,
-            context
+            retrieval.text,
+            language
         )
 
     def get_stats(self) -> Dict[str, any]:
@@ -186,9 +428,20 @@ class RAGPipeline:
         return {
             "status": "indexed",
             "total_vectors": self.vector_store.index.ntotal,
+            "index_type": self.vector_store.factory_string,
+            "index_build_id": self.index_version,
             "dimension": self.embedder.dimension,
+            "embedding_backend": self.embedder.backend_info(),
             "total_chunks": len(self.vector_store.chunks),
-            "pdf_directory": self.pdf_directory
+            "pdf_directory": self.pdf_directory,
+            "query_embedding_cache": self.embedder.cache_stats(),
+            "query_batching": self.embedder.batcher_stats(),
+            "chunk_embedding_cache": self.embedder.chunk_cache_stats(),
+            "lexical_index": {
+                "enabled": self.lexical_index is not None,
+                "chunks": len(self.lexical_index) if self.lexical_index is not None else 0,
+                "fast_path_hits": self.retriever.fast_path_hits
+            }
         }
 
 
@@ -3,18 +3,84 @@ Retriever - High-level interface for semantic search
 Combines embedder and vector store
 """
 
-from typing import List, Dict, Tuple
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import List, Dict, Optional, Tuple
+import numpy as np
 from loguru import logger
 from .embedder import Embedder
 from .vector_store import VectorStore
+from .lexical_index import LexicalIndex, reciprocal_rank_fusion
+from utils.executors import run_io, run_model
 import os
 
 
+@dataclass
+class RetrievalResult:
+    """
+    Chunks retrieved for one query plus everything derived from them.
+    Produced once per query so context, sources and confidence never
+    trigger a second embedding/search.
+    """
+    query: str
+    chunks: List[Dict[str, any]] = field(default_factory=list)
+    # Query embedding used for the vector search (None on the lexical fast path)
+    embedding: Optional[np.ndarray] = None
+
+    def __bool__(self) -> bool:
+        return bool(self.chunks)
+
+    @cached_property
+    def context(self) -> str:
+        """Numbered, source-labelled context for the LLM prompt"""
+        return Retriever.format_context(self.chunks)
+
+    @cached_property
+    def text(self) -> str:
+        """Plain chunk texts (used by scheme/term explanations)"""
+        return "\n\n".join(c["text"] for c in self.chunks)
+
+    @cached_property
+    def sources(self) -> List[str]:
+        return list(dict.fromkeys(c["source"] for c in self.chunks))
+
+    @cached_property
+    def chunk_ids(self) -> Tuple[int, ...]:
+        """Order-independent identity of the retrieved context"""
+        return tuple(sorted(c.get("id", -1) for c in self.chunks))
+
+    @cached_property
+    def avg_score(self) -> Optional[float]:
+        """
+        Mean vector similarity of the chunks; None when every chunk came from
+        the lexical index (BM25 scores are not on the cosine scale)
+        """
+        if not self.chunks:
+            return 0.0
+        scores = [c["score"] for c in self.chunks if c["score"] is not None]
+        if not scores:
+            return None
+        return sum(scores) / len(scores)
+
+
 class Retriever:
-    def __init__(self, vector_store: VectorStore, embedder: Embedder):
+    def __init__(
+        self,
+        vector_store: VectorStore,
+        embedder: Embedder,
+        lexical_index: Optional[LexicalIndex] = None
+    ):
         self.vector_store = vector_store
         self.embedder = embedder
+        self.lexical_index = lexical_index
         self.top_k = int(os.getenv('TOP_K_RESULTS', 3))
+        
+        # Keyword queries ("PMEGP", "किसान क्रेडिट कार्ड") skip the embedder entirely
+        self.lexical_fast_path = os.getenv('LEXICAL_FAST_PATH', 'true').lower() in ('1', 'true', 'yes')
+        # 'hybrid' also runs lexical search for vector queries and merges both (RRF)
+        self.mode = os.getenv('RETRIEVAL_MODE', 'vector').lower()
+        
+        self.fast_path_hits = 0
     
     def retrieve(self, query: str, top_k: int = None) -> List[Dict[str, any]]:
         """
@@ -25,30 +91,135 @@ class Retriever:
             top_k: Number of results (default from env)
         
         Returns:
-            List of dicts with 'text', 'source', 'score'
+            List of dicts with 'text', 'source', 'score' (vector similarity;
+            None for lexical hits, which carry 'lexical_score' instead)
+        """
+        return self.retrieve_result(query, top_k).chunks
+    
+    def _keyword_results(self, query: str, top_k: int) -> List[Dict[str, any]]:
+        """
+        Lexical fast path - [] unless the query is a short, selective keyword phrase
+        """
+        if self.lexical_index is None or not self.lexical_fast_path:
+            return []
+        
+        results = self._lexical_to_results(self.lexical_index.keyword_search(query, top_k))
+        if results:
+            self.fast_path_hits += 1
+            logger.info(f"⚡ Lexical fast path: {len(results)} chunks")
+        return results
+    
+    def _merge_lexical(self, query: str, vector_results: List[Dict], top_k: int) -> List[Dict[str, any]]:
+        if self.lexical_index is None or self.mode != 'hybrid':
+            return vector_results
+        
+        lexical_results = self._lexical_to_results(self.lexical_index.search(query, top_k))
+        return reciprocal_rank_fusion([vector_results, lexical_results], top_k)
+    
+    def _lexical_to_results(self, hits: List[Tuple[int, float]]) -> List[Dict[str, any]]:
+        chunks = []
+        for chunk_id, score in hits:
+            chunk = self.vector_store.chunks.get(chunk_id)
+            if chunk is not None:
+                chunks.append((chunk, score))
+        return self._format_results(chunks, lexical=True)
+    
+    def retrieve_result(self, query: str, top_k: int = None) -> RetrievalResult:
+        """
+        Retrieve once and wrap the chunks (and query embedding) in a RetrievalResult
         """
         if top_k is None:
             top_k = self.top_k
         
         logger.info(f"🔍 Retrieving for query: {query[:50]}...")
         
+        keyword_results = self._keyword_results(query, top_k)
+        if keyword_results:
+            return RetrievalResult(query, keyword_results)
+        
         # Embed query
         query_embedding = self.embedder.embed_query(query)
         
+        return self._search(query, query_embedding, top_k)
+    
+    async def aretrieve_result(self, query: str, top_k: int = None) -> RetrievalResult:
+        """
+        retrieve_result() for the event loop: the query embedding goes through
+        the embedder's micro-batcher, SQLite and FAISS run on the worker pools
+        """
+        if top_k is None:
+            top_k = self.top_k
+        
+        logger.info(f"🔍 Retrieving for query: {query[:50]}...")
+        
+        keyword_results = await run_io(self._keyword_results, query, top_k)
+        if keyword_results:
+            return RetrievalResult(query, keyword_results)
+        
+        query_embedding = await self.embedder.aembed_query(query)
+        
+        return await run_model(self._search, query, query_embedding, top_k)
+    
+    def _search(self, query: str, query_embedding: np.ndarray, top_k: int) -> RetrievalResult:
         # Search vector store
         results = self.vector_store.search(query_embedding, k=top_k)
         
-        # Format results
+        formatted_results = self._merge_lexical(query, self._format_results(results), top_k)
+        
+        logger.info(f"✅ Retrieved {len(formatted_results)} relevant chunks")
+        return RetrievalResult(query, formatted_results, query_embedding)
+    
+    def retrieve_many(self, queries: List[str], top_k: int = None) -> List[List[Dict[str, any]]]:
+        """
+        Retrieve relevant chunks for many queries at once
+        
+        All queries are embedded in one encode call and searched with one
+        index.search over the (N, d) query matrix.
+        
+        Returns:
+            One list of result dicts per query, in input order
+        """
+        return [result.chunks for result in self.retrieve_many_results(queries, top_k)]
+    
+    def retrieve_many_results(self, queries: List[str], top_k: int = None) -> List[RetrievalResult]:
+        """
+        Batched retrieve_result(): one RetrievalResult per query
+        """
+        if top_k is None:
+            top_k = self.top_k
+        
+        if not queries:
+            return []
+        
+        logger.info(f"🔍 Retrieving for {len(queries)} queries...")
+        
+        results = [RetrievalResult(query, self._keyword_results(query, top_k)) for query in queries]
+        pending = [i for i, r in enumerate(results) if not r]
+        
+        if pending:
+            query_embeddings = self.embedder.embed_queries([queries[i] for i in pending])
+            batch_results = self.vector_store.search_batch(query_embeddings, k=top_k)
+            
+            for i, embedding, vector_results in zip(pending, query_embeddings, batch_results):
+                chunks = self._merge_lexical(queries[i], self._format_results(vector_results), top_k)
+                results[i] = RetrievalResult(queries[i], chunks, embedding)
+        
+        return results
+    
+    @staticmethod
+    def _format_results(results: List[Tuple[Dict, float]], lexical: bool = False) -> List[Dict[str, any]]:
         formatted_results = []
         for chunk, score in results:
-            formatted_results.append({
+            result = {
+                'id': chunk.get('id', -1),
                 'text': chunk['text'],
                 'source': chunk.get('source', 'unknown'),
-                'score': score,
+                'score': None if lexical else score,
                 'chunk_id': chunk.get('chunk_id', -1)
-            })
-        
-        logger.info(f"✅ Retrieved {len(formatted_results)} relevant chunks")
+            }
+            if lexical:
+                result['lexical_score'] = score
+            formatted_results.append(result)
         return formatted_results
     
     def retrieve_with_context(self, query: str, top_k: int = None) -> str:
@@ -59,7 +230,13 @@ class Retriever:
             Formatted context string
         """
         results = self.retrieve(query, top_k)
-        
+        return self.format_context(results)
+    
+    @staticmethod
+    def format_context(results: List[Dict[str, any]]) -> str:
+        """
+        Format already-retrieved results as LLM context
+        """
         if not results:
             return "कोई प्रासंगिक जानकारी नहीं मिली। (No relevant information found.)"
         
@@ -94,7 +271,8 @@ if __name__ == "__main__":
             
             results = retriever.retrieve(query)
             for r in results:
-                print(f"\n✓ Score: {r['score']:.4f} | Source: {r['source']}")
+                score = r['score'] if r['score'] is not None else r['lexical_score']
+                print(f"\n✓ Score: {score:.4f} | Source: {r['source']}")
                 print(f"  {r['text'][:200]}...")
     else:
         print("⚠️ Please build the index first using rag_pipeline.py")
\ No newline at end of file
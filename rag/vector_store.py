@@ -4,22 +4,228 @@ Handles indexing and persistence (memory-safe & incremental)
 """
 
 import os
+import json
 import pickle
 import numpy as np
-import faiss
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional
 from loguru import logger
 
+from utils.lazy_import import lazy_import
+
+from .chunk_store import ChunkStore
+
+# Loaded when the first index is built / read, not when the API imports this module
+faiss = lazy_import("faiss")
+
+
+# Supported index types (FAISS_INDEX_TYPE)
+INDEX_TYPES = ("flat", "ivf", "hnsw")
+
+# Vector encodings (FAISS_CODEC): float32, 8-bit / fp16 scalar quantization, product quantization
+CODECS = ("none", "sq8", "fp16", "pq")
+
+# FAISS wants ~39 training points per IVF centroid
+MIN_POINTS_PER_CENTROID = 39
+
 
 class VectorStore:
-    def __init__(self, index_path: str = "data/processed/faiss_index"):
+    def __init__(
+        self,
+        index_path: str = "data/processed/faiss_index",
+        mmap: Optional[bool] = None,
+        index_type: Optional[str] = None,
+        nlist: Optional[int] = None,
+        hnsw_m: Optional[int] = None,
+        nprobe: Optional[int] = None,
+        ef_search: Optional[int] = None,
+        codec: Optional[str] = None,
+        pq_m: Optional[int] = None
+    ):
         self.index_path = index_path
         self.index = None
-        self.chunks: List[Dict] = []
+        self.chunks = ChunkStore()
         self.dimension = None
 
+        # Memory-map index + chunk store on load (read-only, shared page cache)
+        if mmap is None:
+            mmap = os.getenv("VECTOR_STORE_MMAP", "true").lower() in ("1", "true", "yes")
+        self.mmap = mmap
+
+        # Index construction (applies to newly built indexes)
+        self.index_type = (index_type or os.getenv("FAISS_INDEX_TYPE", "flat")).lower()
+        if self.index_type not in INDEX_TYPES:
+            raise ValueError(f"Unknown FAISS index type: {self.index_type} (use one of {INDEX_TYPES})")
+
+        self.codec = (codec or os.getenv("FAISS_CODEC", "none")).lower()
+        if self.codec not in CODECS:
+            raise ValueError(f"Unknown FAISS codec: {self.codec} (use one of {CODECS})")
+        if self.codec == "pq" and self.index_type == "hnsw":
+            raise ValueError("PQ codec is supported with flat or ivf indexes, not hnsw")
+
+        # What a rebuild produces (load() switches to whatever the saved index is)
+        self.configured_layout = {"index_type": self.index_type, "codec": self.codec}
+
+        self.nlist = nlist or int(os.getenv("FAISS_NLIST", 256))
+        self.pq_m = pq_m or int(os.getenv("FAISS_PQ_M", 192))
+        self.hnsw_m = hnsw_m or int(os.getenv("FAISS_HNSW_M", 32))
+        self.ef_construction = int(os.getenv("FAISS_EF_CONSTRUCTION", 80))
+        self.train_size = int(os.getenv("FAISS_TRAIN_SIZE", self.nlist * MIN_POINTS_PER_CENTROID * 2))
+
+        # Query-time knobs (applied on every search, tunable without a rebuild)
+        self.nprobe = nprobe or int(os.getenv("FAISS_NPROBE", 16))
+        self.ef_search = ef_search or int(os.getenv("FAISS_EF_SEARCH", 64))
+
+        # Vectors (and their ids) held back until an IVF index has enough points to train on
+        self._train_buffer: List[Tuple[np.ndarray, np.ndarray]] = []
+        self.factory_string = None
+
+        # Next chunk id; ids are FAISS labels and never reused
+        self.next_id = 0
+
         os.makedirs(index_path, exist_ok=True)
 
+    def reset(self):
+        """
+        Drop the in-memory index (a mapped index is read-only, so rebuilds start fresh)
+        """
+        self.chunks.close()
+        self.index = None
+        self.chunks = ChunkStore()
+        self.dimension = None
+        self.index_type = self.configured_layout["index_type"]
+        self.codec = self.configured_layout["codec"]
+        self.factory_string = None
+        self._train_buffer = []
+        self.next_id = 0
+
+    # ------------------------------------------------------------------
+    # 🔹 INDEX FACTORY
+    # ------------------------------------------------------------------
+    def _factory(self, n_train: Optional[int] = None) -> str:
+        """
+        FAISS index_factory string for the configured index type + codec
+        """
+        if self.codec == "sq8":
+            encoding = "SQ8"
+        elif self.codec == "fp16":
+            encoding = "SQfp16"
+        elif self.codec == "pq":
+            # 8-bit sub-quantizers need 256 training points; tiny corpora get fewer bits
+            nbits = 8
+            if n_train is not None:
+                nbits = max(1, min(8, int(np.log2(max(n_train, 2)))))
+            # "np" skips polysemous training - only polysemous search uses it,
+            # and it dominates training time at 8 bits
+            encoding = f"PQ{self.pq_m}x{nbits}np"
+        else:
+            encoding = "Flat"
+
+        if self.index_type == "ivf":
+            nlist = self.nlist
+            if n_train is not None:
+                # Small corpora cannot support many centroids
+                nlist = max(1, min(nlist, n_train // MIN_POINTS_PER_CENTROID))
+            # IVF stores ids natively
+            return f"IVF{nlist},{encoding}"
+
+        # Everything else is wrapped in an id map so chunks can be removed by id
+        if self.index_type == "hnsw":
+            if encoding == "Flat":
+                return f"IDMap,HNSW{self.hnsw_m}"
+            return f"IDMap,HNSW{self.hnsw_m},{encoding}"
+
+        return f"IDMap,{encoding}"
+
+    def _new_index(self, dimension: int, n_train: Optional[int] = None):
+        self.dimension = dimension
+        self.factory_string = self._factory(n_train)
+        index = faiss.index_factory(dimension, self.factory_string, faiss.METRIC_L2)
+
+        if self.index_type == "hnsw":
+            faiss.downcast_index(index.index).hnsw.efConstruction = self.ef_construction
+
+        logger.info(f"🆕 Created FAISS index {self.factory_string} (dim={dimension})")
+        return index
+
+    @property
+    def supports_ids(self) -> bool:
+        """Index takes explicit ids (pre-id-map flat indexes use positions)"""
+        return self.index_type == "ivf" or isinstance(self.index, faiss.IndexIDMap)
+
+    @property
+    def supports_removal(self) -> bool:
+        """HNSW graphs cannot delete vectors - changed PDFs need a full rebuild"""
+        return self.supports_ids and self.index_type != "hnsw"
+
+    @property
+    def needs_training(self) -> bool:
+        return self.index_type == "ivf" or self.codec in ("sq8", "pq")
+
+    def memory_bytes(self) -> int:
+        """
+        ntotal * code_size - the bytes held for the vector codes, computed
+        without copying the index (HNSW links / id maps are not counted)
+        """
+        if self.index is None or self.index.ntotal == 0:
+            return 0
+
+        # IDMap / HNSW wrap the index that actually stores the codes
+        index = faiss.downcast_index(self.index)
+        while not hasattr(index, "code_size"):
+            inner = getattr(index, "index", None) or getattr(index, "storage", None)
+            if inner is None:
+                return int(self.index.ntotal * self.index.d * 4)
+            index = faiss.downcast_index(inner)
+        return int(self.index.ntotal * index.code_size)
+
+    def train(self, sample: np.ndarray):
+        """
+        Create and train the index on a sample of embeddings
+        """
+        sample = np.ascontiguousarray(sample, dtype="float32")
+        self.index = self._new_index(sample.shape[1], n_train=sample.shape[0])
+
+        if not self.index.is_trained:
+            logger.info(f"🎯 Training {self.factory_string} on {sample.shape[0]} vectors")
+            self.index.train(sample)
+
+    def flush(self):
+        """
+        Train on whatever is buffered (small corpora) and add it to the index
+        """
+        if not self._train_buffer:
+            return
+
+        buffered = np.vstack([vectors for vectors, _ in self._train_buffer])
+        buffered_ids = np.concatenate([ids for _, ids in self._train_buffer])
+        self._train_buffer = []
+
+        if self.index is None:
+            self.train(buffered)
+
+        self._add_vectors(buffered, buffered_ids)
+        logger.info(f"➕ Flushed {buffered.shape[0]} buffered vectors | Total = {self.index.ntotal}")
+
+    def set_search_params(self, nprobe: Optional[int] = None, ef_search: Optional[int] = None):
+        """
+        Tune recall/latency at query time
+        """
+        if nprobe is not None:
+            self.nprobe = nprobe
+        if ef_search is not None:
+            self.ef_search = ef_search
+        self._apply_search_params()
+
+    def _apply_search_params(self):
+        if self.index is None:
+            return
+
+        params = faiss.ParameterSpace()
+        if self.index_type == "ivf":
+            params.set_index_parameter(self.index, "nprobe", self.nprobe)
+        elif self.index_type == "hnsw":
+            params.set_index_parameter(self.index, "efSearch", self.ef_search)
+
     # ------------------------------------------------------------------
     # 🔹 CREATE INDEX (ONE-SHOT)
     # ------------------------------------------------------------------
@@ -27,92 +233,243 @@ class VectorStore:
         """
         Create FAISS index from embeddings (one-shot)
         """
-        self.dimension = embeddings.shape[1]
+        embeddings = np.ascontiguousarray(embeddings, dtype="float32")
         n_embeddings = embeddings.shape[0]
 
-        logger.info(f"🔄 Creating FAISS index - {n_embeddings} vectors, dim={self.dimension}")
+        logger.info(f"🔄 Creating FAISS index - {n_embeddings} vectors, dim={embeddings.shape[1]}")
 
-        self.index = faiss.IndexFlatL2(self.dimension)
-        self.index.add(embeddings.astype("float32"))
-        self.chunks = chunks
+        ids = np.arange(n_embeddings, dtype="int64")
+        self.train(embeddings)
+        self._add_vectors(embeddings, ids)
+        self._apply_search_params()
+        self.chunks = ChunkStore(self._with_ids(chunks, ids))
+        self.next_id = n_embeddings
 
         logger.info(f"✅ Index created with {self.index.ntotal} vectors")
 
     # ------------------------------------------------------------------
     # 🔹 ADD VECTORS (INCREMENTAL / STREAMING)
     # ------------------------------------------------------------------
-    def add(self, embeddings: np.ndarray, chunks: List[Dict]):
+    def add(self, embeddings: np.ndarray, chunks: List[Dict]) -> Tuple[int, int]:
         """
         Incrementally add vectors + metadata (SAFE FOR LARGE DATA)
+
+        Returns:
+            (first_id, end_id) - the id range assigned to these chunks
         """
-        embeddings = embeddings.astype("float32")
+        embeddings = np.ascontiguousarray(embeddings, dtype="float32")
+
+        first_id = self.next_id
+        ids = np.arange(first_id, first_id + embeddings.shape[0], dtype="int64")
+        self.next_id += embeddings.shape[0]
+
+        # Chunks are appended now; vectors keep the same ids when flushed
+        self.chunks.extend(self._with_ids(chunks, ids))
+
+        if self.index is None and self.needs_training:
+            # Hold vectors back until there are enough to train on
+            self._train_buffer.append((embeddings, ids))
+            buffered = sum(b.shape[0] for b, _ in self._train_buffer)
+            logger.info(f"⏳ Buffered {len(chunks)} vectors for training ({buffered}/{self.train_size})")
+
+            if buffered >= self.train_size:
+                self.flush()
+            return first_id, self.next_id
 
         if self.index is None:
             # First batch → create index
-            self.dimension = embeddings.shape[1]
-            self.index = faiss.IndexFlatL2(self.dimension)
-            logger.info(f"🆕 Created FAISS index (dim={self.dimension})")
+            self.index = self._new_index(embeddings.shape[1])
 
-        self.index.add(embeddings)
-        self.chunks.extend(chunks)
+        self._add_vectors(embeddings, ids)
 
         logger.info(f"➕ Added {len(chunks)} vectors | Total = {self.index.ntotal}")
+        return first_id, self.next_id
+
+    def _add_vectors(self, embeddings: np.ndarray, ids: np.ndarray):
+        if self.supports_ids:
+            self.index.add_with_ids(embeddings, ids)
+        elif ids.size and ids[0] != self.index.ntotal:
+            raise ValueError("This index maps ids to positions - rebuild it to add out of order")
+        else:
+            self.index.add(embeddings)
+
+    @staticmethod
+    def _with_ids(chunks: List[Dict], ids: np.ndarray) -> List[Dict]:
+        return [{**chunk, "id": int(chunk_id)} for chunk, chunk_id in zip(chunks, ids)]
+
+    # ------------------------------------------------------------------
+    # 🔹 REMOVE
+    # ------------------------------------------------------------------
+    def remove_range(self, start_id: int, end_id: int) -> int:
+        """
+        Remove the vectors + chunks with start_id <= id < end_id
+        (each PDF owns one contiguous id range)
+        """
+        if start_id >= end_id:
+            return 0
+
+        if not self.supports_removal:
+            raise ValueError(f"{self.factory_string} index does not support removal")
+
+        self.flush()
+
+        removed = 0
+        if self.index is not None:
+            removed = int(self.index.remove_ids(faiss.IDSelectorRange(start_id, end_id)))
+        removed_chunks = self.chunks.remove_range(start_id, end_id)
+
+        if removed != removed_chunks:
+            logger.warning(f"⚠️ Removed {removed} vectors but {removed_chunks} chunks for ids [{start_id}, {end_id})")
+
+        logger.info(f"➖ Removed {removed} vectors | Total = {self.index.ntotal if self.index is not None else 0}")
+        return removed
 
     # ------------------------------------------------------------------
     # 🔹 SEARCH
     # ------------------------------------------------------------------
     def search(self, query_embedding: np.ndarray, k: int = 3) -> List[Tuple[Dict, float]]:
+        return self.search_batch(query_embedding.reshape(1, -1), k=k)[0]
+
+    def search_batch(self, query_embeddings: np.ndarray, k: int = 3) -> List[List[Tuple[Dict, float]]]:
+        """
+        Search N queries with a single index.search over an (N, d) matrix
+
+        Returns:
+            One ranked list of (chunk, similarity) per query row
+        """
+        self.flush()
+
+        query_matrix = np.ascontiguousarray(query_embeddings, dtype="float32")
+        if query_matrix.ndim == 1:
+            query_matrix = query_matrix.reshape(1, -1)
+
         if self.index is None:
             logger.error("❌ Index not loaded!")
-            return []
+            return [[] for _ in range(query_matrix.shape[0])]
 
-        query_vector = query_embedding.reshape(1, -1).astype("float32")
-        distances, indices = self.index.search(query_vector, k)
+        distances, indices = self.index.search(query_matrix, k)
+        similarities = 1 / (1 + distances)
 
         results = []
-        for idx, distance in zip(indices[0], distances[0]):
-            if idx < len(self.chunks):
-                similarity = 1 / (1 + distance)
-                results.append((self.chunks[idx], float(similarity)))
+        for row_ids, row_similarities in zip(indices, similarities):
+            row = []
+            for chunk_id, similarity in zip(row_ids, row_similarities):
+                chunk = self.chunks.get(int(chunk_id)) if chunk_id >= 0 else None
+                if chunk is not None:
+                    row.append((chunk, float(similarity)))
+            results.append(row)
 
-        logger.info(f"🔍 Retrieved {len(results)} chunks")
+        logger.info(f"🔍 Retrieved {sum(len(r) for r in results)} chunks for {len(results)} queries")
         return results
 
     # ------------------------------------------------------------------
     # 🔹 SAVE
     # ------------------------------------------------------------------
     def save(self):
+        self.flush()
+        if self.index is None:
+            logger.warning("⚠️ Index is empty - nothing to save")
+            return
+
         index_file = os.path.join(self.index_path, "faiss.index")
-        chunks_file = os.path.join(self.index_path, "chunks.pkl")
+        chunks_file = os.path.join(self.index_path, ChunkStore.FILENAME)
+        meta_file = os.path.join(self.index_path, "index_meta.json")
 
-        faiss.write_index(self.index, index_file)
+        # Write next to the old file and swap: a mapped index must not be truncated
+        faiss.write_index(self.index, f"{index_file}.tmp")
+        os.replace(f"{index_file}.tmp", index_file)
+        self.chunks.save(chunks_file)
 
-        with open(chunks_file, "wb") as f:
-            pickle.dump(self.chunks, f)
+        with open(meta_file, "w", encoding="utf-8") as f:
+            json.dump({
+                "index_type": self.index_type,
+                "codec": self.codec,
+                "factory": self.factory_string,
+                "dimension": self.dimension,
+                "ntotal": int(self.index.ntotal),
+                "next_id": self.next_id
+            }, f, indent=2)
 
         logger.info(f"💾 Index saved to {self.index_path}")
 
     # ------------------------------------------------------------------
     # 🔹 LOAD
     # ------------------------------------------------------------------
-    def load(self) -> bool:
+    def load(self, mmap: Optional[bool] = None) -> bool:
+        """
+        Load index + chunks from disk.
+
+        With mmap enabled the FAISS index is opened with the mmap IO flag and
+        chunks are read lazily from the columnar store, so cold start and RSS do
+        not grow with the corpus. A mapped index is read-only: load with
+        mmap=False before adding vectors to it.
+        """
+        if mmap is None:
+            mmap = self.mmap
+
         index_file = os.path.join(self.index_path, "faiss.index")
-        chunks_file = os.path.join(self.index_path, "chunks.pkl")
+        chunks_file = os.path.join(self.index_path, ChunkStore.FILENAME)
+        legacy_chunks_file = os.path.join(self.index_path, "chunks.pkl")
+        meta_file = os.path.join(self.index_path, "index_meta.json")
 
-        if not os.path.exists(index_file) or not os.path.exists(chunks_file):
+        has_chunks = os.path.exists(chunks_file) or os.path.exists(legacy_chunks_file)
+        if not os.path.exists(index_file) or not has_chunks:
             logger.warning("⚠️ Index files not found")
             return False
 
         try:
-            self.index = faiss.read_index(index_file)
+            self.index = self._read_index(index_file, mmap)
 
-            with open(chunks_file, "rb") as f:
-                self.chunks = pickle.load(f)
+            # Release a previously mapped store (its open file blocks os.replace on Windows)
+            self.chunks.close()
+
+            if os.path.exists(chunks_file):
+                self.chunks = ChunkStore.open(chunks_file)
+                if not mmap:
+                    mapped = self.chunks
+                    self.chunks = ChunkStore(list(mapped))
+                    mapped.close()
+            else:
+                # Pre-columnar index: unpickle once, next save() converts it
+                logger.warning("⚠️ Loading legacy chunks.pkl - rebuild to enable mmap")
+                with open(legacy_chunks_file, "rb") as f:
+                    self.chunks = ChunkStore(pickle.load(f))
+
+            # The saved index type wins over the configured one
+            if os.path.exists(meta_file):
+                with open(meta_file, encoding="utf-8") as f:
+                    meta = json.load(f)
+                self.index_type = meta.get("index_type", "flat")
+                self.codec = meta.get("codec", "none")
+                self.factory_string = meta.get("factory")
+                self.next_id = meta.get("next_id", self.index.ntotal)
+            else:
+                self.index_type = "flat"
+                self.codec = "none"
+                self.factory_string = "Flat"
+                self.next_id = self.index.ntotal
 
             self.dimension = self.index.d
-            logger.info(f"✅ Loaded index with {self.index.ntotal} vectors")
+            self._apply_search_params()
+            logger.info(
+                f"✅ Loaded {self.factory_string} index with {self.index.ntotal} vectors"
+                f"{' (mmap)' if mmap else ''}"
+            )
             return True
 
         except Exception as e:
             logger.error(f"❌ Failed to load index: {e}")
             return False
+
+    @staticmethod
+    def _read_index(index_file: str, mmap: bool):
+        if not mmap:
+            return faiss.read_index(index_file)
+
+        # Zero-copy mapping needs a newer FAISS build; older ones only map IVF lists
+        io_flags = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP)
+        try:
+            return faiss.read_index(index_file, io_flags | faiss.IO_FLAG_READ_ONLY)
+        except RuntimeError as e:
+            logger.warning(f"⚠️ mmap load not supported for this index ({e}), reading into RAM")
+            return faiss.read_index(index_file)
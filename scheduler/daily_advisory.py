@@ -7,10 +7,8 @@ from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from sqlalchemy.orm import Session
 from database.db import SessionLocal
 from database.models import UserPreference
-from services.advisory_service import AdvisoryService
-from services.translation_service import TranslationService
-from services.gtts_service import GTTsService
-from services.telegram_service import TelegramService
+from services.registry import lazy_service
+from utils.executors import run_io
 from loguru import logger
 import asyncio
 import os
@@ -19,10 +17,10 @@ from dotenv import load_dotenv
 load_dotenv()
 
 # Initialize services
-advisory_service = AdvisoryService()
-translation_service = TranslationService()
-gtts_service = GTTsService()
-telegram_service = TelegramService()
+advisory_service = lazy_service("advisory")
+translation_service = lazy_service("translation")
+gtts_service = lazy_service("gtts")
+telegram_service = lazy_service("telegram")
 
 
 async def send_daily_advisories():
@@ -36,9 +34,9 @@ async def send_daily_advisories():
     
     try:
         # Get all users with advisory enabled
-        users = db.query(UserPreference).filter(
-            UserPreference.advisory_enabled == True
-        ).all()
+        users = await run_io(
+            db.query(UserPreference).filter(UserPreference.advisory_enabled == True).all
+        )
         
         logger.info(f"📊 Sending advisories to {len(users)} users...")
         
@@ -53,13 +51,14 @@ async def send_daily_advisories():
                 
                 # Translate to user's preferred language
                 target_lang = user.preferred_language or "hi"
-                translated = translation_service.translate(
+                translated = await translation_service.translate_async(
                     advisory_text,
-                    target_lang
+                    target_lang,
+                    site="advisory_broadcast"
                 )
                 
                 # Generate audio
-                audio_path = gtts_service.text_to_speech(
+                audio_path = await gtts_service.text_to_speech_async(
                     translated,
                     lang=target_lang
                 )
@@ -0,0 +1,343 @@
+"""
+Answer Cache - Reuse LLM answers for near-duplicate questions
+A hit skips the Groq round trip (our main latency and rate-limit cost)
+"""
+
+import os
+import json
+import time
+import base64
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from loguru import logger
+
+from utils.cache import DiskCache
+from utils.language_utils import normalize_query_text
+
+
+class AnswerCache:
+    """
+    Semantic answer cache.
+
+    Entries are bucketed by (language, retrieved chunk ids), so an answer is
+    only reused when the LLM would have seen exactly the same context. Within
+    a bucket the question embedding must be at least `threshold` cosine-similar.
+    Questions answered without an embedding (lexical fast path) are stored
+    without one and only match the same normalized question (get_exact).
+
+    Entries expire after `ttl_seconds`, the least recently used are evicted
+    beyond `maxsize`, and everything written under another index version
+    (manifest build id) is dropped as soon as a newer version is seen.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        maxsize: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        threshold: Optional[float] = None
+    ):
+        self.maxsize = maxsize if maxsize is not None else int(os.getenv("ANSWER_CACHE_SIZE", 2048))
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else float(os.getenv("ANSWER_CACHE_TTL", 86400))
+        self.threshold = threshold if threshold is not None else float(os.getenv("ANSWER_CACHE_THRESHOLD", 0.95))
+        path = path if path is not None else os.getenv("ANSWER_CACHE_PATH", "data/cache/answers.sqlite")
+
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._buckets: Dict[str, set] = {}
+        self._lock = threading.Lock()
+        self.index_version: Optional[str] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+        self.disk = None
+        if self.enabled and path:
+            try:
+                self.disk = DiskCache(path, table="answers")
+                self._load()
+            except Exception as e:
+                logger.warning(f"⚠️ Answer cache persistence unavailable: {e}")
+                self.disk = None
+
+        logger.info(
+            f"🗂️ Answer cache: {'on' if self.enabled else 'off'} "
+            f"(size={self.maxsize}, ttl={self.ttl_seconds:.0f}s, threshold={self.threshold})"
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0
+
+    # ------------------------------------------------------------------
+    # 🔹 LOOKUP / STORE
+    # ------------------------------------------------------------------
+    def get(
+        self,
+        embedding: np.ndarray,
+        language: str,
+        chunk_ids: Sequence[int],
+        index_version: Optional[str]
+    ) -> Optional[str]:
+        """
+        Cached answer for a similar question over the same context, or None
+        """
+        if not self.enabled:
+            return None
+
+        self._check_version(index_version)
+        query = _unit(embedding)
+        bucket = _bucket(language, chunk_ids)
+        now = time.time()
+
+        with self._lock:
+            best_key, best_score = None, self.threshold
+            expired = []
+
+            for key in self._buckets.get(bucket, ()):
+                entry = self._entries[key]
+                if now - entry["created_at"] > self.ttl_seconds:
+                    expired.append(key)
+                    continue
+                if entry["embedding"] is None:
+                    continue
+
+                score = float(np.dot(query, entry["embedding"]))
+                if score >= best_score:
+                    best_key, best_score = key, score
+
+            for key in expired:
+                self._drop(key)
+            self.expirations += len(expired)
+
+            if best_key is None:
+                self.misses += 1
+                answer = None
+            else:
+                self._entries.move_to_end(best_key)
+                self.hits += 1
+                answer = self._entries[best_key]["answer"]
+
+        self._delete_from_disk(expired)
+
+        if answer is not None:
+            logger.info(f"🗂️ Answer cache hit (cosine {best_score:.3f})")
+        return answer
+
+    def get_exact(
+        self,
+        question: str,
+        language: str,
+        chunk_ids: Sequence[int],
+        index_version: Optional[str]
+    ) -> Optional[str]:
+        """
+        Cached answer for the same normalized question over the same context
+        (no embedding needed), or None
+        """
+        if not self.enabled:
+            return None
+
+        self._check_version(index_version)
+        key = _key(_bucket(language, chunk_ids), question)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            expired = entry is not None and time.time() - entry["created_at"] > self.ttl_seconds
+            if expired:
+                self._drop(key)
+                self.expirations += 1
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                answer = None
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                answer = entry["answer"]
+
+        if expired:
+            self._delete_from_disk([key])
+
+        if answer is not None:
+            logger.info("🗂️ Answer cache hit (same question)")
+        return answer
+
+    def put(
+        self,
+        question: str,
+        embedding: Optional[np.ndarray],
+        language: str,
+        chunk_ids: Sequence[int],
+        index_version: Optional[str],
+        answer: str
+    ):
+        if not self.enabled:
+            return
+
+        self._check_version(index_version)
+        bucket = _bucket(language, chunk_ids)
+        key = _key(bucket, question)
+        entry = {
+            "bucket": bucket,
+            "embedding": _unit(embedding) if embedding is not None else None,
+            "answer": answer,
+            "created_at": time.time(),
+            "index_version": index_version
+        }
+
+        with self._lock:
+            evicted = self._store(key, entry)
+
+        self._delete_from_disk(evicted)
+        if self.disk is not None:
+            try:
+                self.disk.put(key, _encode(entry))
+            except Exception as e:
+                logger.warning(f"⚠️ Answer cache write failed: {e}")
+
+    def _store(self, key: str, entry: Dict[str, Any]) -> List[str]:
+        """Insert under the lock; returns the keys evicted to stay within maxsize"""
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = entry
+        self._buckets.setdefault(entry["bucket"], set()).add(key)
+
+        evicted = []
+        while len(self._entries) > self.maxsize:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            evicted.append(oldest)
+        self.evictions += len(evicted)
+        return evicted
+
+    def _drop(self, key: str):
+        entry = self._entries.pop(key)
+        keys = self._buckets[entry["bucket"]]
+        keys.discard(key)
+        if not keys:
+            del self._buckets[entry["bucket"]]
+
+    # ------------------------------------------------------------------
+    # 🔹 INVALIDATION
+    # ------------------------------------------------------------------
+    def _check_version(self, index_version: Optional[str]):
+        """Drop answers generated against any other index build"""
+        if index_version == self.index_version:
+            return
+
+        with self._lock:
+            if index_version == self.index_version:
+                return
+            stale = [k for k, e in self._entries.items() if e["index_version"] != index_version]
+            for key in stale:
+                self._drop(key)
+            self.index_version = index_version
+            self.invalidations += len(stale)
+
+        if stale:
+            logger.info(f"🗂️ Index changed ({index_version}) - dropped {len(stale)} cached answers")
+        self._delete_from_disk(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._buckets.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def close(self):
+        if self.disk is not None:
+            self.disk.close()
+            self.disk = None
+
+    # ------------------------------------------------------------------
+    # 🔹 PERSISTENCE
+    # ------------------------------------------------------------------
+    def _load(self):
+        now = time.time()
+        rows = []
+        stale = []
+        for key, raw in self.disk.items():
+            try:
+                entry = _decode(raw)
+            except (ValueError, KeyError):
+                stale.append(key)
+                continue
+            if now - entry["created_at"] > self.ttl_seconds:
+                stale.append(key)
+            else:
+                rows.append((key, entry))
+
+        # Oldest first, so the LRU order roughly follows insertion time
+        rows.sort(key=lambda row: row[1]["created_at"])
+        with self._lock:
+            for key, entry in rows:
+                stale.extend(self._store(key, entry))
+
+        self._delete_from_disk(stale)
+        logger.info(f"🗂️ Loaded {len(self._entries)} cached answers ({len(stale)} expired/evicted)")
+
+    def _delete_from_disk(self, keys: List[str]):
+        if self.disk is not None and keys:
+            try:
+                self.disk.delete_many(keys)
+            except Exception as e:
+                logger.warning(f"⚠️ Answer cache delete failed: {e}")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+                "threshold": self.threshold,
+                "ttl_seconds": self.ttl_seconds,
+                "index_version": self.index_version,
+                "persistent": self.disk is not None
+            }
+
+
+def _bucket(language: str, chunk_ids: Sequence[int]) -> str:
+    return f"{language}|{','.join(str(i) for i in sorted(chunk_ids))}"
+
+
+def _key(bucket: str, question: str) -> str:
+    return f"{bucket}|{hashlib.sha1(normalize_query_text(question).encode('utf-8')).hexdigest()}"
+
+
+def _unit(embedding: np.ndarray) -> np.ndarray:
+    embedding = np.asarray(embedding, dtype="float32")
+    return embedding / max(float(np.linalg.norm(embedding)), 1e-12)
+
+
+def _encode(entry: Dict[str, Any]) -> bytes:
+    embedding = entry["embedding"]
+    return json.dumps({
+        **entry,
+        "embedding": base64.b64encode(embedding.tobytes()).decode("ascii") if embedding is not None else None
+    }, ensure_ascii=False).encode("utf-8")
+
+
+def _decode(raw: bytes) -> Dict[str, Any]:
+    entry = json.loads(raw)
+    if entry["embedding"] is not None:
+        entry["embedding"] = np.frombuffer(base64.b64decode(entry["embedding"]), dtype="float32")
+    return entry
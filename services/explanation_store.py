@@ -0,0 +1,179 @@
+"""
+Explanation Store - Precomputed scheme / banking-term explanations
+Generated after each index build for every supported language and served
+by the explain routes and the bot without an LLM round trip
+"""
+
+import os
+import csv
+import json
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from loguru import logger
+
+from utils.language_utils import BANKING_TERMS, normalize_query_text
+
+
+# Languages explanations are generated in (RAGService language names)
+EXPLANATION_LANGUAGES = ("hindi", "english", "punjabi")
+
+SCHEMES_CSV = Path(__file__).resolve().parent.parent / "data" / "processed" / "schemes.csv"
+
+
+def known_schemes() -> List[Dict]:
+    """
+    Every scheme we can name: /loan/schemes plus data/processed/schemes.csv
+
+    Returns:
+        [{"name": canonical English name, "aliases": [...]}]
+    """
+    from services.loan_service import GOVERNMENT_SCHEMES
+
+    schemes: Dict[str, Dict] = {}
+
+    def add(name: str, aliases: List[str]):
+        key = normalize_query_text(name)
+        entry = schemes.setdefault(key, {"name": name, "aliases": []})
+        for alias in [name] + aliases:
+            if alias and alias not in entry["aliases"]:
+                entry["aliases"].append(alias)
+
+    for scheme in GOVERNMENT_SCHEMES:
+        aliases = [scheme["name"]]
+        # "प्रधानमंत्री मुद्रा योजना (PM MUDRA)" -> also "प्रधानमंत्री मुद्रा योजना" and "PM MUDRA"
+        match = re.match(r"^(.*?)\s*\((.+)\)\s*$", scheme["name"])
+        if match:
+            aliases.extend(match.groups())
+        add(scheme["name_english"], aliases)
+
+    if SCHEMES_CSV.exists():
+        with open(SCHEMES_CSV, encoding="utf-8", newline="") as f:
+            for row in csv.DictReader(f):
+                if row.get("scheme_name"):
+                    add(row["scheme_name"].strip(), [])
+
+    return list(schemes.values())
+
+
+def known_terms() -> List[Dict]:
+    """
+    Banking terms from utils.language_utils.BANKING_TERMS; the short gloss
+    ("ब्याज दर" for "interest rate") is an alias too
+    """
+    terms = []
+    for term, glosses in BANKING_TERMS.items():
+        aliases = [term] + [gloss.split("(")[0].strip() for gloss in glosses.values()]
+        terms.append({"name": term, "aliases": list(dict.fromkeys(aliases))})
+    return terms
+
+
+class ExplanationStore:
+    """
+    JSON file of explanations:
+
+        {
+          "schemes": {"Kisan Credit Card": {
+              "aliases": [...],
+              "explanations": {"hindi": {"text": "...", "index_version": "..."}, ...}
+          }},
+          "terms": {...}
+        }
+
+    Lookups match the canonical name or any alias after normalize_query_text,
+    so case, punctuation and Hinglish spelling do not matter.
+    """
+
+    KINDS = ("schemes", "terms")
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv("EXPLANATIONS_PATH", "data/processed/explanations.json")
+        self.data: Dict[str, Dict] = {kind: {} for kind in self.KINDS}
+        self.updated_at = None
+        self._aliases: Dict[str, Dict[str, str]] = {kind: {} for kind in self.KINDS}
+        self.hits = 0
+        self.misses = 0
+        self.load()
+
+    # ------------------------------------------------------------------
+    # 🔹 LOAD / SAVE
+    # ------------------------------------------------------------------
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Ignoring unreadable explanations file: {e}")
+            return
+
+        self.updated_at = data.get("updated_at")
+        for kind in self.KINDS:
+            self.data[kind] = data.get(kind, {})
+            for name, entry in self.data[kind].items():
+                self._index_aliases(kind, name, entry.get("aliases", []))
+
+        logger.info(
+            f"📖 Loaded precomputed explanations: {len(self.data['schemes'])} schemes, "
+            f"{len(self.data['terms'])} terms"
+        )
+
+    def save(self):
+        self.updated_at = datetime.now().isoformat(timespec="seconds")
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"updated_at": self.updated_at, **self.data}, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def _index_aliases(self, kind: str, name: str, aliases: List[str]):
+        for alias in [name] + aliases:
+            key = normalize_query_text(alias)
+            if key:
+                self._aliases[kind].setdefault(key, name)
+
+    # ------------------------------------------------------------------
+    # 🔹 LOOKUP / STORE
+    # ------------------------------------------------------------------
+    def get(self, kind: str, name: str, language: str) -> Optional[str]:
+        canonical = self._aliases[kind].get(normalize_query_text(name))
+        entry = self.data[kind].get(canonical, {}).get("explanations", {}).get(language)
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entry["text"]
+
+    def is_fresh(self, kind: str, name: str, language: str, index_version: Optional[str]) -> bool:
+        """Already generated against this index build"""
+        entry = self.data[kind].get(name, {}).get("explanations", {}).get(language)
+        return entry is not None and entry.get("index_version") == index_version
+
+    def set(self, kind: str, item: Dict, language: str, text: str, index_version: Optional[str]):
+        entry = self.data[kind].setdefault(item["name"], {"aliases": [], "explanations": {}})
+        entry["aliases"] = item["aliases"]
+        entry["explanations"][language] = {"text": text, "index_version": index_version}
+        self._index_aliases(kind, item["name"], item["aliases"])
+
+    def stats(self) -> Dict:
+        """Explanations stored per kind (across languages) and lookup counters"""
+        stats = {
+            kind: sum(len(e.get("explanations", {})) for e in self.data[kind].values())
+            for kind in self.KINDS
+        }
+        stats.update({
+            "hits": self.hits,
+            "misses": self.misses,
+            "updated_at": self.updated_at
+        })
+        return stats
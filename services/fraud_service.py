@@ -3,12 +3,16 @@ Fraud Detection Service - Detects fake loan schemes
 """
 
 from pathlib import Path
-import joblib
 import re
 from typing import Dict, List
 from loguru import logger
 import numpy as np  # ✅ ADD THIS
 
+from utils.executors import run_model
+from utils.lazy_import import lazy_import
+
+joblib = lazy_import("joblib")
+
 
 class FraudService:
     """
@@ -63,8 +67,8 @@ class FraudService:
             return
 
         try:
-            self.model = joblib.load(model_path)
-            self.vectorizer = joblib.load(vectorizer_path)
+            self.model = joblib.load(model_path, mmap_mode="r")
+            self.vectorizer = joblib.load(vectorizer_path, mmap_mode="r")
             logger.success("✅ Fraud detection model loaded")
 
         except Exception as e:
@@ -115,6 +119,10 @@ class FraudService:
             "verified": is_verified
         }
 
+    async def detect_fraud_async(self, scheme_data: Dict) -> Dict:
+        """detect_fraud() on the model pool, off the event loop"""
+        return await run_model(self.detect_fraud, scheme_data)
+
     def _is_verified_scheme(self, scheme_name: str) -> bool:
         """Check if scheme is government verified"""
         return any(v in scheme_name for v in self.verified_schemes)
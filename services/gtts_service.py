@@ -7,6 +7,8 @@ import os
 import uuid
 from loguru import logger
 
+from utils.executors import run_io
+
 
 class GTTsService:
     """Text-to-Speech using Google TTS"""
@@ -43,6 +45,10 @@ class GTTsService:
         except Exception as e:
             logger.error(f"❌ TTS generation failed: {e}")
             raise
+
+    async def text_to_speech_async(self, text: str, lang: str = "hi") -> str:
+        """text_to_speech() on the I/O pool (gTTS makes blocking HTTP calls)"""
+        return await run_io(self.text_to_speech, text, lang)
     
     def cleanup_old_files(self, max_age_hours: int = 24):
         """
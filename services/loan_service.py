@@ -1,10 +1,88 @@
 from pathlib import Path
 from typing import Dict
-import joblib
-import numpy as np
-import pandas as pd
 from loguru import logger
 
+from utils.executors import run_model
+from utils.lazy_import import lazy_import
+
+# /loan/schemes only needs GOVERNMENT_SCHEMES - load pandas / joblib with the model
+joblib = lazy_import("joblib")
+pd = lazy_import("pandas")
+
+
+# Verified loan schemes served by /loan/schemes (explanations are precomputed for these)
+GOVERNMENT_SCHEMES = [
+    {
+        "name": "प्रधानमंत्री मुद्रा योजना (PM MUDRA)",
+        "name_english": "Pradhan Mantri MUDRA Yojana",
+        "max_amount": 1000000,
+        "purpose": "Business/Micro Enterprises",
+        "interest_rate": "8-12%",
+        "features": [
+            "No collateral required for loans up to ₹10 lakh",
+            "Three categories: Shishu (up to ₹50,000), Kishore (₹50,000-₹5 lakh), Tarun (₹5-₹10 lakh)"
+        ],
+        "verified": True,
+        "website": "https://www.mudra.org.in"
+    },
+    {
+        "name": "किसान क्रेडिट कार्ड (KCC)",
+        "name_english": "Kisan Credit Card",
+        "max_amount": 300000,
+        "purpose": "Agriculture/Farming",
+        "interest_rate": "4-7% (subsidized)",
+        "features": [
+            "Interest subvention of 2%",
+            "Additional 3% incentive for timely repayment",
+            "Effective rate: 4% per annum"
+        ],
+        "verified": True,
+        "website": "https://pmkisan.gov.in"
+    },
+    {
+        "name": "Stand Up India",
+        "name_english": "Stand Up India",
+        "max_amount": 10000000,
+        "purpose": "SC/ST/Women entrepreneurs",
+        "interest_rate": "Base rate + margin (typically 9-12%)",
+        "features": [
+            "For setting up greenfield enterprises",
+            "Manufacturing, services, or trading sector",
+            "Repayment period: 7 years with moratorium"
+        ],
+        "verified": True,
+        "website": "https://www.standupmitra.in"
+    },
+    {
+        "name": "PM-KISAN योजना",
+        "name_english": "PM-KISAN Scheme",
+        "max_amount": 6000,
+        "purpose": "Direct income support to farmers",
+        "interest_rate": "N/A (Direct Benefit Transfer)",
+        "features": [
+            "₹6,000 per year in 3 installments",
+            "Direct to bank account",
+            "For all landholding farmers"
+        ],
+        "verified": True,
+        "website": "https://pmkisan.gov.in"
+    },
+    {
+        "name": "प्रधानमंत्री आवास योजना (PMAY)",
+        "name_english": "Pradhan Mantri Awas Yojana",
+        "max_amount": 1200000,
+        "purpose": "Home loan subsidy",
+        "interest_rate": "Interest subsidy up to 2.67 lakh",
+        "features": [
+            "For EWS, LIG, and MIG categories",
+            "Credit-linked subsidy on home loans",
+            "Repayment period: up to 20 years"
+        ],
+        "verified": True,
+        "website": "https://pmaymis.gov.in"
+    }
+]
+
 
 class LoanService:
     """Loan eligibility prediction service"""
@@ -18,7 +96,8 @@ class LoanService:
     def _load_model(self):
         try:
             model_path = self.model_dir / "loan_eligibility_model.pkl"
-            self.model = joblib.load(model_path)
+            # mmap: model arrays stay file-backed and shared between preloaded workers
+            self.model = joblib.load(model_path, mmap_mode="r")
             logger.success("✅ Loan model loaded")
             if hasattr(self.model, "feature_names_in_"):
                 logger.info(f"📋 Model expects features: {list(self.model.feature_names_in_)}")
@@ -66,7 +145,11 @@ class LoanService:
             logger.exception(f"❌ Error: {e}")
             return self._error_response("आंतरिक त्रुटि")
 
-    def _prepare_features(self, user_data: Dict) -> pd.DataFrame:
+    async def predict_eligibility_async(self, user_data: Dict) -> Dict:
+        """predict_eligibility() on the model pool, off the event loop"""
+        return await run_model(self.predict_eligibility, user_data)
+
+    def _prepare_features(self, user_data: Dict) -> "pd.DataFrame":
         dependents = int(user_data.get("no_of_dependents", 0))
 
         education_raw = str(user_data.get("education", "Graduate")).lower()
@@ -2,25 +2,39 @@
 OCR Service - Extract text from PDFs and images
 """
 
-import pdfplumber
-import easyocr
-from PIL import Image
 from typing import Optional
 from loguru import logger
-import io
+
+from utils.executors import run_ocr
+from utils.lazy_import import lazy_import
+
+# EasyOCR pulls in torch; both load on first use (normally in the OCR worker)
+pdfplumber = lazy_import("pdfplumber")
+easyocr = lazy_import("easyocr")
 
 
 class OCRService:
     """Extract text from documents using OCR"""
     
     def __init__(self):
-        """Initialize EasyOCR reader for English and Hindi"""
-        try:
-            self.reader = easyocr.Reader(['en', 'hi'], gpu=False)
-            logger.success("✅ OCR Service initialized (en, hi)")
-        except Exception as e:
-            logger.error(f"❌ Failed to initialize OCR: {e}")
-            self.reader = None
+        """
+        The EasyOCR reader (English + Hindi) is created on the first image.
+        Request handlers use extract_text_async(), which runs in the OCR
+        worker process, so the serving process never needs to load it.
+        """
+        self.reader = None
+        self._reader_loaded = False
+
+    def _get_reader(self):
+        if not self._reader_loaded:
+            self._reader_loaded = True
+            try:
+                self.reader = easyocr.Reader(['en', 'hi'], gpu=False)
+                logger.success("✅ OCR Service initialized (en, hi)")
+            except Exception as e:
+                logger.error(f"❌ Failed to initialize OCR: {e}")
+                self.reader = None
+        return self.reader
     
     def extract_from_pdf(self, file_path: str) -> str:
         """
@@ -57,11 +71,12 @@ class OCRService:
         Returns:
             Extracted text
         """
-        if not self.reader:
+        reader = self._get_reader()
+        if not reader:
             raise Exception("OCR reader not initialized")
         
         try:
-            result = self.reader.readtext(file_path)
+            result = reader.readtext(file_path)
             text = " ".join([detection[1] for detection in result])
             
             logger.info(f"Extracted {len(text)} chars from image")
@@ -89,4 +104,20 @@ class OCRService:
         elif file_type in ['jpg', 'jpeg', 'png', 'webp', 'bmp']:
             return self.extract_from_image(file_path)
         else:
-            raise ValueError(f"Unsupported file type: {file_type}")
\ No newline at end of file
+            raise ValueError(f"Unsupported file type: {file_type}")
+
+    def memory_usage(self) -> dict:
+        return {"reader_loaded": self.reader is not None}
+
+    async def extract_text_async(self, file_path: str, file_type: str) -> str:
+        """
+        extract_text() in the OCR process pool - EasyOCR and pdfplumber are
+        CPU-bound and hold the GIL, so a thread would still stall the loop
+        """
+        return await run_ocr(_extract_text_in_worker, file_path, file_type)
+
+
+def _extract_text_in_worker(file_path: str, file_type: str) -> str:
+    # The worker's own registry keeps one OCRService (and EasyOCR reader) per process
+    from services.registry import get_service
+    return get_service("ocr").extract_text(file_path, file_type)
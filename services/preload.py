@@ -0,0 +1,95 @@
+"""
+Preload - Load immutable models and indexes once, before gunicorn forks
+Workers inherit the embedding model and sklearn models copy-on-write and
+share the mmap-backed FAISS index / chunk store through the page cache, so
+N workers cost roughly one copy instead of N (see gunicorn.conf.py)
+"""
+
+import gc
+import os
+import sys
+from typing import List, Optional
+
+from loguru import logger
+
+from services.registry import registry
+
+
+# PRELOAD_SERVICES: what the master loads before forking. OCR is left out on
+# purpose - EasyOCR runs in each worker's spawned OCR process, which cannot
+# inherit anything from the master.
+DEFAULT_PRELOAD = "rag,loan,fraud"
+
+THREAD_ENV_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS")
+
+
+def _set_torch_threads(threads: int):
+    # Only if torch is already loaded - importing it here would defeat lazy startup
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        torch.set_num_threads(threads)
+
+
+def preload_services(names: Optional[List[str]] = None) -> List[str]:
+    """
+    Build the services and load their models / indexes in this process.
+    Call in the gunicorn master after the app is imported, before forking.
+
+    Returns:
+        The services that were preloaded
+    """
+    if names is None:
+        names = [n.strip() for n in os.getenv("PRELOAD_SERVICES", DEFAULT_PRELOAD).split(",") if n.strip()]
+    names = list(names)
+
+    backend = os.getenv("EMBEDDING_BACKEND", "torch").lower()
+    if "rag" in names and backend != "torch":
+        # ONNX Runtime starts its thread pool when the session is created and
+        # those threads do not survive fork - let each worker warm up instead
+        logger.warning(f"⚠️ Not preloading rag with EMBEDDING_BACKEND={backend} (not fork-safe)")
+        names.remove("rag")
+
+    # One intra-op thread in the master: an OpenMP pool started before fork
+    # can hang the workers. configure_worker() raises it again after fork.
+    for var in THREAD_ENV_VARS:
+        os.environ.setdefault(var, "1")
+
+    registry.preload(*names)
+    _set_torch_threads(1)
+
+    # Keep the GC from touching (and so copying) every preloaded object's page
+    gc.collect()
+    gc.freeze()
+
+    logger.info(f"📦 Preloaded before fork: {', '.join(names) or 'nothing'} ({gc.get_freeze_count()} objects frozen)")
+    return names
+
+
+def threads_per_worker(workers: int) -> int:
+    """TORCH_THREADS_PER_WORKER, else the cores split evenly between workers"""
+    configured = os.getenv("TORCH_THREADS_PER_WORKER")
+    if configured:
+        return max(1, int(configured))
+    return max(1, (os.cpu_count() or 1) // max(1, workers))
+
+
+def configure_worker(workers: int) -> int:
+    """
+    Per-worker setup right after fork: cap torch / BLAS threads so N workers
+    do not oversubscribe the CPU, and drop database connections inherited
+    from the master (SQLAlchemy pools must not be shared across fork)
+
+    Returns:
+        The thread count this worker uses
+    """
+    threads = threads_per_worker(workers)
+    for var in THREAD_ENV_VARS:
+        os.environ[var] = str(threads)
+    _set_torch_threads(threads)
+
+    from database.db import engine
+    from database.db_manager import db_manager
+    for db_engine in (engine, db_manager.engine):
+        db_engine.dispose(close=False)
+
+    return threads
@@ -3,30 +3,149 @@ RAG Service - High-level service combining RAG + LLM
 WITH MULTI-LANGUAGE SUPPORT
 """
 
-from typing import Dict
+import os
+import time
+import asyncio
+import threading
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
 from loguru import logger
 
 from rag.rag_pipeline import RAGPipeline
-from utils.llm_client import LLMClient
+from utils.llm_client import LLMStreamError, get_llm
+from utils.language_utils import detect_script_language, normalize_query_text
+from utils.single_flight import SingleFlight
+from utils.rate_limiter import RateLimiter
+from utils.executors import run_io, run_model
+from services.answer_cache import AnswerCache
+from services.explanation_store import (
+    ExplanationStore, EXPLANATION_LANGUAGES, known_schemes, known_terms
+)
 
 
 class RAGService:
     """Service for RAG-based question answering"""
 
+    LANGUAGE_MAP = {
+        'en': 'english',
+        'hi': 'hindi',
+        'pa': 'punjabi',
+        'ml': 'malayalam',
+        'ta': 'tamil',
+        'english': 'english',
+        'hindi': 'hindi',
+        'punjabi': 'punjabi',
+        'hi-latn': 'hindi'  # romanized Hindi (Hinglish)
+    }
+
     def __init__(self):
-        self.rag_pipeline = RAGPipeline()
-        self.llm_client = LLMClient()
+        # Created by warm-up: loading the embedding model is part of getting ready
+        self.rag_pipeline: Optional[RAGPipeline] = None
+        self.llm_client = get_llm()  # shared with pdf_routes: one connection pool per process
+        self.answer_cache = AnswerCache()
+        self.explanations = ExplanationStore()
+        self.inflight_answers = SingleFlight("rag_answer")
+        self.inflight_streams = SingleFlight("rag_stream")
         self._initialized = False
+        self._init_lock = threading.Lock()
+        self._warmup_thread: Optional[threading.Thread] = None
+        self._warmup_thread_lock = threading.Lock()
+        self.warmup = {"status": "cold", "stage": None, "started_at": None, "ready_at": None, "error": None}
 
         logger.info("🧠 RAGService created (lazy initialization)")
 
+    # ------------------------------------------------------------------
+    # 🔹 WARM-UP
+    # ------------------------------------------------------------------
     def _ensure_initialized(self):
-        """Build index only once"""
-        if not self._initialized:
-            logger.info("🔄 Building RAG index...")
-            self.rag_pipeline.build_index()
+        """
+        Load the embedding model and load/build the index - exactly once,
+        however many threads ask at the same time. Blocks until ready;
+        request handlers use start_warmup() / is_ready instead.
+        """
+        if self._initialized:
+            return
+
+        with self._init_lock:
+            if self._initialized:
+                return
+
+            started = time.perf_counter()
+            self.warmup.update(
+                status="warming", stage="loading_model", error=None,
+                started_at=datetime.now().isoformat(timespec="seconds")
+            )
+            try:
+                logger.info("🔄 Loading embedding model...")
+                pipeline = RAGPipeline()
+                self.rag_pipeline = pipeline
+
+                self.warmup["stage"] = "loading_index"
+                logger.info("🔄 Building RAG index...")
+                pipeline.build_index()
+            except Exception as e:
+                self.warmup.update(status="failed", error=str(e))
+                logger.error(f"❌ RAG warm-up failed: {e}")
+                raise
+
             self._initialized = True
-            logger.info("✅ RAG index ready")
+            self.warmup.update(
+                status="ready", stage=None,
+                ready_at=datetime.now().isoformat(timespec="seconds")
+            )
+            logger.info(f"✅ RAG index ready ({time.perf_counter() - started:.1f}s)")
+
+    def preload(self):
+        """
+        Warm up synchronously, in the calling thread. For a gunicorn master
+        that loads the model and index before forking its workers.
+        """
+        self._ensure_initialized()
+
+    def start_warmup(self) -> bool:
+        """
+        Warm up in a background thread (call at startup). No-op when ready or
+        already warming; retries after a failed warm-up.
+
+        Returns:
+            True if a warm-up thread is running
+        """
+        if self._initialized:
+            return False
+
+        with self._warmup_thread_lock:
+            if self._warmup_thread is None or not self._warmup_thread.is_alive():
+                self._warmup_thread = threading.Thread(
+                    target=self._warmup_in_background, name="rag-warmup", daemon=True
+                )
+                self._warmup_thread.start()
+        return True
+
+    def _warmup_in_background(self):
+        try:
+            self._ensure_initialized()
+        except Exception:
+            pass  # recorded in self.warmup; the next request retries
+
+    @property
+    def is_ready(self) -> bool:
+        return self._initialized
+
+    def _warming_up(self) -> bool:
+        """True (and warm-up kicked off) while the model / index are still loading"""
+        if self._initialized:
+            return False
+        self.start_warmup()
+        return True
+
+    def warmup_status(self) -> Dict:
+        """Readiness + progress, for /ready"""
+        status = {"ready": self._initialized, **self.warmup}
+        if self.warmup["stage"] == "loading_index" and self.rag_pipeline is not None:
+            status["progress"] = dict(self.rag_pipeline.build_progress)
+        return status
 
     def answer_question(
         self,
@@ -45,55 +164,315 @@ class RAGService:
         Returns:
             Dict with answer, sources, context
         """
-        try:
-            self._ensure_initialized()
+        # Never build the index on a request thread - answer "warming up" instead
+        if self._warming_up():
+            return self._warming_up_response(self._normalize_language(language, question))
 
+        try:
             # Normalize language code
-            lang_normalized = self._normalize_language(language)
+            lang_normalized = self._normalize_language(language, question)
 
-            rag_result = self.rag_pipeline.query(question, language=lang_normalized)
+            rag_result = self._retrieve(question, lang_normalized)
 
             if not rag_result.get('context'):
                 return self._no_context_response(lang_normalized)
 
-            answer = self.llm_client.generate(
-                rag_result['prompt'],
-                max_tokens=400,
-                temperature=0.3
-            )
+            answer = self._generate_answer(question, lang_normalized, rag_result)
+            return self._answer_response(answer, rag_result, lang_normalized, include_sources)
+
+        except Exception as e:
+            logger.error(f"❌ RAG service error: {e}")
+            return self._error_response(language)
+
+    async def answer_question_async(
+        self,
+        question: str,
+        language: str = "hindi",
+        include_sources: bool = True
+    ) -> Dict:
+        """
+        answer_question() for async routes / bot handlers: retrieval runs on
+        the model pool and the LLM call awaits the async Groq client, so the
+        event loop is never blocked.
+
+        Identical questions already in flight are coalesced: they await the
+        first caller's answer instead of embedding, searching and calling
+        the LLM again. Until warm-up finishes the answer is a short
+        "warming up" message rather than a wait.
+        """
+        if self._warming_up():
+            return self._warming_up_response(self._normalize_language(language, question))
+
+        key = self._inflight_key(question, language, include_sources)
+        return await self.inflight_answers.do(
+            key, lambda: self._answer_question_async(question, language, include_sources)
+        )
 
-            avg_score = sum(
-                c['score'] for c in rag_result['retrieved_chunks']
-            ) / len(rag_result['retrieved_chunks'])
+    async def _answer_question_async(self, question: str, language: str, include_sources: bool) -> Dict:
+        try:
+            lang_normalized = self._normalize_language(language, question)
+
+            rag_result = await self._retrieve_async(question, lang_normalized)
 
-            if include_sources and rag_result.get('sources'):
-                source_text = self._format_sources(rag_result['sources'], lang_normalized)
-                answer += f"\n\n{source_text}"
+            if not rag_result.get('context'):
+                return self._no_context_response(lang_normalized)
 
-            return {
-                'answer': answer,
-                'sources': rag_result['sources'],
-                'context_used': rag_result['context'][:500],
-                'confidence': round(float(avg_score), 2)
-            }
+            answer = await self._generate_answer_async(question, lang_normalized, rag_result)
+            return self._answer_response(answer, rag_result, lang_normalized, include_sources)
 
         except Exception as e:
             logger.error(f"❌ RAG service error: {e}")
             return self._error_response(language)
 
-    def _normalize_language(self, lang: str) -> str:
-        """Normalize language code"""
-        lang_map = {
-            'en': 'english',
-            'hi': 'hindi',
-            'pa': 'punjabi',
-            'ml': 'malayalam',
-            'ta': 'tamil',
-            'english': 'english',
-            'hindi': 'hindi',
-            'punjabi': 'punjabi'
+    async def stream_answer_async(
+        self,
+        question: str,
+        language: str = "hindi",
+        include_sources: bool = True
+    ) -> AsyncIterator[str]:
+        """
+        answer_question_async() as a stream of text pieces, so the first words
+        reach the user at the LLM's time-to-first-token. Cached answers and
+        fallback messages arrive as a single piece.
+
+        Coalesced like answer_question_async(): a user asking while the same
+        answer is streaming gets the pieces produced so far, then the rest.
+        """
+        if self._warming_up():
+            yield self._warming_up_response(self._normalize_language(language, question))['answer']
+            return
+
+        key = self._inflight_key(question, language, include_sources)
+        async for piece in self.inflight_streams.stream(
+            key, lambda: self._stream_answer_async(question, language, include_sources)
+        ):
+            yield piece
+
+    async def _stream_answer_async(self, question: str, language: str, include_sources: bool) -> AsyncIterator[str]:
+        lang_normalized = self._normalize_language(language, question)
+
+        try:
+            rag_result = await self._retrieve_async(question, lang_normalized)
+        except Exception as e:
+            logger.error(f"❌ RAG service error: {e}")
+            yield self._error_response(language)['answer']
+            return
+
+        if not rag_result.get('context'):
+            yield self._no_context_response(lang_normalized)['answer']
+            return
+
+        # The answer cache reads and writes SQLite - keep it off the event loop
+        cached, embedding = await run_io(self._cached_answer, question, lang_normalized, rag_result)
+        if cached is not None:
+            yield cached
+        else:
+            pieces = []
+            try:
+                async for piece in self.llm_client.astream(
+                    rag_result['prompt'],
+                    max_tokens=400,
+                    temperature=0.3
+                ):
+                    pieces.append(piece)
+                    yield piece
+            except LLMStreamError:
+                # Keep the partial answer on screen, but never cache it
+                yield f"\n\n{self._error_response(language)['answer']}"
+                return
+
+            await run_io(self._store_answer, question, lang_normalized, rag_result, embedding, "".join(pieces))
+
+        if include_sources and rag_result.get('sources'):
+            yield f"\n\n{self._format_sources(rag_result['sources'], lang_normalized)}"
+
+    def answer_questions(
+        self,
+        questions: List[str],
+        language: str = "hindi",
+        include_sources: bool = True
+    ) -> List[Dict]:
+        """
+        Answer many questions with one batched retrieval
+        (one embedding call + one index search), then one LLM call each
+
+        Returns:
+            List of dicts shaped like answer_question(), in input order
+        """
+        if self._warming_up():
+            return [self._warming_up_response(self._normalize_language(language, " ".join(questions))) for _ in questions]
+
+        try:
+            lang_normalized = self._normalize_language(language, " ".join(questions))
+            rag_results = self._retrieve_many(questions, lang_normalized)
+
+        except Exception as e:
+            logger.error(f"❌ RAG batch retrieval error: {e}")
+            return [self._error_response(language) for _ in questions]
+
+        answers = []
+        for question, rag_result in zip(questions, rag_results):
+            try:
+                if not rag_result.get('context'):
+                    answers.append(self._no_context_response(lang_normalized))
+                    continue
+
+                answer = self._generate_answer(question, lang_normalized, rag_result)
+                answers.append(self._answer_response(answer, rag_result, lang_normalized, include_sources))
+
+            except Exception as e:
+                logger.error(f"❌ RAG service error: {e}")
+                answers.append(self._error_response(language))
+
+        return answers
+
+    async def answer_questions_async(
+        self,
+        questions: List[str],
+        language: str = "hindi",
+        include_sources: bool = True
+    ) -> List[Dict]:
+        """
+        answer_questions() with the LLM calls issued concurrently
+        (the shared rate limiter still paces them)
+        """
+        if self._warming_up():
+            return [self._warming_up_response(self._normalize_language(language, " ".join(questions))) for _ in questions]
+
+        try:
+            lang_normalized = self._normalize_language(language, " ".join(questions))
+            rag_results = await run_model(self._retrieve_many, questions, lang_normalized)
+
+        except Exception as e:
+            logger.error(f"❌ RAG batch retrieval error: {e}")
+            return [self._error_response(language) for _ in questions]
+
+        async def answer(question: str, rag_result: Dict) -> Dict:
+            try:
+                if not rag_result.get('context'):
+                    return self._no_context_response(lang_normalized)
+
+                text = await self._generate_answer_async(question, lang_normalized, rag_result)
+                return self._answer_response(text, rag_result, lang_normalized, include_sources)
+
+            except Exception as e:
+                logger.error(f"❌ RAG service error: {e}")
+                return self._error_response(language)
+
+        return list(await asyncio.gather(*(
+            answer(question, rag_result) for question, rag_result in zip(questions, rag_results)
+        )))
+
+    def _retrieve(self, question: str, language: str) -> Dict:
+        self._ensure_initialized()
+        return self.rag_pipeline.query(question, language=language)
+
+    async def _retrieve_async(self, question: str, language: str) -> Dict:
+        # Callers checked _warming_up() first, so the pipeline is loaded
+        return await self.rag_pipeline.aquery(question, language=language)
+
+    def _retrieve_many(self, questions: List[str], language: str) -> List[Dict]:
+        self._ensure_initialized()
+        return self.rag_pipeline.query_many(questions, language=language)
+
+    def _answer_response(self, answer: str, rag_result: Dict, language: str, include_sources: bool) -> Dict:
+        avg_score = rag_result['retrieval'].avg_score
+
+        if include_sources and rag_result.get('sources'):
+            source_text = self._format_sources(rag_result['sources'], language)
+            answer += f"\n\n{source_text}"
+
+        return {
+            'answer': answer,
+            'sources': rag_result['sources'],
+            'context_used': rag_result['context'][:500],
+            # None: keyword-only retrieval, no similarity to report
+            'confidence': round(float(avg_score), 2) if avg_score is not None else None
         }
-        return lang_map.get(lang.lower(), 'hindi')
+
+    def _generate_answer(self, question: str, language: str, rag_result: Dict) -> str:
+        """
+        LLM answer for the retrieved context; a near-duplicate question over
+        the same chunks (same language, same index build) is served from the
+        answer cache instead of calling Groq again
+        """
+        cached, embedding = self._cached_answer(question, language, rag_result)
+        if cached is not None:
+            return cached
+
+        answer = self.llm_client.generate_with_retry(
+            rag_result['prompt'],
+            max_tokens=400,
+            temperature=0.3
+        )
+
+        self._store_answer(question, language, rag_result, embedding, answer)
+        return answer
+
+    async def _generate_answer_async(self, question: str, language: str, rag_result: Dict) -> str:
+        # The answer cache reads and writes SQLite - keep it off the event loop
+        cached, embedding = await run_io(self._cached_answer, question, language, rag_result)
+        if cached is not None:
+            return cached
+
+        answer = await self.llm_client.agenerate_with_retry(
+            rag_result['prompt'],
+            max_tokens=400,
+            temperature=0.3
+        )
+
+        await run_io(self._store_answer, question, language, rag_result, embedding, answer)
+        return answer
+
+    def _cached_answer(self, question: str, language: str, rag_result: Dict) -> Tuple[Optional[str], Optional[np.ndarray]]:
+        """(cached answer or None, question embedding for storing the new answer)"""
+        if not self.answer_cache.enabled:
+            return None, None
+
+        retrieval = rag_result['retrieval']
+        # The lexical fast path never embeds the question - match it exactly instead
+        if retrieval.embedding is None:
+            cached = self.answer_cache.get_exact(
+                question, language, retrieval.chunk_ids, self.rag_pipeline.index_version
+            )
+            return cached, None
+
+        cached = self.answer_cache.get(
+            retrieval.embedding,
+            language,
+            retrieval.chunk_ids,
+            self.rag_pipeline.index_version
+        )
+        return cached, retrieval.embedding
+
+    def _store_answer(
+        self,
+        question: str,
+        language: str,
+        rag_result: Dict,
+        embedding: Optional[np.ndarray],
+        answer: str
+    ):
+        if self.llm_client.is_fallback(answer):
+            return
+
+        self.answer_cache.put(
+            question,
+            embedding,
+            language,
+            rag_result['retrieval'].chunk_ids,
+            self.rag_pipeline.index_version,
+            answer
+        )
+
+    def _inflight_key(self, question: str, language: str, include_sources: bool) -> Tuple:
+        return (normalize_query_text(question), self._normalize_language(language, question), include_sources)
+
+    def _normalize_language(self, lang: str, text: str = "") -> str:
+        """Normalize language code ('auto': detected from the script of `text`)"""
+        if lang.lower() == 'auto':
+            lang = detect_script_language(text, default='hi')
+        return self.LANGUAGE_MAP.get(lang.lower(), 'hindi')
 
     def _format_sources(self, sources: list, language: str) -> str:
         """Format source citations in user's language"""
@@ -123,6 +502,21 @@ class RAGService:
             'confidence': 0.0
         }
 
+    def _warming_up_response(self, language: str) -> Dict:
+        """Returned instead of blocking while the index is still loading"""
+        messages = {
+            'english': "⏳ The assistant is still starting up. Please ask again in a minute.",
+            'hindi': "⏳ सहायक अभी शुरू हो रहा है। कृपया एक मिनट बाद फिर से पूछें।",
+            'punjabi': "⏳ ਸਹਾਇਕ ਹਾਲੇ ਸ਼ੁਰੂ ਹੋ ਰਿਹਾ ਹੈ। ਕਿਰਪਾ ਕਰਕੇ ਇੱਕ ਮਿੰਟ ਬਾਅਦ ਦੁਬਾਰਾ ਪੁੱਛੋ।"
+        }
+
+        return {
+            'answer': messages.get(language, messages['hindi']),
+            'sources': [],
+            'context_used': '',
+            'confidence': 0.0
+        }
+
     def _error_response(self, language: str) -> Dict:
         """Error response"""
         messages = {
@@ -138,34 +532,199 @@ class RAGService:
             'confidence': 0.0
         }
 
-    def explain_scheme(self, scheme_name: str) -> str:
-        """Explain a government scheme"""
+    def explain_scheme(self, scheme_name: str, language: str = "hindi") -> str:
+        """Explain a government scheme (precomputed if it is a known scheme)"""
         try:
-            self._ensure_initialized()
-            prompt = self.rag_pipeline.explain_scheme(scheme_name)
-            return self.llm_client.generate(prompt, max_tokens=600)
+            lang_normalized = self._normalize_language(language, scheme_name)
+            precomputed = self.explanations.get("schemes", scheme_name, lang_normalized)
+            if precomputed:
+                return precomputed
+            if self._warming_up():
+                return self._warming_up_response(lang_normalized)['answer']
+
+            prompt = self._explain_prompt("schemes", scheme_name, lang_normalized)
+            return self.llm_client.generate_with_retry(prompt, max_tokens=600)
         except Exception as e:
             logger.error(f"Error explaining scheme: {e}")
             return "क्षमा करें, योजना की जानकारी नहीं मिली।"
 
-    def explain_term(self, term: str) -> str:
-        """Explain a banking/financial term"""
+    async def explain_scheme_async(self, scheme_name: str, language: str = "hindi") -> str:
         try:
-            self._ensure_initialized()
-            prompt = self.rag_pipeline.explain_term(term)
-            return self.llm_client.generate(prompt, max_tokens=300)
+            lang_normalized = self._normalize_language(language, scheme_name)
+            precomputed = self.explanations.get("schemes", scheme_name, lang_normalized)
+            if precomputed:
+                return precomputed
+            if self._warming_up():
+                return self._warming_up_response(lang_normalized)['answer']
+
+            prompt = await run_model(self._explain_prompt, "schemes", scheme_name, lang_normalized)
+            return await self.llm_client.agenerate_with_retry(prompt, max_tokens=600)
+        except Exception as e:
+            logger.error(f"Error explaining scheme: {e}")
+            return "क्षमा करें, योजना की जानकारी नहीं मिली।"
+
+    def explain_term(self, term: str, language: str = "hindi") -> str:
+        """Explain a banking/financial term (precomputed if it is a known term)"""
+        try:
+            lang_normalized = self._normalize_language(language, term)
+            precomputed = self.explanations.get("terms", term, lang_normalized)
+            if precomputed:
+                return precomputed
+            if self._warming_up():
+                return self._warming_up_response(lang_normalized)['answer']
+
+            prompt = self._explain_prompt("terms", term, lang_normalized)
+            return self.llm_client.generate_with_retry(prompt, max_tokens=300)
         except Exception as e:
             logger.error(f"Error explaining term: {e}")
             return "क्षमा करें, शब्द का अर्थ नहीं मिला।"
 
+    async def explain_term_async(self, term: str, language: str = "hindi") -> str:
+        try:
+            lang_normalized = self._normalize_language(language, term)
+            precomputed = self.explanations.get("terms", term, lang_normalized)
+            if precomputed:
+                return precomputed
+            if self._warming_up():
+                return self._warming_up_response(lang_normalized)['answer']
+
+            prompt = await run_model(self._explain_prompt, "terms", term, lang_normalized)
+            return await self.llm_client.agenerate_with_retry(prompt, max_tokens=300)
+        except Exception as e:
+            logger.error(f"Error explaining term: {e}")
+            return "क्षमा करें, शब्द का अर्थ नहीं मिला।"
+
+    def _explain_prompt(self, kind: str, name: str, language: str) -> str:
+        self._ensure_initialized()
+        if kind == "schemes":
+            return self.rag_pipeline.explain_scheme(name, language=language)
+        return self.rag_pipeline.explain_term(name, language=language)
+
+    def lookup_explanation(self, text: str, language: str) -> Optional[str]:
+        """
+        Precomputed explanation when the whole message is a known scheme or
+        term name ("KCC", "ब्याज दर"), else None. Never calls the LLM.
+        """
+        # No Hindi fallback here - other languages go through the normal (translated) flow
+        lang_normalized = self.LANGUAGE_MAP.get(language.lower())
+        if lang_normalized not in EXPLANATION_LANGUAGES:
+            return None
+
+        return (
+            self.explanations.get("schemes", text, lang_normalized)
+            or self.explanations.get("terms", text, lang_normalized)
+        )
+
+    def precompute_explanations(
+        self,
+        languages: Sequence[str] = EXPLANATION_LANGUAGES,
+        force: bool = False
+    ) -> Dict[str, int]:
+        """
+        Generate explanations for every known scheme and term in every language
+        (run after build_index). Entries already generated against the current
+        index build are kept unless force=True; failed generations are retried
+        on the next run. LLM calls are paced to PRECOMPUTE_REQUESTS_PER_MINUTE
+        (default 10, 0 = only the shared LLM limiter) so a build running next
+        to the API leaves quota for live questions.
+
+        Returns:
+            {"generated": n, "skipped": n, "failed": n}
+        """
+        counts = {"generated": 0, "skipped": 0, "failed": 0}
+        if self.llm_client.client is None:
+            logger.warning("⚠️ LLM unavailable - skipping explanation precompute")
+            return counts
+
+        self._ensure_initialized()
+        index_version = self.rag_pipeline.index_version
+
+        per_minute = int(os.getenv("PRECOMPUTE_REQUESTS_PER_MINUTE", 10))
+        pacer = RateLimiter("precompute", [(per_minute, 60.0, 1)]) if per_minute > 0 else None
+
+        jobs = [
+            ("schemes", known_schemes(), self.rag_pipeline.explain_scheme, 5, 600),
+            ("terms", known_terms(), self.rag_pipeline.explain_term, 3, 300)
+        ]
+        total = sum(len(items) for _, items, _, _, _ in jobs) * len(languages)
+        logger.info(f"📝 Precomputing up to {total} explanations ({', '.join(languages)})...")
+
+        for kind, items, build_prompt, top_k, max_tokens in jobs:
+            for item in items:
+                retrieval = None
+                for language in languages:
+                    if not force and self.explanations.is_fresh(kind, item["name"], language, index_version):
+                        counts["skipped"] += 1
+                        continue
+
+                    # One retrieval per item, shared by all languages
+                    if retrieval is None:
+                        retrieval = self.rag_pipeline.retrieve(item["name"], top_k=top_k)
+                    prompt = build_prompt(item["name"], retrieval=retrieval, language=language)
+
+                    # Paced by the precompute budget, then by the shared LLM rate limiter
+                    if pacer is not None:
+                        pacer.acquire()
+                    text = self.llm_client.generate_with_retry(prompt, max_tokens=max_tokens)
+                    if self.llm_client.is_fallback(text):
+                        counts["failed"] += 1
+                        continue
+
+                    self.explanations.set(kind, item, language, text, index_version)
+                    counts["generated"] += 1
+
+                if retrieval is not None:
+                    # Save as we go so an interrupted run keeps its progress
+                    self.explanations.save()
+
+        logger.info(
+            f"✅ Explanations: {counts['generated']} generated, "
+            f"{counts['skipped']} up to date, {counts['failed']} failed"
+        )
+        return counts
+
+    def memory_usage(self) -> Dict:
+        """What warm-up loaded, for the service registry's memory report"""
+        if self.rag_pipeline is None:
+            return {"embedding_model_mb": None, "index_mb": None, "chunks": 0}
+
+        model = self.rag_pipeline.embedder.model
+        model_mb = None
+        if hasattr(model, "parameters"):  # PyTorch backend (ONNX sessions do not expose sizes)
+            model_mb = round(sum(p.numel() * p.element_size() for p in model.parameters()) / 1024 ** 2, 1)
+
+        vector_store = self.rag_pipeline.vector_store
+        return {
+            "embedding_model_mb": model_mb,
+            "index_mb": round(vector_store.memory_bytes() / 1024 ** 2, 1),
+            "index_mmap": vector_store.mmap,
+            "chunks": len(vector_store.chunks),
+            "cached_answers": len(self.answer_cache)
+        }
+
+    def close(self):
+        self.answer_cache.close()
+
     def get_service_status(self) -> Dict:
         """Get service status"""
-        rag_stats = self.rag_pipeline.get_stats()
+        if self.rag_pipeline is not None:
+            rag_stats = self.rag_pipeline.get_stats()
+        else:
+            rag_stats = {"status": "not_loaded"}
         llm_available = self.llm_client.client is not None
 
         return {
             'rag_status': rag_stats.get('status', 'unknown'),
             'llm_available': llm_available,
             'total_documents': rag_stats.get('total_chunks', 0),
-            'service_healthy': rag_stats.get('status') == 'indexed'
+            'service_healthy': rag_stats.get('status') == 'indexed',
+            'warmup': self.warmup_status(),
+            'query_embedding_cache': self.rag_pipeline.embedder.cache_stats() if self.rag_pipeline else None,
+            'answer_cache': self.answer_cache.stats(),
+            'llm_rate_limiter': self.llm_client.limiter.stats(),
+            'request_coalescing': {
+                'answers': self.inflight_answers.stats(),
+                'streams': self.inflight_streams.stats()
+            },
+            'precomputed_explanations': self.explanations.stats()
         }
\ No newline at end of file
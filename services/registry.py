@@ -0,0 +1,242 @@
+"""
+Service Registry - One instance of every service per process
+Routes, the bot, the scheduler and the OCR worker resolve services here, so
+each model, index and OCR reader is loaded once instead of once per module
+"""
+
+import os
+import time
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from loguru import logger
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    psutil = None
+    PSUTIL_AVAILABLE = False
+
+
+def process_rss_mb() -> Optional[float]:
+    """Resident memory of this process in MB (None if it cannot be read)"""
+    if PSUTIL_AVAILABLE:
+        return psutil.Process(os.getpid()).memory_info().rss / 1024 ** 2
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+# Factories import lazily: resolving "loan" must not import torch / EasyOCR
+
+def _rag():
+    from services.rag_service import RAGService
+    return RAGService()
+
+
+def _loan():
+    from services.loan_service import LoanService
+    return LoanService()
+
+
+def _fraud():
+    from services.fraud_service import FraudService
+    return FraudService()
+
+
+def _advisory():
+    from services.advisory_service import AdvisoryService
+    return AdvisoryService()
+
+
+def _translation():
+    from services.translation_service import TranslationService
+    return TranslationService()
+
+
+def _gtts():
+    from services.gtts_service import GTTsService
+    return GTTsService()
+
+
+def _ocr():
+    from services.ocr_service import OCRService
+    return OCRService()
+
+
+def _telegram():
+    from services.telegram_service import TelegramService
+    return TelegramService()
+
+
+def _llm():
+    from utils.llm_client import get_llm
+    return get_llm()
+
+
+FACTORIES: Dict[str, Callable[[], Any]] = {
+    "rag": _rag,
+    "loan": _loan,
+    "fraud": _fraud,
+    "advisory": _advisory,
+    "translation": _translation,
+    "gtts": _gtts,
+    "ocr": _ocr,
+    "telegram": _telegram,
+    "llm": _llm
+}
+
+
+class ServiceRegistry:
+    """
+    Lazily-populated container: get(name) builds the service on first use,
+    exactly once even when threads race (one lock per service, so a slow
+    model load does not hold up unrelated services).
+
+    Lifecycle hooks are duck-typed:
+      - startup() calls start_warmup() on services that have it
+      - preload() calls preload() instead, blocking until loaded
+      - shutdown() calls close() in reverse creation order
+      - memory_report() merges in memory_usage() where a service defines it
+    """
+
+    def __init__(self, factories: Optional[Dict[str, Callable[[], Any]]] = None):
+        self._factories = dict(FACTORIES if factories is None else factories)
+        self._instances: Dict[str, Any] = {}
+        self._info: Dict[str, Dict] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, factory: Callable[[], Any]):
+        """Add or replace a factory (only affects services not created yet)"""
+        with self._lock:
+            self._factories[name] = factory
+
+    def _lock_for(self, name: str) -> threading.Lock:
+        with self._lock:
+            if name not in self._factories:
+                raise KeyError(f"Unknown service: {name}")
+            return self._locks.setdefault(name, threading.Lock())
+
+    def get(self, name: str) -> Any:
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+
+        with self._lock_for(name):
+            instance = self._instances.get(name)
+            if instance is not None:
+                return instance
+
+            rss_before = process_rss_mb()
+            start = time.perf_counter()
+            instance = self._factories[name]()
+            init_seconds = time.perf_counter() - start
+            rss_after = process_rss_mb()
+
+            rss_delta = None
+            if rss_before is not None and rss_after is not None:
+                rss_delta = round(rss_after - rss_before, 1)
+
+            self._info[name] = {
+                "created_at": datetime.now().isoformat(timespec="seconds"),
+                "init_seconds": round(init_seconds, 3),
+                "init_rss_delta_mb": rss_delta
+            }
+            self._instances[name] = instance
+            rss_note = f", RSS {rss_delta:+.1f} MB" if rss_delta is not None else ""
+            logger.info(f"📦 {name} service ready ({init_seconds:.2f}s{rss_note})")
+
+        return instance
+
+    def loaded(self) -> List[str]:
+        return list(self._instances)
+
+    def startup(self, *names: str):
+        """Create the named services now and start their background warm-up"""
+        for name in names:
+            service = self.get(name)
+            if hasattr(service, "start_warmup"):
+                service.start_warmup()
+
+    def preload(self, *names: str):
+        """
+        Create the named services and load their models / indexes now, in
+        this thread (gunicorn master before fork - no background threads)
+        """
+        for name in names:
+            service = self.get(name)
+            if hasattr(service, "preload"):
+                service.preload()
+
+    def shutdown(self):
+        for name in reversed(self.loaded()):
+            service = self._instances.pop(name)
+            close = getattr(service, "close", None)
+            if close is None:
+                continue
+            try:
+                close()
+                logger.info(f"👋 {name} service closed")
+            except Exception as e:
+                logger.warning(f"⚠️ Error closing {name} service: {e}")
+        self._info.clear()
+
+    def memory_report(self) -> Dict:
+        """
+        Per loaded service: RSS growth while it was constructed plus its own
+        memory_usage() (models / indexes loaded later, e.g. by RAG warm-up)
+        """
+        rss = process_rss_mb()
+        services = {}
+        for name in self.loaded():
+            entry = dict(self._info.get(name, {}))
+            usage = getattr(self._instances[name], "memory_usage", None)
+            if usage is not None:
+                try:
+                    entry.update(usage())
+                except Exception as e:
+                    entry["memory_usage_error"] = str(e)
+            services[name] = entry
+
+        return {
+            "process_rss_mb": round(rss, 1) if rss is not None else None,
+            "pid": os.getpid(),
+            "services": services
+        }
+
+
+registry = ServiceRegistry()
+
+
+def get_service(name: str) -> Any:
+    """The process-wide instance of a service ("rag", "loan", "ocr", ...)"""
+    return registry.get(name)
+
+
+class LazyService:
+    """
+    Module-level handle to a registry service that is resolved on first
+    attribute access, so `ocr_service = lazy_service("ocr")` at import time
+    costs nothing and the first request builds (or reuses) the instance
+    """
+
+    def __init__(self, name: str, owner: Optional[ServiceRegistry] = None):
+        self._name = name
+        self._owner = owner
+
+    def __getattr__(self, attr: str):
+        owner = self._owner if self._owner is not None else registry
+        return getattr(owner.get(self._name), attr)
+
+    def __repr__(self) -> str:
+        return f"<lazy service '{self._name}'>"
+
+
+def lazy_service(name: str) -> LazyService:
+    """Deferred get_service(name) for module-level use in routes and the bot"""
+    return LazyService(name)
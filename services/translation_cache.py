@@ -0,0 +1,133 @@
+"""
+Translation Cache - Reuse provider translations of identical texts
+The daily advisory broadcast and the bot's fixed loan / fraud messages send
+the same text to the provider again and again; a hit skips the round trip
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from typing import Dict, Optional
+
+from loguru import logger
+
+from utils import metrics
+from utils.cache import DiskCache, LRUCache
+
+
+class TranslationCache:
+    """
+    (sha256(text), target language, provider) -> translated text.
+
+    A bounded in-memory LRU with an optional SQLite tier (survives restarts).
+    Entries older than `ttl_seconds` are treated as misses and dropped, so a
+    provider's improved translations eventually replace stale ones.
+
+    Lookups are counted per call site ("advisory_broadcast", "bot_loan", ...)
+    to show where caching pays off.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        maxsize: Optional[int] = None,
+        ttl_seconds: Optional[float] = None
+    ):
+        self.maxsize = maxsize if maxsize is not None else int(os.getenv("TRANSLATION_CACHE_SIZE", 2048))
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else float(os.getenv("TRANSLATION_CACHE_TTL", 7 * 86400))
+        path = path if path is not None else os.getenv("TRANSLATION_CACHE_PATH", "data/cache/translations.sqlite")
+
+        disk = None
+        if self.enabled and path:
+            try:
+                disk = DiskCache(path, table="translations")
+            except Exception as e:
+                logger.warning(f"⚠️ Translation cache persistence unavailable: {e}")
+
+        self._cache = LRUCache(
+            maxsize=self.maxsize,
+            disk=disk,
+            encode=lambda entry: json.dumps(entry, ensure_ascii=False).encode("utf-8"),
+            decode=lambda raw: json.loads(raw.decode("utf-8"))
+        )
+
+        self._sites: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+        self.expirations = 0
+
+        self._lookups = metrics.counter(
+            "translation_cache_lookups", "Translation cache lookups by call site and result", ["site", "result"]
+        )
+
+        logger.info(
+            f"🗂️ Translation cache: {'on' if self.enabled else 'off'} "
+            f"(size={self.maxsize}, ttl={self.ttl_seconds:.0f}s, persistent={disk is not None})"
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0
+
+    @staticmethod
+    def key(text: str, target_lang: str, provider: str) -> str:
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{provider}|{target_lang}|{digest}"
+
+    def get(self, text: str, target_lang: str, provider: str, site: str = "default") -> Optional[str]:
+        if not self.enabled:
+            return None
+
+        key = self.key(text, target_lang, provider)
+        entry = self._cache.get(key)
+        if entry is not None and time.time() - entry["created_at"] > self.ttl_seconds:
+            self._cache.delete(key)
+            with self._lock:
+                self.expirations += 1
+            entry = None
+
+        self._record(site, hit=entry is not None)
+        return entry["text"] if entry is not None else None
+
+    def put(self, text: str, target_lang: str, provider: str, translated: str):
+        if not self.enabled:
+            return
+        self._cache.put(
+            self.key(text, target_lang, provider),
+            {"text": translated, "created_at": time.time()}
+        )
+
+    def _record(self, site: str, hit: bool):
+        result = "hit" if hit else "miss"
+        with self._lock:
+            counts = self._sites.setdefault(site, {"hit": 0, "miss": 0})
+            counts[result] += 1
+        self._lookups.labels(site=site, result=result).inc()
+
+    def stats(self) -> Dict:
+        """LRU counters plus hits / misses / hit_ratio for every call site"""
+        with self._lock:
+            sites = {
+                site: {
+                    "hits": counts["hit"],
+                    "misses": counts["miss"],
+                    "hit_ratio": round(counts["hit"] / (counts["hit"] + counts["miss"]), 3)
+                }
+                for site, counts in self._sites.items()
+            }
+            expirations = self.expirations
+
+        return {
+            **self._cache.stats(),
+            "ttl_seconds": self.ttl_seconds,
+            "expirations": expirations,
+            "sites": sites
+        }
+
+    def clear(self):
+        self._cache.clear()
+
+    def close(self):
+        if self._cache.disk is not None:
+            self._cache.disk.close()
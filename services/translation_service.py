@@ -3,20 +3,53 @@ Translation Service - Translate text between languages
 """
 
 from deep_translator import GoogleTranslator
-from langdetect import detect
 from loguru import logger
 import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 from dotenv import load_dotenv
 
+from utils import metrics
+from utils.executors import run_io
+from utils.language_utils import detect_script_language, segment_text
+from services.translation_cache import TranslationCache
+
 load_dotenv()
 
 
+# Per provider: max characters per request (deep-translator rejects > 5000
+# for Google) and segments per request (LibreTranslate accepts a list in "q";
+# deep-translator's Google client is one text per request)
+PROVIDER_LIMITS = {
+    "google": {"max_chars": 4500, "batch_size": 1},
+    "libretranslate": {"max_chars": 2000, "batch_size": 16}
+}
+
+
 class TranslationService:
     """Multi-provider translation service"""
     
     def __init__(self):
         self.service = os.getenv("TRANSLATION_SERVICE", "google")
         self.libretranslate_url = os.getenv("LIBRETRANSLATE_URL", "")
+        self.cache = TranslationCache()
+        
+        limits = PROVIDER_LIMITS.get(self.service, PROVIDER_LIMITS["google"])
+        self.max_chars = int(os.getenv("TRANSLATION_MAX_CHARS", limits["max_chars"]))
+        self.batch_size = max(1, int(os.getenv("TRANSLATION_BATCH_SIZE", limits["batch_size"])))
+        self.max_parallel = max(1, int(os.getenv("TRANSLATION_MAX_PARALLEL", 4)))
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self._batch_seconds = metrics.histogram(
+            "translation_batch_seconds", "Provider round trip for one translation batch", ["provider"]
+        ).labels(provider=self.service)
+        self._batch_segments = metrics.histogram(
+            "translation_batch_segments", "Segments sent in one translation batch", ["provider"],
+            buckets=(1, 2, 4, 8, 16, 32)
+        ).labels(provider=self.service)
+        
         logger.info(f"✅ TranslationService initialized - Provider: {self.service}")
 
     def detect_language(self, text: str) -> str:
@@ -26,14 +59,13 @@ class TranslationService:
         Args:
             text: Text to detect
             
+        Unicode script counting (utils.language_utils) - deterministic and
+        far cheaper than langdetect, and it tells romanized Hindi apart
+        
         Returns:
-            Language code (en, hi, etc.)
+            Language code (en, hi, pa, ta, ml, or hi-Latn for Hinglish)
         """
-        try:
-            return detect(text)
-        except Exception as e:
-            logger.warning(f"Language detection failed: {e}")
-            return "en"
+        return detect_script_language(text, default="en")
 
     def translate_google(self, text: str, target_lang: str) -> str:
         """
@@ -47,15 +79,17 @@ class TranslationService:
             Translated text
         """
         try:
-            translator = GoogleTranslator(source="auto", target=target_lang)
-            translated = translator.translate(text)
-            logger.info(f"✅ Translated to {target_lang}")
-            return translated
-            
+            return self._google(text, target_lang)
         except Exception as e:
             logger.error(f"❌ Google translation error: {e}")
             return text
 
+    def _google(self, text: str, target_lang: str) -> str:
+        translator = GoogleTranslator(source="auto", target=target_lang)
+        translated = translator.translate(text)
+        logger.info(f"✅ Translated to {target_lang}")
+        return translated
+
     def translate_libretranslate(
         self, 
         text: str, 
@@ -74,43 +108,74 @@ class TranslationService:
             Translated text
         """
         try:
-            import requests
-            
-            if not self.libretranslate_url:
-                logger.warning("LibreTranslate URL not configured")
-                return text
-            
-            url = f"{self.libretranslate_url}/translate"
-            
-            payload = {
-                "q": text,
-                "source": source_lang,
-                "target": target_lang,
-                "format": "text"
-            }
-            
-            response = requests.post(url, json=payload, timeout=10)
-            response.raise_for_status()
-            
-            translated = response.json()["translatedText"]
-            logger.info(f"✅ Translated via LibreTranslate to {target_lang}")
-            return translated
-            
+            return self._libretranslate(text, source_lang, target_lang)
         except Exception as e:
             logger.error(f"❌ LibreTranslate error: {e}")
             return text
 
-    def translate(self, text: str, target_lang: str = "hi") -> str:
+    def _libretranslate(self, text: str, source_lang: str, target_lang: str) -> str:
+        import requests
+        
+        if not self.libretranslate_url:
+            raise RuntimeError("LibreTranslate URL not configured")
+        
+        url = f"{self.libretranslate_url}/translate"
+        
+        payload = {
+            "q": text,
+            "source": _provider_source(source_lang),
+            "target": target_lang,
+            "format": "text"
+        }
+        
+        response = requests.post(url, json=payload, timeout=10)
+        response.raise_for_status()
+        
+        translated = response.json()["translatedText"]
+        logger.info(f"✅ Translated via LibreTranslate to {target_lang}")
+        return translated
+
+    def _libretranslate_batch(self, texts: List[str], source_lang: str, target_lang: str) -> List[str]:
+        # "q" as a list: one round trip for the whole batch
+        import requests
+        
+        if not self.libretranslate_url:
+            raise RuntimeError("LibreTranslate URL not configured")
+        
+        payload = {
+            "q": texts,
+            "source": _provider_source(source_lang),
+            "target": target_lang,
+            "format": "text"
+        }
+        response = requests.post(f"{self.libretranslate_url}/translate", json=payload, timeout=30)
+        response.raise_for_status()
+        
+        translated = response.json()["translatedText"]
+        if len(translated) != len(texts):
+            raise RuntimeError(f"LibreTranslate returned {len(translated)} texts for {len(texts)}")
+        return translated
+
+    def translate(self, text: str, target_lang: str = "hi", site: str = "default") -> str:
         """
         Main translation method - routes to configured provider
         
         Args:
             text: Text to translate
             target_lang: Target language code (default: hi)
+            site: Call site name, for per-site cache hit ratios
             
         Returns:
-            Translated text
+            Translated text (the original text if the provider fails)
         """
+        if len(text) > self.max_chars:
+            # Over the provider's request limit - split at sentence boundaries
+            return self.translate_many([text], target_lang, site=site)[0]
+        
+        cached = self.cache.get(text, target_lang, self.service, site=site)
+        if cached is not None:
+            return cached
+        
         # Detect source language
         source_lang = self.detect_language(text)
         
@@ -120,10 +185,169 @@ class TranslationService:
             return text
         
         # Route to provider
-        if self.service == "google":
-            return self.translate_google(text, target_lang)
-        elif self.service == "libretranslate":
-            return self.translate_libretranslate(text, source_lang, target_lang)
-        else:
-            logger.warning(f"Unknown translation service: {self.service}")
-            return text
\ No newline at end of file
+        try:
+            if self.service == "google":
+                translated = self._google(text, target_lang)
+            elif self.service == "libretranslate":
+                translated = self._libretranslate(text, source_lang, target_lang)
+            else:
+                logger.warning(f"Unknown translation service: {self.service}")
+                return text
+        except Exception as e:
+            # Failures fall back to the original text and are not cached
+            logger.error(f"❌ {self.service} translation error: {e}")
+            return text
+        
+        if not translated:
+            return text
+        
+        self.cache.put(text, target_lang, self.service, translated)
+        return translated
+
+    async def translate_async(self, text: str, target_lang: str = "hi", site: str = "default") -> str:
+        """translate() on the I/O pool - the provider call is a blocking HTTP request"""
+        return await run_io(self.translate, text, target_lang, site)
+
+    def translate_many(self, texts: List[str], target_lang: str = "hi", site: str = "default") -> List[str]:
+        """
+        Translate several (possibly long) texts in as few provider calls as possible
+        
+        Each text is split at sentence boundaries (., ?, !, ।, ॥, newlines)
+        into segments under the provider limit. Cached segments are reused,
+        the rest go out in provider batches - up to `max_parallel` at once -
+        and the results are reassembled in order.
+        
+        Returns:
+            Translations in the order of `texts` (a segment whose batch failed
+            stays untranslated)
+        """
+        # Per text: list of (leading ws, core, trailing ws); core None = keep as is
+        layouts: List[Optional[List[Tuple[str, str, str]]]] = []
+        translations: Dict[str, str] = {}
+        pending: Dict[Tuple[str, str], None] = {}  # (source_lang, core), insertion-ordered
+        
+        for text in texts:
+            source_lang = self.detect_language(text) if text.strip() else target_lang
+            if source_lang == target_lang:
+                layouts.append(None)
+                continue
+            
+            layout = []
+            for segment in segment_text(text, self.max_chars):
+                core = segment.strip()
+                if not core:
+                    layout.append((segment, "", ""))
+                    continue
+                
+                start = segment.index(core)
+                layout.append((segment[:start], core, segment[start + len(core):]))
+                
+                if core in translations or (source_lang, core) in pending:
+                    continue
+                cached = self.cache.get(core, target_lang, self.service, site=site)
+                if cached is not None:
+                    translations[core] = cached
+                else:
+                    pending[(source_lang, core)] = None
+            layouts.append(layout)
+        
+        if pending:
+            translations.update(self._translate_batches(list(pending), target_lang))
+        
+        results = []
+        for text, layout in zip(texts, layouts):
+            if layout is None:
+                results.append(text)
+                continue
+            results.append("".join(
+                lead + (translations.get(core, core) if core else "") + trail
+                for lead, core, trail in layout
+            ))
+        return results
+
+    async def translate_many_async(self, texts: List[str], target_lang: str = "hi", site: str = "default") -> List[str]:
+        """translate_many() on the I/O pool"""
+        return await run_io(self.translate_many, texts, target_lang, site)
+
+    def _batches(self, items: List[Tuple[str, str]]) -> List[Tuple[str, List[str]]]:
+        """Group (source_lang, segment) into (source_lang, segments) under the count and char limits"""
+        batches = []
+        by_source: Dict[str, List[str]] = {}
+        for source_lang, core in items:
+            by_source.setdefault(source_lang, []).append(core)
+        
+        for source_lang, cores in by_source.items():
+            batch, chars = [], 0
+            for core in cores:
+                if batch and (len(batch) >= self.batch_size or chars + len(core) > self.max_chars):
+                    batches.append((source_lang, batch))
+                    batch, chars = [], 0
+                batch.append(core)
+                chars += len(core)
+            if batch:
+                batches.append((source_lang, batch))
+        return batches
+
+    def _translate_batch(self, source_lang: str, cores: List[str], target_lang: str) -> Dict[str, str]:
+        start = time.perf_counter()
+        try:
+            if self.service == "libretranslate":
+                translated = self._libretranslate_batch(cores, source_lang, target_lang)
+            elif self.service == "google":
+                translated = [self._google(core, target_lang) for core in cores]
+            else:
+                logger.warning(f"Unknown translation service: {self.service}")
+                return {}
+        except Exception as e:
+            logger.error(f"❌ {self.service} batch translation error ({len(cores)} segments): {e}")
+            return {}
+        finally:
+            seconds = time.perf_counter() - start
+            self._batch_seconds.observe(seconds)
+            self._batch_segments.observe(len(cores))
+            logger.info(
+                f"🌐 Translation batch: {len(cores)} segment(s), "
+                f"{sum(len(c) for c in cores)} chars, {seconds * 1000:.0f} ms"
+            )
+        
+        done = {}
+        for core, result in zip(cores, translated):
+            if result:
+                done[core] = result
+                self.cache.put(core, target_lang, self.service, result)
+        return done
+
+    def _translate_batches(self, items: List[Tuple[str, str]], target_lang: str) -> Dict[str, str]:
+        batches = self._batches(items)
+        if len(batches) == 1:
+            source_lang, cores = batches[0]
+            return self._translate_batch(source_lang, cores, target_lang)
+        
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_parallel, thread_name_prefix="translate"
+                )
+        
+        futures = [
+            self._pool.submit(self._translate_batch, source_lang, cores, target_lang)
+            for source_lang, cores in batches
+        ]
+        done = {}
+        for future in futures:
+            done.update(future.result())
+        return done
+
+    def cache_stats(self) -> dict:
+        """Translation cache counters, with hit ratios per call site"""
+        return self.cache.stats()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+        self.cache.close()
+
+
+def _provider_source(source_lang: str) -> str:
+    # Providers know no "romanized Hindi" source - let them auto-detect it
+    return "auto" if source_lang == "hi-Latn" else source_lang
@@ -0,0 +1,101 @@
+"""
+Query Batcher tests - run with: python -m pytest tests/
+"""
+
+import asyncio
+import threading
+
+import numpy as np
+
+from rag.query_batcher import QueryBatcher
+
+
+class StubEncoder:
+    """Deterministic encode(texts) that records every call; can be held to build a queue"""
+
+    def __init__(self):
+        self.calls = []
+        self.release = threading.Event()
+        self.release.set()
+        self.started = threading.Event()
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        self.started.set()
+        self.release.wait(timeout=5)
+        return np.array([[float(len(text)), float(i)] for i, text in enumerate(texts)], dtype="float32")
+
+
+def test_cancelled_waiter_does_not_stop_the_batcher():
+    encoder = StubEncoder()
+    batcher = QueryBatcher(encoder, max_batch=4, max_wait_ms=1, name="test-cancel")
+
+    async def scenario():
+        # Hold the worker inside encode so the next query stays queued
+        encoder.release.clear()
+        first = asyncio.wrap_future(batcher.submit("first"))
+        await asyncio.get_running_loop().run_in_executor(None, encoder.started.wait, 5)
+
+        queued = asyncio.ensure_future(asyncio.wrap_future(batcher.submit("abandoned")))
+        await asyncio.sleep(0)
+        queued.cancel()
+        await asyncio.sleep(0)
+
+        encoder.release.set()
+        assert (await first)[0] == len("first")
+
+        following = await asyncio.wait_for(asyncio.wrap_future(batcher.submit("next")), timeout=5)
+        assert following[0] == len("next")
+
+    asyncio.run(scenario())
+    assert ["abandoned"] not in encoder.calls
+    assert batcher._thread.is_alive()
+
+
+def test_concurrent_submits_share_one_encode_call():
+    encoder = StubEncoder()
+    batcher = QueryBatcher(encoder, max_batch=8, max_wait_ms=200, name="test-batch")
+
+    futures = [batcher.submit(f"query {i}") for i in range(8)]
+    results = [future.result(timeout=5) for future in futures]
+
+    assert len(encoder.calls) == 1
+    assert sorted(encoder.calls[0]) == sorted(f"query {i}" for i in range(8))
+    assert [r[0] for r in results] == [len(f"query {i}") for i in range(8)]
+    assert batcher.stats()["batches"] == 1
+
+
+def test_duplicate_texts_are_encoded_once():
+    encoder = StubEncoder()
+    batcher = QueryBatcher(encoder, max_batch=8, max_wait_ms=200, name="test-dedup")
+
+    futures = [batcher.submit(text) for text in ("kcc", "mudra", "kcc", "kcc")]
+    results = [future.result(timeout=5) for future in futures]
+
+    assert encoder.calls == [["kcc", "mudra"]]
+    assert np.array_equal(results[0], results[2]) and np.array_equal(results[0], results[3])
+    assert results[1][0] == len("mudra")
+    assert batcher.stats()["queries"] == 4
+
+
+def test_encode_failure_reaches_every_caller_and_the_worker_survives():
+    calls = []
+
+    def failing_encode(texts):
+        calls.append(list(texts))
+        if len(calls) == 1:
+            raise RuntimeError("model crashed")
+        return np.ones((len(texts), 2), dtype="float32")
+
+    batcher = QueryBatcher(failing_encode, max_batch=4, max_wait_ms=200, name="test-error")
+
+    futures = [batcher.submit(text) for text in ("a", "b")]
+    for future in futures:
+        try:
+            future.result(timeout=5)
+        except RuntimeError as e:
+            assert str(e) == "model crashed"
+        else:
+            raise AssertionError("encode failure was swallowed")
+
+    assert batcher.embed("c").tolist() == [1.0, 1.0]
@@ -0,0 +1,224 @@
+"""
+Cache utilities - Bounded in-memory LRU with an optional SQLite tier
+Used for values that are expensive to recompute (embeddings, translations, answers)
+"""
+
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from loguru import logger
+
+
+class DiskCache:
+    """
+    Tiny persistent key -> bytes store on SQLite (survives restarts).
+    Values are raw bytes; callers handle (de)serialization.
+    """
+
+    BATCH = 500
+
+    def __init__(self, path: str, table: str = "cache"):
+        self.path = path
+        self.table = table
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._connection = None
+        self._pid = None
+        self._conn.commit()
+
+        logger.info(f"💾 Disk cache ready: {path} [{table}]")
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        # SQLite connections must not cross a fork (gunicorn --preload):
+        # a forked worker opens its own and leaves the parent's untouched
+        if self._pid != os.getpid():
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} (key TEXT PRIMARY KEY, value BLOB NOT NULL)"
+            )
+            self._pid = os.getpid()
+        return self._connection
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, key: str, value: bytes):
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value) VALUES (?, ?)",
+                (key, sqlite3.Binary(value))
+            )
+            self._conn.commit()
+
+    def get_many(self, keys: List[str]) -> Dict[str, bytes]:
+        """Bulk lookup; only found keys are returned"""
+        found = {}
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(keys), self.BATCH):
+                batch = keys[start:start + self.BATCH]
+                placeholders = ",".join("?" * len(batch))
+                found.update(self._conn.execute(
+                    f"SELECT key, value FROM {self.table} WHERE key IN ({placeholders})", batch
+                ).fetchall())
+        return found
+
+    def put_many(self, items: Iterable[Tuple[str, bytes]]):
+        """Bulk insert in one transaction"""
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO {self.table} (key, value) VALUES (?, ?)",
+                ((key, sqlite3.Binary(value)) for key, value in items)
+            )
+            self._conn.commit()
+
+    def items(self) -> List[Tuple[str, bytes]]:
+        """All entries (for caches that are loaded into memory at startup)"""
+        with self._lock:
+            return self._conn.execute(f"SELECT key, value FROM {self.table}").fetchall()
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def delete_many(self, keys: List[str]):
+        with self._lock:
+            self._conn.executemany(
+                f"DELETE FROM {self.table} WHERE key = ?", ((key,) for key in keys)
+            )
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}")
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class LRUCache:
+    """
+    Thread-safe bounded LRU cache with hit/miss counters.
+
+    If a DiskCache is given, misses fall through to it and puts are written
+    through, so entries survive restarts while RAM stays bounded by maxsize.
+    `encode`/`decode` convert values to/from bytes for the disk tier.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        disk: Optional[DiskCache] = None,
+        encode=None,
+        decode=None
+    ):
+        self.maxsize = maxsize
+        self.disk = disk
+        self._encode = encode or (lambda value: value)
+        self._decode = decode or (lambda value: value)
+
+        self._data: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+
+        if self.disk is not None:
+            raw = self.disk.get(key)
+            if raw is not None:
+                value = self._decode(raw)
+                with self._lock:
+                    self.disk_hits += 1
+                    self._store(key, value)
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, value: Any):
+        with self._lock:
+            self._store(key, value)
+
+        if self.disk is not None:
+            try:
+                self.disk.put(key, self._encode(value))
+            except Exception as e:
+                logger.warning(f"⚠️ Disk cache write failed: {e}")
+
+    def _store(self, key: str, value: Any):
+        if self.maxsize <= 0:
+            return
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: str):
+        """Drop an entry from memory and the disk tier"""
+        with self._lock:
+            self._data.pop(key, None)
+        if self.disk is not None:
+            try:
+                self.disk.delete(key)
+            except Exception as e:
+                logger.warning(f"⚠️ Disk cache delete failed: {e}")
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for sizing the cache"""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round((self.hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+                "persistent": self.disk is not None
+            }
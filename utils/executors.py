@@ -0,0 +1,168 @@
+"""
+Executors - Bounded worker pools that keep blocking work off the event loop
+Every async route / bot handler hands sync calls to one of three pools so
+one slow job (an OCR scan, a translation timeout) cannot stall other users
+"""
+
+import os
+import time
+import asyncio
+import threading
+import functools
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from loguru import logger
+
+from utils import metrics
+
+
+# Pool name -> (env var, default size, kind)
+POOLS = {
+    # Network / disk: deep_translator, gTTS, SQLAlchemy, Telegram file I/O
+    "io": ("IO_POOL_SIZE", 16, "thread"),
+    # In-process models: embeddings + FAISS search, sklearn predict
+    # (torch / numpy release the GIL, so threads scale to the core count)
+    "model": ("MODEL_POOL_SIZE", 2, "thread"),
+    # EasyOCR: CPU-heavy and long-running, isolated in worker processes
+    "ocr": ("OCR_PROCESS_POOL_SIZE", 1, "process")
+}
+
+
+class BoundedExecutor:
+    """
+    A fixed-size pool plus saturation accounting.
+
+    in_flight counts tasks submitted and not yet finished; of those, at most
+    `size` run and the rest wait in the pool's queue. saturation is
+    active / size, so a pool sitting at 1.0 with a growing queue is the one
+    to scale.
+    """
+
+    def __init__(self, name: str, executor: Executor, size: int):
+        self.name = name
+        self.executor = executor
+        self.size = size
+        self._lock = threading.Lock()
+
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.max_queued = 0
+
+        self._queued = metrics.gauge(
+            "executor_queued", "Tasks waiting for a free worker", ["pool"]
+        ).labels(pool=name)
+        self._active = metrics.gauge(
+            "executor_active", "Tasks currently running", ["pool"]
+        ).labels(pool=name)
+        self._saturation = metrics.gauge(
+            "executor_saturation", "Busy workers / pool size", ["pool"]
+        ).labels(pool=name)
+        self._seconds = metrics.histogram(
+            "executor_task_seconds", "Submit-to-result time (queue wait + run)", ["pool"]
+        ).labels(pool=name)
+        self._failures = metrics.counter(
+            "executor_task_failures", "Tasks that raised", ["pool"]
+        ).labels(pool=name)
+        metrics.gauge("executor_size", "Configured pool size", ["pool"]).labels(pool=name).set(size)
+
+    def _publish(self):
+        active = min(self.in_flight, self.size)
+        queued = self.in_flight - active
+        self.max_queued = max(self.max_queued, queued)
+        self._active.set(active)
+        self._queued.set(queued)
+        self._saturation.set(active / self.size)
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Await fn(*args, **kwargs) on this pool"""
+        with self._lock:
+            self.in_flight += 1
+            self._publish()
+
+        start = time.perf_counter()
+        ok = False
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self.executor, functools.partial(fn, *args, **kwargs))
+            ok = True
+            return result
+        finally:
+            self._seconds.observe(time.perf_counter() - start)
+            with self._lock:
+                self.in_flight -= 1
+                if ok:
+                    self.completed += 1
+                else:
+                    self.failed += 1
+                    self._failures.inc()
+                self._publish()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            active = min(self.in_flight, self.size)
+            return {
+                "size": self.size,
+                "active": active,
+                "queued": self.in_flight - active,
+                "max_queued": self.max_queued,
+                "saturation": round(active / self.size, 2),
+                "completed": self.completed,
+                "failed": self.failed
+            }
+
+
+_executors: Dict[str, BoundedExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def _create(name: str) -> BoundedExecutor:
+    env_var, default, kind = POOLS[name]
+    size = max(1, int(os.getenv(env_var, default)))
+
+    if kind == "process":
+        # spawn, not fork: forking a process that already runs torch /
+        # OpenMP threads can deadlock the child
+        executor = ProcessPoolExecutor(max_workers=size, mp_context=multiprocessing.get_context("spawn"))
+    else:
+        executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix=f"{name}-pool")
+
+    logger.info(f"🧵 {name} pool: {size} {kind} worker(s)")
+    return BoundedExecutor(name, executor, size)
+
+
+def get_executor(name: str) -> BoundedExecutor:
+    """Process-wide pool by name ("io", "model" or "ocr"), created on first use"""
+    with _executors_lock:
+        if name not in _executors:
+            _executors[name] = _create(name)
+        return _executors[name]
+
+
+async def run_io(fn: Callable, *args, **kwargs) -> Any:
+    return await get_executor("io").run(fn, *args, **kwargs)
+
+
+async def run_model(fn: Callable, *args, **kwargs) -> Any:
+    return await get_executor("model").run(fn, *args, **kwargs)
+
+
+async def run_ocr(fn: Callable, *args, **kwargs) -> Any:
+    """fn and its arguments must be picklable (module-level function)"""
+    return await get_executor("ocr").run(fn, *args, **kwargs)
+
+
+def executor_stats() -> Dict[str, Dict]:
+    with _executors_lock:
+        pools = dict(_executors)
+    return {name: pool.stats() for name, pool in pools.items()}
+
+
+def shutdown_executors(wait: bool = True):
+    with _executors_lock:
+        pools = list(_executors.values())
+        _executors.clear()
+    for pool in pools:
+        pool.executor.shutdown(wait=wait, cancel_futures=True)
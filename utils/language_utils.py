@@ -4,23 +4,83 @@ Optimized for rural Hindi/English users
 """
 
 import re
-from typing import Optional
+import unicodedata
+from typing import List, Optional
+
+
+# detect_script_language() code -> language name
+LANGUAGE_NAMES = {'hi': 'hindi', 'hi-Latn': 'hindi', 'en': 'english', 'pa': 'punjabi', 'ta': 'tamil', 'ml': 'malayalam'}
 
 
 def detect_language(text: str) -> str:
     """
-    Detect if text is Hindi or English
+    Language name of the text ('hindi', 'english', 'punjabi', ...) -
+    detect_script_language() with its code spelled out, so every caller
+    shares the one detector
+    """
+    return LANGUAGE_NAMES[detect_script_language(text)]
+
+
+# Unicode block (code point >> 7) -> language; each script is one 128-char block
+SCRIPT_BLOCKS = {
+    0x0900 >> 7: 'hi',  # Devanagari
+    0x0A00 >> 7: 'pa',  # Gurmukhi
+    0x0B80 >> 7: 'ta',  # Tamil
+    0x0D00 >> 7: 'ml',  # Malayalam
+}
+
+# Danda / double danda live in the Devanagari block but end Gurmukhi sentences too
+SHARED_PUNCTUATION = {'\u0964', '\u0965'}
+
+# Romanized Hindi function words that do not occur as English words
+HINGLISH_MARKERS = {
+    'hai', 'hain', 'kya', 'kaise', 'kaisa', 'kaisi', 'kab', 'kahan', 'kyun', 'kyon',
+    'kitna', 'kitni', 'kitne', 'mera', 'meri', 'mere', 'mujhe', 'hum', 'humko', 'aap',
+    'aapka', 'nahi', 'nahin', 'ka', 'ki', 'ke', 'ko', 'se', 'mein', 'aur', 'bhi',
+    'chahiye', 'milega', 'milegi', 'milta', 'karna', 'karein', 'kare', 'batao',
+    'bataiye', 'paisa', 'paise', 'yojana', 'kaun', 'konsa', 'sakta', 'sakte', 'wala', 'wali'
+}
+
+
+def detect_script_language(text: str, default: str = 'en') -> str:
+    """
+    Deterministic language guess from Unicode script counts (one pass)
+    
+    Letters are counted per script - Devanagari (hi), Gurmukhi (pa), Tamil
+    (ta), Malayalam (ml), Latin (en) - and the most frequent script wins.
+    Latin text made of romanized Hindi ("loan kaise milega") is 'hi-Latn'.
     
     Returns:
-        'hindi' or 'english'
+        'hi', 'pa', 'ta', 'ml', 'en', 'hi-Latn', or `default` for text
+        without letters
     """
-    # Check for Devanagari script (Hindi)
-    hindi_chars = re.findall(r'[\u0900-\u097F]', text)
+    counts = {}
+    for ch in text:
+        code = ord(ch)
+        if code < 0x250:
+            # ASCII + Latin-1 / Latin Extended letters
+            if ch.isalpha():
+                counts['en'] = counts.get('en', 0) + 1
+            continue
+        lang = SCRIPT_BLOCKS.get(code >> 7)
+        if lang is not None and ch not in SHARED_PUNCTUATION:
+            counts[lang] = counts.get(lang, 0) + 1
     
-    if len(hindi_chars) > len(text) * 0.3:  # 30% Hindi characters
-        return 'hindi'
-    else:
-        return 'english'
+    if not counts:
+        return default
+    
+    # Ties go to the Indic script (e.g. "KCC के लिए" style mixes)
+    lang = max(counts, key=lambda l: (counts[l], l != 'en'))
+    if lang == 'en' and is_hinglish(text):
+        return 'hi-Latn'
+    return lang
+
+
+def is_hinglish(text: str) -> bool:
+    """Latin-script text that reads as Hindi: two marker words, or one in a very short text"""
+    words = re.findall(r'[a-z]+', text.lower())
+    markers = sum(1 for word in words if word in HINGLISH_MARKERS)
+    return markers >= 2 or (markers == 1 and len(words) <= 3)
 
 
 def romanize_hindi(text: str) -> str:
@@ -39,6 +99,75 @@ def romanize_hindi(text: str) -> str:
     return text
 
 
+def normalize_query_text(text: str) -> str:
+    """
+    Canonical form of a user question for cache keys
+    
+    "मुद्रा योजना क्या है?" == "  मुद्रा  योजना क्या है । " and
+    "KCC kaise milega" == "kcc kaise milega!!" - Devanagari digits become
+    ASCII, punctuation/symbols (incl. danda) are dropped, case and
+    whitespace are folded.
+    """
+    text = unicodedata.normalize('NFC', romanize_hindi(text)).casefold()
+    
+    # Drop punctuation/symbols by Unicode category (keeps Devanagari matras, which \w does not)
+    text = ''.join(
+        ' ' if unicodedata.category(ch)[0] in ('P', 'S') else ch
+        for ch in text
+    )
+    
+    return ' '.join(text.split())
+
+
+# End of a sentence: ! ? । ॥ (a "." only before whitespace, so "Rs. 5" / "3.5%"
+# splits at most after "Rs."), or a line break - plus the whitespace after it
+SENTENCE_END = re.compile(r'(?:[!?।॥]+|\.+(?=\s|$))\s*|\n\s*')
+
+
+def split_sentences(text: str) -> List[str]:
+    """
+    Sentences of text, each keeping its terminator and trailing whitespace,
+    so ''.join(split_sentences(text)) == text
+    """
+    sentences = []
+    start = 0
+    for match in SENTENCE_END.finditer(text):
+        if match.end() > start:
+            sentences.append(text[start:match.end()])
+            start = match.end()
+    if start < len(text):
+        sentences.append(text[start:])
+    return sentences
+
+
+def segment_text(text: str, max_chars: int) -> List[str]:
+    """
+    Split text into segments of at most max_chars, at sentence boundaries
+    where possible (then at spaces, then anywhere). Consecutive sentences are
+    packed into one segment while they fit; ''.join(segments) == text.
+    """
+    segments = []
+    current = ""
+    for sentence in split_sentences(text):
+        while len(sentence) > max_chars:
+            # A single sentence over the limit: cut at the last space that fits
+            cut = sentence.rfind(' ', 0, max_chars) + 1 or max_chars
+            if current:
+                segments.append(current)
+                current = ""
+            segments.append(sentence[:cut])
+            sentence = sentence[cut:]
+
+        if len(current) + len(sentence) > max_chars:
+            segments.append(current)
+            current = ""
+        current += sentence
+
+    if current:
+        segments.append(current)
+    return segments
+
+
 def extract_numbers(text: str) -> list:
     """
     Extract all numbers from text (handles Hindi/English)
@@ -70,40 +199,43 @@ def format_currency(amount: float, lang: str = 'hindi') -> str:
     return formatted
 
 
+# Banking terms with fixed simple-language glosses (also the set of terms
+# whose explanations are precomputed after each index build)
+BANKING_TERMS = {
+    'emi': {
+        'hindi': 'मासिक किस्त (हर महीने देनी होती है)',
+        'english': 'Monthly Installment (payment every month)'
+    },
+    'interest rate': {
+        'hindi': 'ब्याज दर (लोन पर अतिरिक्त पैसा)',
+        'english': 'Interest Rate (extra money on loan)'
+    },
+    'credit score': {
+        'hindi': 'क्रेडिट स्कोर (आपकी पैसे चुकाने की साख)',
+        'english': 'Credit Score (your repayment trustworthiness)'
+    },
+    'tenure': {
+        'hindi': 'अवधि (कितने महीने/साल में चुकाना है)',
+        'english': 'Tenure (months/years to repay)'
+    },
+    'collateral': {
+        'hindi': 'गिरवी (जमानत के तौर पर संपत्ति)',
+        'english': 'Collateral (property as guarantee)'
+    },
+    'foreclosure': {
+        'hindi': 'जल्दी चुकाना (समय से पहले पूरा लोन देना)',
+        'english': 'Foreclosure (repaying loan early)'
+    }
+}
+
+
 def simplify_banking_term(term: str, lang: str = 'hindi') -> Optional[str]:
     """
     Convert banking terms to simple language
     """
-    terms_dict = {
-        'emi': {
-            'hindi': 'मासिक किस्त (हर महीने देनी होती है)',
-            'english': 'Monthly Installment (payment every month)'
-        },
-        'interest rate': {
-            'hindi': 'ब्याज दर (लोन पर अतिरिक्त पैसा)',
-            'english': 'Interest Rate (extra money on loan)'
-        },
-        'credit score': {
-            'hindi': 'क्रेडिट स्कोर (आपकी पैसे चुकाने की साख)',
-            'english': 'Credit Score (your repayment trustworthiness)'
-        },
-        'tenure': {
-            'hindi': 'अवधि (कितने महीने/साल में चुकाना है)',
-            'english': 'Tenure (months/years to repay)'
-        },
-        'collateral': {
-            'hindi': 'गिरवी (जमानत के तौर पर संपत्ति)',
-            'english': 'Collateral (property as guarantee)'
-        },
-        'foreclosure': {
-            'hindi': 'जल्दी चुकाना (समय से पहले पूरा लोन देना)',
-            'english': 'Foreclosure (repaying loan early)'
-        }
-    }
-    
     term_lower = term.lower()
-    if term_lower in terms_dict:
-        return terms_dict[term_lower].get(lang)
+    if term_lower in BANKING_TERMS:
+        return BANKING_TERMS[term_lower].get(lang)
     
     return None
 
@@ -142,6 +274,8 @@ if __name__ == "__main__":
     # Test language detection
     print(detect_language("मुद्रा योजना क्या है?"))  # hindi
     print(detect_language("What is Mudra Yojana?"))  # english
+    print(detect_script_language("ਕਿਸਾਨ ਕ੍ਰੈਡਿਟ ਕਾਰਡ ਕੀ ਹੈ?"))  # pa
+    print(detect_script_language("loan kaise milega"))  # hi-Latn
     
     # Test number extraction
     print(extract_numbers("मेरी आय ₹25,000 है"))  # [25000.0]
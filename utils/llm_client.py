@@ -4,27 +4,105 @@ Groq provides fast inference with generous free limits
 """
 
 import os
-from typing import Optional
-from groq import Groq
+import time
+import random
+import asyncio
+import weakref
+import threading
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, Dict, List, Optional
+
+import httpx
+import groq
+from groq import Groq, AsyncGroq
 from loguru import logger
 from dotenv import load_dotenv
 from pathlib import Path
 
+from utils import metrics
+from utils.rate_limiter import RateLimitTimeout, get_llm_rate_limiter
+
 # ---------------- LOAD ENV (ABSOLUTE PATH FIX) ---------------- #
 
 env_path = Path(__file__).resolve().parents[1] / ".env"
 load_dotenv(env_path)
 
-# Debug once (remove later if you want)
-print("DEBUG GROQ KEY:", os.getenv("GROQ_API_KEY"))
+
+UNAVAILABLE_RESPONSE = "⚠️ LLM सेवा उपलब्ध नहीं है। कृपया API कुंजी जांचें।"
+ERROR_RESPONSE = "क्षमा करें, कुछ गलती हुई। कृपया फिर से प्रयास करें।"
+RETRY_EXHAUSTED_RESPONSE = "क्षमा करें, सेवा अभी उपलब्ध नहीं है।"
+
+LLM_REQUESTS = metrics.counter("llm_requests", "Groq chat completions by outcome", ["outcome"])
+LLM_LATENCY = metrics.histogram("llm_request_seconds", "Groq chat completion latency")
+LLM_RETRIES = metrics.counter("llm_retries", "Groq calls retried after a transient error")
+LLM_TTFT = metrics.histogram("llm_time_to_first_token_seconds", "Groq streaming time to first token")
+
+
+class LLMStreamError(Exception):
+    """A stream failed after some text was already yielded"""
+
+
+# ---------------- SHARED CONNECTION POOLS ---------------- #
+# One pooled HTTP client per API key (sync) and per API key + event loop (async),
+# shared by every LLMClient in the process. Async clients are keyed weakly on
+# the loop, so they are dropped together with it. The SDK's own retries are disabled -
+# generate_with_retry does the backoff and goes through the rate limiter each time.
+
+_pool_lock = threading.Lock()
+_sync_clients: Dict[str, Groq] = {}
+_async_clients: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()  # loop -> {api_key: AsyncGroq}
+
+
+def _http_limits() -> httpx.Limits:
+    max_connections = int(os.getenv("LLM_MAX_CONNECTIONS", 10))
+    return httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+
+
+def _http_timeout() -> httpx.Timeout:
+    return httpx.Timeout(float(os.getenv("LLM_TIMEOUT", 60)), connect=10.0)
+
+
+def _get_sync_client(api_key: str) -> Groq:
+    with _pool_lock:
+        if api_key not in _sync_clients:
+            _sync_clients[api_key] = Groq(
+                api_key=api_key,
+                max_retries=0,
+                http_client=httpx.Client(limits=_http_limits(), timeout=_http_timeout())
+            )
+        return _sync_clients[api_key]
+
+
+def _get_async_client(api_key: str) -> AsyncGroq:
+    # httpx.AsyncClient connections belong to the loop that opened them
+    loop = asyncio.get_running_loop()
+    with _pool_lock:
+        clients = _async_clients.setdefault(loop, {})
+        if api_key not in clients:
+            clients[api_key] = AsyncGroq(
+                api_key=api_key,
+                max_retries=0,
+                http_client=httpx.AsyncClient(limits=_http_limits(), timeout=_http_timeout())
+            )
+        return clients[api_key]
 
 
 class LLMClient:
     """
     Groq API client for text generation
     FREE tier: 14,400 requests/day, 20 requests/minute
+
+    Every call waits for the process-wide token bucket (utils.rate_limiter),
+    so bursts queue instead of hitting 429s. Use the async variants
+    (agenerate / agenerate_with_retry) from async routes and bot handlers.
     """
 
+    # Returned instead of raising - never worth caching
+    FALLBACK_RESPONSES = frozenset({UNAVAILABLE_RESPONSE, ERROR_RESPONSE, RETRY_EXHAUSTED_RESPONSE})
+
+    # Transient HTTP statuses worth retrying
+    RETRY_STATUSES = {408, 409, 429, 500, 502, 503, 504}
+
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key or os.getenv("GROQ_API_KEY")
 
@@ -32,12 +110,64 @@ class LLMClient:
             logger.warning("⚠️ GROQ_API_KEY not found! LLM features will not work.")
             self.client = None
         else:
-            self.client = Groq(api_key=self.api_key)
+            self.client = _get_sync_client(self.api_key)
             logger.info("✅ Groq client initialized")
 
         # Default model
         self.model = "llama-3.1-8b-instant"
 
+        self.limiter = get_llm_rate_limiter()
+        self.max_retries = int(os.getenv("LLM_MAX_RETRIES", 2))
+        self.retry_base_delay = float(os.getenv("LLM_RETRY_BASE_DELAY", 1.0))
+        self.retry_max_delay = float(os.getenv("LLM_RETRY_MAX_DELAY", 60.0))
+
+    @property
+    def async_client(self) -> Optional[AsyncGroq]:
+        """Pooled async client for the running event loop"""
+        if not self.api_key:
+            return None
+        return _get_async_client(self.api_key)
+
+    def _request(
+        self,
+        prompt: str,
+        max_tokens: int,
+        temperature: float,
+        system_prompt: Optional[str]
+    ) -> Dict:
+        messages: List[Dict[str, str]] = []
+
+        if system_prompt:
+            messages.append({
+                "role": "system",
+                "content": system_prompt
+            })
+
+        messages.append({
+            "role": "user",
+            "content": prompt
+        })
+
+        return {
+            "model": self.model,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "top_p": 0.9
+        }
+
+    @staticmethod
+    def _answer(response, started: float) -> str:
+        LLM_LATENCY.observe(time.perf_counter() - started)
+        LLM_REQUESTS.labels(outcome="ok").inc()
+
+        answer = response.choices[0].message.content.strip()
+        logger.info(f"✅ Generated response ({len(answer)} chars)")
+        return answer
+
+    # ------------------------------------------------------------------
+    # 🔹 SINGLE ATTEMPT
+    # ------------------------------------------------------------------
     def generate(
         self,
         prompt: str,
@@ -45,51 +175,234 @@ class LLMClient:
         temperature: float = 0.3,
         system_prompt: Optional[str] = None,
     ) -> str:
+        return self.generate_with_retry(
+            prompt,
+            max_retries=0,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            system_prompt=system_prompt
+        )
+
+    async def agenerate(
+        self,
+        prompt: str,
+        max_tokens: int = 500,
+        temperature: float = 0.3,
+        system_prompt: Optional[str] = None,
+    ) -> str:
+        """generate() without blocking the event loop"""
+        return await self.agenerate_with_retry(
+            prompt,
+            max_retries=0,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            system_prompt=system_prompt
+        )
+
+    def is_fallback(self, text: str) -> bool:
+        return text in self.FALLBACK_RESPONSES
 
+    # ------------------------------------------------------------------
+    # 🔹 RETRY WITH BACKOFF
+    # ------------------------------------------------------------------
+    def generate_with_retry(self, prompt: str, max_retries: Optional[int] = None, **kwargs) -> str:
+        """
+        generate() with exponential backoff on transient errors (429, 5xx,
+        timeouts, connection errors); a 429's retry-after hint wins over the
+        computed delay. Non-retryable errors fail immediately.
+        """
         if not self.client:
-            return "⚠️ LLM सेवा उपलब्ध नहीं है। कृपया API कुंजी जांचें।"
+            return UNAVAILABLE_RESPONSE
 
-        try:
-            messages = []
+        max_retries = self.max_retries if max_retries is None else max_retries
+        request = self._request(
+            prompt,
+            kwargs.get("max_tokens", 500),
+            kwargs.get("temperature", 0.3),
+            kwargs.get("system_prompt")
+        )
 
-            if system_prompt:
-                messages.append({
-                    "role": "system",
-                    "content": system_prompt
-                })
+        for attempt in range(max_retries + 1):
+            try:
+                self.limiter.acquire()
+                started = time.perf_counter()
+                response = self.client.chat.completions.create(**request)
+                return self._answer(response, started)
 
-            messages.append({
-                "role": "user",
-                "content": prompt
-            })
+            except RateLimitTimeout as e:
+                # Our own queue is full - retrying would only queue again
+                LLM_REQUESTS.labels(outcome="queue_timeout").inc()
+                logger.error(f"❌ Groq queue full: {e}")
+                return RETRY_EXHAUSTED_RESPONSE
 
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                max_tokens=max_tokens,
-                temperature=temperature,
-                top_p=0.9,
-            )
+            except Exception as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None or attempt == max_retries:
+                    LLM_REQUESTS.labels(outcome="error").inc()
+                    logger.error(f"❌ Groq API error (attempt {attempt + 1}): {e}")
+                    # Only transient errors that survived retries mean "try later"
+                    return RETRY_EXHAUSTED_RESPONSE if delay is not None and max_retries else ERROR_RESPONSE
 
-            answer = response.choices[0].message.content.strip()
+                LLM_RETRIES.inc()
+                logger.warning(f"⚠️ Retry {attempt + 1}/{max_retries} in {delay:.1f}s: {e}")
+                time.sleep(delay)
 
-            logger.info(f"✅ Generated response ({len(answer)} chars)")
-            return answer
+    async def agenerate_with_retry(self, prompt: str, max_retries: Optional[int] = None, **kwargs) -> str:
+        """Async generate_with_retry() - backoff sleeps do not block the event loop"""
+        if not self.api_key:
+            return UNAVAILABLE_RESPONSE
 
-        except Exception as e:
-            logger.error(f"❌ Groq API error: {e}")
-            return "क्षमा करें, कुछ गलती हुई। कृपया फिर से प्रयास करें।"
+        max_retries = self.max_retries if max_retries is None else max_retries
+        request = self._request(
+            prompt,
+            kwargs.get("max_tokens", 500),
+            kwargs.get("temperature", 0.3),
+            kwargs.get("system_prompt")
+        )
 
-    def generate_with_retry(self, prompt: str, max_retries: int = 2, **kwargs) -> str:
+        for attempt in range(max_retries + 1):
+            try:
+                await self.limiter.acquire_async()
+                started = time.perf_counter()
+                response = await self.async_client.chat.completions.create(**request)
+                return self._answer(response, started)
+
+            except RateLimitTimeout as e:
+                LLM_REQUESTS.labels(outcome="queue_timeout").inc()
+                logger.error(f"❌ Groq queue full: {e}")
+                return RETRY_EXHAUSTED_RESPONSE
+
+            except Exception as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None or attempt == max_retries:
+                    LLM_REQUESTS.labels(outcome="error").inc()
+                    logger.error(f"❌ Groq API error (attempt {attempt + 1}): {e}")
+                    # Only transient errors that survived retries mean "try later"
+                    return RETRY_EXHAUSTED_RESPONSE if delay is not None and max_retries else ERROR_RESPONSE
+
+                LLM_RETRIES.inc()
+                logger.warning(f"⚠️ Retry {attempt + 1}/{max_retries} in {delay:.1f}s: {e}")
+                await asyncio.sleep(delay)
+
+    # ------------------------------------------------------------------
+    # 🔹 STREAMING
+    # ------------------------------------------------------------------
+    async def astream(
+        self,
+        prompt: str,
+        max_tokens: int = 500,
+        temperature: float = 0.3,
+        system_prompt: Optional[str] = None,
+        max_retries: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream the completion as text deltas
 
+        Opening the stream is rate limited and retried like agenerate_with_retry;
+        if it never opens, the fallback response is yielded as the only piece.
+
+        Raises:
+            LLMStreamError: the connection failed mid-answer (partial text was yielded)
+        """
+        if not self.api_key:
+            yield UNAVAILABLE_RESPONSE
+            return
+
+        max_retries = self.max_retries if max_retries is None else max_retries
+        request = self._request(prompt, max_tokens, temperature, system_prompt)
+
+        stream = None
         for attempt in range(max_retries + 1):
             try:
-                return self.generate(prompt, **kwargs)
-            except Exception:
-                if attempt < max_retries:
-                    logger.warning(f"⚠️ Retry {attempt + 1}/{max_retries}")
-                else:
-                    return "क्षमा करें, सेवा अभी उपलब्ध नहीं है।"
+                await self.limiter.acquire_async()
+                started = time.perf_counter()
+                stream = await self.async_client.chat.completions.create(**request, stream=True)
+                break
+
+            except RateLimitTimeout as e:
+                LLM_REQUESTS.labels(outcome="queue_timeout").inc()
+                logger.error(f"❌ Groq queue full: {e}")
+                yield RETRY_EXHAUSTED_RESPONSE
+                return
+
+            except Exception as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None or attempt == max_retries:
+                    LLM_REQUESTS.labels(outcome="error").inc()
+                    logger.error(f"❌ Groq API error (attempt {attempt + 1}): {e}")
+                    yield RETRY_EXHAUSTED_RESPONSE if delay is not None and max_retries else ERROR_RESPONSE
+                    return
+
+                LLM_RETRIES.inc()
+                logger.warning(f"⚠️ Retry {attempt + 1}/{max_retries} in {delay:.1f}s: {e}")
+                await asyncio.sleep(delay)
+
+        length = 0
+        try:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+                if length == 0:
+                    LLM_TTFT.observe(time.perf_counter() - started)
+                    # Match generate(), which strips the answer
+                    delta = delta.lstrip()
+                    if not delta:
+                        continue
+                length += len(delta)
+                yield delta
+
+        except Exception as e:
+            LLM_REQUESTS.labels(outcome="error").inc()
+            logger.error(f"❌ Groq stream failed after {length} chars: {e}")
+            raise LLMStreamError(str(e)) from e
+
+        finally:
+            await stream.close()
+
+        LLM_LATENCY.observe(time.perf_counter() - started)
+        LLM_REQUESTS.labels(outcome="ok").inc()
+        logger.info(f"✅ Streamed response ({length} chars)")
+
+    def _retry_delay(self, error: Exception, attempt: int) -> Optional[float]:
+        """
+        Seconds to wait before retrying, or None if the error is not transient
+        """
+        if isinstance(error, groq.APIStatusError):
+            if error.status_code not in self.RETRY_STATUSES:
+                return None
+            retry_after = _retry_after_seconds(error.response)
+            if retry_after is not None:
+                return min(retry_after, self.retry_max_delay)
+        elif not isinstance(error, groq.APIConnectionError):
+            return None
+
+        # Exponential backoff with full jitter
+        backoff = min(self.retry_max_delay, self.retry_base_delay * (2 ** attempt))
+        return random.uniform(backoff / 2, backoff)
+
+
+def _retry_after_seconds(response: Optional[httpx.Response]) -> Optional[float]:
+    """Parse retry-after-ms / retry-after (seconds or HTTP date) response headers"""
+    if response is None:
+        return None
+
+    headers = response.headers
+    try:
+        if "retry-after-ms" in headers:
+            return max(0.0, float(headers["retry-after-ms"]) / 1000)
+        if "retry-after" in headers:
+            value = headers["retry-after"]
+            try:
+                return max(0.0, float(value))
+            except ValueError:
+                return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+    return None
 
 
 # ---------------- SINGLETON FOR FASTAPI ---------------- #
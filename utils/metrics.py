@@ -0,0 +1,179 @@
+"""
+Metrics - Process-wide counters, gauges and histograms
+Exported on /metrics in Prometheus text format when prometheus-client is
+installed, and always available as a JSON snapshot
+"""
+
+import threading
+from typing import Dict, Optional, Sequence, Tuple
+
+try:
+    import prometheus_client
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    prometheus_client = None
+    PROMETHEUS_AVAILABLE = False
+
+
+class Metric:
+    """
+    One named metric, optionally labelled.
+
+    Values are kept in-process (for snapshot()/get_stats) and mirrored to a
+    prometheus_client metric of the same name when that library is available.
+    Histograms keep count / sum / max locally.
+    """
+
+    KINDS = ("counter", "gauge", "histogram")
+
+    def __init__(
+        self,
+        kind: str,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Optional[Sequence[float]] = None
+    ):
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown metric kind: {kind}")
+
+        self.kind = kind
+        self.name = name
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+        self._prometheus = None
+        if PROMETHEUS_AVAILABLE:
+            cls = {
+                "counter": prometheus_client.Counter,
+                "gauge": prometheus_client.Gauge,
+                "histogram": prometheus_client.Histogram
+            }[kind]
+            # Histograms default to prometheus_client's latency buckets
+            extra = {"buckets": buckets} if kind == "histogram" and buckets else {}
+            self._prometheus = cls(name, documentation, self.labelnames, **extra)
+
+    def labels(self, **labels) -> "_Child":
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        return _Child(self, key)
+
+    # Unlabelled shortcuts
+    def inc(self, amount: float = 1.0):
+        _Child(self, ()).inc(amount)
+
+    def dec(self, amount: float = 1.0):
+        _Child(self, ()).dec(amount)
+
+    def set(self, value: float):
+        _Child(self, ()).set(value)
+
+    def observe(self, value: float):
+        _Child(self, ()).observe(value)
+
+    def value(self, **labels) -> Dict[str, float]:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            return dict(self._values.get(key, {}))
+
+    def _update(self, key: Tuple[str, ...], op: str, amount: float):
+        with self._lock:
+            values = self._values.setdefault(key, {})
+            if op == "observe":
+                values["count"] = values.get("count", 0) + 1
+                values["sum"] = values.get("sum", 0.0) + amount
+                values["max"] = max(values.get("max", amount), amount)
+            elif op == "set":
+                values["value"] = amount
+            else:
+                values["value"] = values.get("value", 0.0) + amount
+
+        if self._prometheus is not None:
+            target = self._prometheus.labels(*key) if self.labelnames else self._prometheus
+            if op == "observe":
+                target.observe(amount)
+            elif op == "set":
+                target.set(amount)
+            elif amount >= 0:
+                target.inc(amount)
+            else:
+                target.dec(-amount)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            if not self.labelnames:
+                return dict(self._values.get((), {}))
+            return {
+                ",".join(f"{n}={v}" for n, v in zip(self.labelnames, key)): dict(values)
+                for key, values in self._values.items()
+            }
+
+
+class _Child:
+    def __init__(self, metric: Metric, key: Tuple[str, ...]):
+        self.metric = metric
+        self.key = key
+
+    def inc(self, amount: float = 1.0):
+        self.metric._update(self.key, "inc", amount)
+
+    def dec(self, amount: float = 1.0):
+        self.metric._update(self.key, "inc", -amount)
+
+    def set(self, value: float):
+        self.metric._update(self.key, "set", value)
+
+    def observe(self, value: float):
+        self.metric._update(self.key, "observe", value)
+
+
+_REGISTRY: Dict[str, Metric] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def _get_or_create(
+    kind: str,
+    name: str,
+    documentation: str,
+    labelnames: Sequence[str],
+    buckets: Optional[Sequence[float]] = None
+) -> Metric:
+    # Idempotent: modules may be imported (or services built) more than once
+    with _REGISTRY_LOCK:
+        metric = _REGISTRY.get(name)
+        if metric is None:
+            metric = Metric(kind, name, documentation, labelnames, buckets)
+            _REGISTRY[name] = metric
+        return metric
+
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Metric:
+    return _get_or_create("counter", name, documentation, labelnames)
+
+
+def gauge(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Metric:
+    return _get_or_create("gauge", name, documentation, labelnames)
+
+
+def histogram(
+    name: str,
+    documentation: str,
+    labelnames: Sequence[str] = (),
+    buckets: Optional[Sequence[float]] = None
+) -> Metric:
+    """buckets: Prometheus bucket bounds (default: latency buckets)"""
+    return _get_or_create("histogram", name, documentation, labelnames, buckets)
+
+
+def snapshot() -> Dict[str, Dict]:
+    """All metrics as plain dicts (JSON-serializable)"""
+    with _REGISTRY_LOCK:
+        metrics = list(_REGISTRY.values())
+    return {metric.name: metric.snapshot() for metric in metrics}
+
+
+def render_prometheus() -> Optional[Tuple[bytes, str]]:
+    """(body, content type) in Prometheus text format, or None without prometheus-client"""
+    if not PROMETHEUS_AVAILABLE:
+        return None
+    return prometheus_client.generate_latest(), prometheus_client.CONTENT_TYPE_LATEST
@@ -0,0 +1,192 @@
+"""
+Rate Limiter - Token buckets that queue callers instead of failing
+Keeps LLM traffic inside the Groq free tier (20 requests/minute, 14,400/day)
+"""
+
+import os
+import time
+import asyncio
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from utils import metrics
+
+
+class RateLimitTimeout(Exception):
+    """The queue is so long that waiting would exceed max_wait"""
+
+
+class TokenBucket:
+    """
+    At most `limit` tokens in any `period_seconds` window.
+
+    Holds up to `burst` tokens (starts full) and refills the remaining
+    limit - burst evenly over the period, so a burst after an idle spell
+    plus the refill that follows never exceeds the limit. burst=limit is
+    the classic bucket, which can let almost 2 x limit through one window.
+    """
+
+    def __init__(self, limit: int, period_seconds: float, burst: Optional[int] = None):
+        burst = limit if burst is None else min(max(1, burst), limit)
+        self.limit = limit
+        self.capacity = float(burst)
+        self.period_seconds = period_seconds
+        self.rate = (limit - burst if burst < limit else limit) / period_seconds
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self) -> float:
+        """Seconds until one more token is available (after refill)"""
+        return max(0.0, 1.0 - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """
+    All buckets must grant a token (e.g. 20/min AND 14,400/day). Limits are
+    (limit, period_seconds) or (limit, period_seconds, burst) - see TokenBucket.
+
+    acquire() reserves the next free slot under a lock and then sleeps until
+    it - tokens may go negative - so waiting callers are served in FIFO order
+    and nobody is rejected unless the wait would exceed max_wait.
+
+    Limits are per process: with N workers, give each 1/N of the quota.
+    """
+
+    def __init__(self, name: str, limits: List[Tuple], max_wait: Optional[float] = None):
+        self.name = name
+        self.buckets = [TokenBucket(*limit) for limit in limits]
+        self.max_wait = max_wait
+        self._lock = threading.Lock()
+
+        self.waiting = 0
+        self.acquired = 0
+        self.delayed = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.max_observed_wait = 0.0
+
+        self._queue_depth = metrics.gauge(
+            "rate_limiter_queue_depth", "Callers waiting for a rate limit slot", ["limiter"]
+        ).labels(limiter=name)
+        self._wait_seconds = metrics.histogram(
+            "rate_limiter_wait_seconds", "Time spent waiting for a rate limit slot", ["limiter"]
+        ).labels(limiter=name)
+        self._rejections = metrics.counter(
+            "rate_limiter_rejected", "Acquires rejected because the wait exceeded max_wait", ["limiter"]
+        ).labels(limiter=name)
+
+    def _reserve(self) -> float:
+        """
+        Take a token from every bucket and return how long to wait before using it
+
+        Raises:
+            RateLimitTimeout: if the wait would exceed max_wait (nothing is taken)
+        """
+        with self._lock:
+            now = time.monotonic()
+            for bucket in self.buckets:
+                bucket.refill(now)
+
+            wait = max(bucket.wait_time() for bucket in self.buckets)
+            if self.max_wait is not None and wait > self.max_wait:
+                self.rejected += 1
+                self._rejections.inc()
+                raise RateLimitTimeout(f"{self.name}: next slot in {wait:.0f}s (max wait {self.max_wait:.0f}s)")
+
+            for bucket in self.buckets:
+                bucket.tokens -= 1
+
+            self.acquired += 1
+            if wait > 0:
+                self.delayed += 1
+                self.waiting += 1
+                self.total_wait += wait
+                self.max_observed_wait = max(self.max_observed_wait, wait)
+                self._queue_depth.set(self.waiting)
+
+        self._wait_seconds.observe(wait)
+        return wait
+
+    def _release(self):
+        with self._lock:
+            self.waiting -= 1
+            self._queue_depth.set(self.waiting)
+
+    def acquire(self):
+        """Blocking acquire (threads / sync code)"""
+        wait = self._reserve()
+        if wait <= 0:
+            return
+
+        logger.info(f"⏳ {self.name}: rate limited, waiting {wait:.1f}s ({self.waiting} queued)")
+        try:
+            time.sleep(wait)
+        finally:
+            self._release()
+
+    async def acquire_async(self):
+        """Non-blocking acquire for the event loop"""
+        wait = self._reserve()
+        if wait <= 0:
+            return
+
+        logger.info(f"⏳ {self.name}: rate limited, waiting {wait:.1f}s ({self.waiting} queued)")
+        try:
+            await asyncio.sleep(wait)
+        finally:
+            self._release()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            now = time.monotonic()
+            for bucket in self.buckets:
+                bucket.refill(now)
+            return {
+                "limits": [
+                    {
+                        "limit": b.limit,
+                        "period_seconds": b.period_seconds,
+                        "burst": int(b.capacity),
+                        "available": round(b.tokens, 2)
+                    }
+                    for b in self.buckets
+                ],
+                "queue_depth": self.waiting,
+                "acquired": self.acquired,
+                "delayed": self.delayed,
+                "rejected": self.rejected,
+                "avg_wait_seconds": round(self.total_wait / self.delayed, 3) if self.delayed else 0.0,
+                "max_wait_seconds": round(self.max_observed_wait, 3)
+            }
+
+
+_llm_limiter = None
+_llm_limiter_lock = threading.Lock()
+
+
+def get_llm_rate_limiter() -> RateLimiter:
+    """
+    Process-wide limiter shared by every LLMClient
+    LLM_REQUESTS_PER_MINUTE / LLM_BURST / LLM_REQUESTS_PER_DAY / LLM_DAILY_BURST /
+    LLM_RATE_LIMIT_MAX_WAIT
+    """
+    global _llm_limiter
+    with _llm_limiter_lock:
+        if _llm_limiter is None:
+            per_minute = int(os.getenv("LLM_REQUESTS_PER_MINUTE", 20))
+            per_day = int(os.getenv("LLM_REQUESTS_PER_DAY", 14400))
+            _llm_limiter = RateLimiter(
+                "groq",
+                [
+                    (per_minute, 60.0, int(os.getenv("LLM_BURST", max(1, per_minute // 4)))),
+                    (per_day, 86400.0, int(os.getenv("LLM_DAILY_BURST", max(1, per_day // 24))))
+                ],
+                max_wait=float(os.getenv("LLM_RATE_LIMIT_MAX_WAIT", 120))
+            )
+        return _llm_limiter
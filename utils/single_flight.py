@@ -0,0 +1,151 @@
+"""
+Single Flight - Coalesce identical in-flight requests
+When many users ask the same question at once (morning broadcast, a viral
+forward) only the first call does the work; the rest await its result
+"""
+
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, List, Optional
+
+from loguru import logger
+
+from utils import metrics
+
+
+class _Broadcast:
+    """Pieces of one shared stream, replayed to every subscriber"""
+
+    def __init__(self):
+        self.pieces: List[Any] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.changed = asyncio.Condition()
+        # The producer - the loop only keeps a weak reference to tasks
+        self.task: Optional[asyncio.Task] = None
+
+    async def publish(self, piece: Any):
+        async with self.changed:
+            self.pieces.append(piece)
+            self.changed.notify_all()
+
+    async def finish(self, error: Optional[BaseException] = None):
+        async with self.changed:
+            self.done = True
+            self.error = error
+            self.changed.notify_all()
+
+    async def subscribe(self) -> AsyncIterator[Any]:
+        position = 0
+        while True:
+            async with self.changed:
+                await self.changed.wait_for(lambda: position < len(self.pieces) or self.done)
+                pieces = self.pieces[position:]
+                done, error = self.done, self.error
+
+            for piece in pieces:
+                yield piece
+            position += len(pieces)
+
+            if done and position >= len(self.pieces):
+                if error is not None:
+                    raise error
+                return
+
+
+class SingleFlight:
+    """
+    Per-process request coalescing keyed by any hashable.
+
+    do(key, fn) runs fn() once per key at a time; callers that arrive while
+    it is running await the same task and get the same result (or exception),
+    so treat results as read-only. stream(key, fn) does the same for async
+    iterators: late joiners first replay the pieces already produced.
+
+    The shared work runs in its own task, so a caller that disconnects does
+    not cancel it for the others. Nothing is kept once the call finishes -
+    caching finished answers is AnswerCache's job.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self._streams: Dict[Hashable, _Broadcast] = {}
+
+        self.calls = 0
+        self.coalesced = 0
+
+        self._calls_total = metrics.counter(
+            "single_flight_calls", "Calls entering a single-flight group", ["group"]
+        ).labels(group=name)
+        self._coalesced_total = metrics.counter(
+            "single_flight_coalesced", "Calls served by another caller's in-flight work", ["group"]
+        ).labels(group=name)
+        self._ratio = metrics.gauge(
+            "single_flight_coalescing_ratio", "Share of calls that were coalesced", ["group"]
+        ).labels(group=name)
+
+    def _record(self, coalesced: bool):
+        self.calls += 1
+        self._calls_total.inc()
+        if coalesced:
+            self.coalesced += 1
+            self._coalesced_total.inc()
+        self._ratio.set(self.coalesced / self.calls)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._calls.get(key)
+        self._record(coalesced=task is not None)
+
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+        else:
+            logger.debug(f"🔗 {self.name}: joined in-flight call")
+
+        # shield: cancelling one waiter must not cancel the shared call
+        return await asyncio.shield(task)
+
+    async def stream(self, key: Hashable, fn: Callable[[], AsyncIterator[Any]]) -> AsyncIterator[Any]:
+        broadcast = self._streams.get(key)
+        self._record(coalesced=broadcast is not None)
+
+        if broadcast is None:
+            broadcast = _Broadcast()
+            self._streams[key] = broadcast
+
+            async def produce():
+                error = None
+                try:
+                    async for piece in fn():
+                        await broadcast.publish(piece)
+                except asyncio.CancelledError:
+                    # e.g. shutdown - subscribers get an error instead of waiting forever
+                    error = RuntimeError(f"{self.name}: shared stream was cancelled")
+                    raise
+                except Exception as e:
+                    error = e
+                finally:
+                    self._streams.pop(key, None)
+                    await broadcast.finish(error)
+
+            broadcast.task = asyncio.ensure_future(produce())
+            broadcast.task.add_done_callback(lambda _: self._drop_stream(key, broadcast))
+        else:
+            logger.debug(f"🔗 {self.name}: joined in-flight stream")
+
+        async for piece in broadcast.subscribe():
+            yield piece
+
+    def _drop_stream(self, key: Hashable, broadcast: _Broadcast):
+        # Only our own entry - a newer stream for the same key may have started
+        if self._streams.get(key) is broadcast:
+            del self._streams[key]
+
+    def stats(self) -> Dict:
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "coalescing_ratio": round(self.coalesced / self.calls, 4) if self.calls else 0.0,
+            "in_flight": len(self._calls) + len(self._streams)
+        }